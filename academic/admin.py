@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .forms import CachedModelChoiceField, choice_queryset
 from .models import (
     Department,        
     Semester,
@@ -11,8 +12,20 @@ from .models import (
     AssessmentWeight,
     StudentScore,
     Enrollment,
+    Job,
+    RiskFlag,
 )
 
+
+# Dropdown'lardaki __str__ çağrıları seçenek başına sorgu atmasın
+class ChoiceQueryMixin:
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if "queryset" not in kwargs:
+            queryset = self.get_field_queryset(None, db_field, request)
+            kwargs["queryset"] = choice_queryset(db_field.related_model, queryset)
+        kwargs.setdefault("form_class", CachedModelChoiceField)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 #Bölüm Yönetimi
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
@@ -23,20 +36,22 @@ class DepartmentAdmin(admin.ModelAdmin):
 
 @admin.register(Semester)
 class SemesterAdmin(admin.ModelAdmin):
-    list_display = ('name',)
+    list_display = ('name', 'is_closed', 'closed_at')
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(ChoiceQueryMixin, admin.ModelAdmin):
     # listede görünen sütunlar
     list_display = ('student_id', 'first_name', 'last_name', 'department', 'user')
+    list_select_related = ('department', 'user')
     # sağ taraftaki filtreleme menüsü
     list_filter = ('department',) 
     # Arama çubuğu
     search_fields = ('student_id', 'first_name', 'last_name', 'user__username')
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(ChoiceQueryMixin, admin.ModelAdmin):
     list_display = ('code', 'name', 'teacher', 'semester')
+    list_select_related = ('teacher', 'semester')
     list_filter = ('semester', 'teacher')
     search_fields = ('code', 'name')
 
@@ -45,36 +60,55 @@ class ProgramOutcomeAdmin(admin.ModelAdmin):
     list_display = ('code', 'description')
 
 # LO yönetimi
-class OutcomeMappingInline(admin.TabularInline):
+class OutcomeMappingInline(ChoiceQueryMixin, admin.TabularInline):
     model = OutcomeMapping
     extra = 1
 
 @admin.register(LearningOutcome)
-class LearningOutcomeAdmin(admin.ModelAdmin):
+class LearningOutcomeAdmin(ChoiceQueryMixin, admin.ModelAdmin):
     inlines = [OutcomeMappingInline]
     list_display = ("code", "course", "description")
+    list_select_related = ("course__teacher",)
     list_filter = ('course',)
 
 #sınav yönetimi
-class AssessmentWeightInline(admin.TabularInline):
+class AssessmentWeightInline(ChoiceQueryMixin, admin.TabularInline):
     model = AssessmentWeight
     extra = 1
 
 @admin.register(Assessment)
-class AssessmentAdmin(admin.ModelAdmin):
+class AssessmentAdmin(ChoiceQueryMixin, admin.ModelAdmin):
     inlines = [AssessmentWeightInline]
-    list_display = ("name", "course", "date", "weight")
+    list_display = ("name", "course", "date", "weight", "published_at", "notified_at")
+    list_select_related = ("course__teacher",)
     list_filter = ('course',)
 
 # kayıt
 
 @admin.register(StudentScore)
-class StudentScoreAdmin(admin.ModelAdmin):
+class StudentScoreAdmin(ChoiceQueryMixin, admin.ModelAdmin):
     list_display = ('student', 'assessment', 'score')
+    list_select_related = ('student', 'assessment__course')
     list_filter = ('assessment__course', 'assessment')
     search_fields = ('student__first_name', 'student__student_id')
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(ChoiceQueryMixin, admin.ModelAdmin):
     list_display = ('student', 'course', 'enrollment_date')
-    list_filter = ('course', 'student__department') # Bölüme göre kayıtları süzebilirsin
\ No newline at end of file
+    list_select_related = ('student', 'course__teacher')
+    list_filter = ('course', 'student__department') # Bölüme göre kayıtları süzebilirsin
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'progress', 'attempts', 'run_at', 'created_by', 'finished_at')
+    list_select_related = ('created_by',)
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'locked_by')
+    readonly_fields = ('locked_by', 'locked_at', 'started_at', 'finished_at', 'created_at')
+
+@admin.register(RiskFlag)
+class RiskFlagAdmin(admin.ModelAdmin):
+    list_display = ('student', 'course', 'projected_average', 'completed_weight', 'po_trend', 'updated_at')
+    list_select_related = ('student', 'course__teacher')
+    list_filter = ('course__semester', 'student__department')
+    search_fields = ('student__first_name', 'student__last_name', 'student__student_id')
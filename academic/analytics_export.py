@@ -0,0 +1,358 @@
+"""
+Kurumsal araştırma için kolon tabanlı (Parquet) veri dışa aktarımı.
+
+Ham tablolar ve türetilmiş başarımlar dönem ve bölüme göre bölümlenmiş (Hive tarzı)
+Parquet veri kümeleri olarak yazılır:
+    <hedef>/<tablo>/semester=<id>/department=<id>/<çalıştırma>-<parça>-0.parquet
+Bölümü olmayan öğrenciler department=0 altına düşer. Öğrenciye bağlı olmayan tablolar
+(sınav ağırlıkları, LO→PO eşleştirmeleri) sadece döneme göre bölümlenir.
+
+Tablolar veritabanından id sırasıyla CHUNK_SIZE'lık parçalar halinde okunur; bellekte hiçbir
+zaman tablonun tamamı tutulmaz. Anahtar kolonlar (id'ler, kodlar) Parquet'te sözlük
+(dictionary) kodlanır; okurken pyarrow'a read_dictionary ile verilirse kategorik gelir.
+
+Artımlı aktarım: son çalıştırmanın zamanı hedef dizindeki WATERMARK_FILE'da tutulur;
+sonraki çalıştırma sadece updated_at değeri bu zamandan sonra olan satırları yeni dosyalar
+olarak ekler. updated_at kayıt anında, işlem onaylanmadan (commit) önce yazılır; okuma
+sırasında henüz onaylanmamış bir satır sonraki çalıştırmada kaçmasın diye filigran
+WATERMARK_LAG kadar geriden tutulur ve son dakikaların satırları tekrar yazılır. Bir satır
+birden çok dosyada bulunabilir; okuyan taraf id başına en büyük updated_at'i almalıdır.
+Türetilmiş LO/PO başarımları, değişen satırların düştüğü (dönem, bölüm) bölümleri için
+baştan hesaplanıp üzerine yazılır. Silinen satırlar ve öğrencilerin bölüm değişiklikleri
+artımlı aktarımda görünmez; bunlar için --full kullanılır.
+
+Arşivlenmiş dönemlerin not/kayıt/ağırlık satırları arşiv veritabanından okunur (bkz.
+cold_storage.py); satırlar taşınırken updated_at korunduğu için artımlı aktarımda yeniden
+yazılmazlar.
+"""
+
+from datetime import timedelta
+from itertools import chain
+
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import cold_storage
+from .models import (
+    AssessmentWeight,
+    Course,
+    Enrollment,
+    LearningOutcome,
+    OutcomeMapping,
+    Student,
+    StudentScore,
+)
+from .simulation import Cohort
+
+CHUNK_SIZE = 50000
+WATERMARK_FILE = "_watermark.json"
+# Bundan uzun süren (kayıttan commit'e) işlemlerin satırları artımlı aktarımda kaçabilir
+WATERMARK_LAG = timedelta(minutes=5)
+NO_DEPARTMENT = 0
+
+SCORES = "student_scores"
+ENROLLMENTS = "enrollments"
+ASSESSMENT_WEIGHTS = "assessment_weights"
+OUTCOME_MAPPINGS = "outcome_mappings"
+LO_ATTAINMENT = "lo_attainment"
+PO_ATTAINMENT = "po_attainment"
+TABLES = [
+    SCORES,
+    ENROLLMENTS,
+    ASSESSMENT_WEIGHTS,
+    OUTCOME_MAPPINGS,
+    LO_ATTAINMENT,
+    PO_ATTAINMENT,
+]
+
+STUDENT_PARTITIONS = ["semester", "department"]
+SEMESTER_PARTITIONS = ["semester"]
+
+# Ham tablolar: (model, kolonlar, bölüm kolonları). Kolonlar values_list ifadeleridir.
+_department = Coalesce(F("student__department_id"), NO_DEPARTMENT)
+RAW_TABLES = {
+    SCORES: (
+        StudentScore,
+        {
+            "id": F("id"),
+            "student_id": F("student_id"),
+            "assessment_id": F("assessment_id"),
+            "course_id": F("assessment__course_id"),
+            "score": Cast("score", FloatField()),
+            "updated_at": F("updated_at"),
+            "semester": F("assessment__course__semester_id"),
+            "department": _department,
+        },
+        STUDENT_PARTITIONS,
+    ),
+    ENROLLMENTS: (
+        Enrollment,
+        {
+            "id": F("id"),
+            "student_id": F("student_id"),
+            "course_id": F("course_id"),
+            "enrollment_date": F("enrollment_date"),
+            "updated_at": F("updated_at"),
+            "semester": F("course__semester_id"),
+            "department": _department,
+        },
+        STUDENT_PARTITIONS,
+    ),
+    ASSESSMENT_WEIGHTS: (
+        AssessmentWeight,
+        {
+            "id": F("id"),
+            "assessment_id": F("assessment_id"),
+            "learning_outcome_id": F("learning_outcome_id"),
+            "course_id": F("assessment__course_id"),
+            "percentage": Cast("percentage", FloatField()),
+            "updated_at": F("updated_at"),
+            "semester": F("assessment__course__semester_id"),
+        },
+        SEMESTER_PARTITIONS,
+    ),
+    OUTCOME_MAPPINGS: (
+        OutcomeMapping,
+        {
+            "id": F("id"),
+            "learning_outcome_id": F("learning_outcome_id"),
+            "program_outcome_id": F("program_outcome_id"),
+            "po_code": F("program_outcome__code"),
+            "course_id": F("learning_outcome__course_id"),
+            "weight": Cast("weight", FloatField()),
+            "updated_at": F("updated_at"),
+            "semester": F("learning_outcome__course__semester_id"),
+        },
+        SEMESTER_PARTITIONS,
+    ),
+}
+
+# Sözlük kodlanan anahtar kolonlar (tabloda varsa)
+KEY_COLUMNS = [
+    "student_id",
+    "assessment_id",
+    "course_id",
+    "learning_outcome_id",
+    "program_outcome_id",
+    "po_code",
+    "lo_code",
+]
+
+
+# --- FİLİGRAN (WATERMARK) ---
+
+
+def read_watermark(target):
+    path = Path(target) / WATERMARK_FILE
+    if not path.exists():
+        return None
+    return parse_datetime(json.loads(path.read_text())["exported_at"])
+
+
+def write_watermark(target, exported_at, counts):
+    path = Path(target) / WATERMARK_FILE
+    path.write_text(
+        json.dumps(
+            {"exported_at": exported_at.isoformat(), "rows": counts},
+            indent=2,
+            ensure_ascii=False,
+        )
+    )
+
+
+# --- YAZMA ---
+
+
+def _write(frame, root, partitions, basename):
+    pq.write_to_dataset(
+        pa.Table.from_pandas(frame, preserve_index=False),
+        root,
+        partition_cols=partitions,
+        basename_template=basename + "-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        # Sözlük kodlaması sadece anahtarlarda; ölçüler (not, oran) düz yazılır
+        use_dictionary=[column for column in KEY_COLUMNS if column in frame],
+    )
+
+
+def _chunks(queryset, columns, chunk_size):
+    """id sırasıyla (keyset) DataFrame parçaları; OFFSET kullanılmaz."""
+    names = list(columns)
+    fields = [f"_x_{name}" for name in names]
+    queryset = queryset.annotate(**dict(zip(fields, columns.values()))).order_by("id")
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).values_list(*fields)[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield pd.DataFrame.from_records(rows, columns=names)
+
+
+def export_raw(name, root, run_id, since, until, chunk_size=CHUNK_SIZE):
+    """
+    Ham tabloyu yazar; since verilirse sadece o zamandan sonra değişen satırlar.
+    (satır sayısı, değişen (dönem, bölüm) çiftleri) döner; bölüm yoksa None.
+    """
+    model, columns, partitions = RAW_TABLES[name]
+    queryset = model.objects.filter(updated_at__lte=until)
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    frames = chain.from_iterable(
+        _chunks(queryset.using(db), columns, chunk_size)
+        for db in cold_storage.databases(model)
+    )
+    total, touched = 0, set()
+    for number, frame in enumerate(frames):
+        total += len(frame)
+        departments = frame["department"] if "department" in frame else None
+        touched.update(
+            zip(frame["semester"], departments)
+            if departments is not None
+            else ((semester, None) for semester in frame["semester"].unique())
+        )
+        _write(frame, root / name, partitions, f"{run_id}-{number:05d}")
+    return total, {(int(s), None if d is None else int(d)) for s, d in touched}
+
+
+# --- TÜRETİLMİŞ BAŞARIMLAR ---
+
+
+def _partition_students(semester_id, department_id):
+    students = Student.objects.filter(enrollment__course__semester_id=semester_id)
+    if department_id == NO_DEPARTMENT:
+        students = students.filter(department__isnull=True)
+    else:
+        students = students.filter(department_id=department_id)
+    return students.distinct()
+
+
+def attainment_frames(semester_id, department_id):
+    """
+    Bir (dönem, bölüm) için öğrenci × LO ve öğrenci × PO başarımları.
+    Hesap dönem arşivindeki ile aynıdır (bkz. archive.close_semester).
+    """
+    with cold_storage.reading(semester_id):
+        courses = Course.objects.filter(semester_id=semester_id)
+        cohort = Cohort(_partition_students(semester_id, department_id), courses=courses)
+        lo_rates = cohort.lo_rates()
+        po_earned, po_possible = cohort.po_totals()
+
+        lo_info = dict(
+            (lo_id, (course_id, code))
+            for lo_id, course_id, code in LearningOutcome.objects.filter(
+                id__in=cohort.lo_ids.tolist()
+            ).values_list("id", "course_id", "code")
+        )
+    s, lo = cohort.enrolled
+    lo_ids = cohort.lo_ids[lo]
+    lo_frame = pd.DataFrame(
+        {
+            "student_id": cohort.student_ids[s],
+            "course_id": [lo_info[i][0] for i in lo_ids.tolist()],
+            "learning_outcome_id": lo_ids,
+            "lo_code": [lo_info[i][1] for i in lo_ids.tolist()],
+            "rate": np.round(lo_rates, 2),
+        }
+    )
+
+    s, p = np.nonzero(po_possible > 0)
+    po_frame = pd.DataFrame(
+        {
+            "student_id": cohort.student_ids[s],
+            "po_code": [cohort.po_codes[i] for i in p.tolist()],
+            "earned": po_earned[s, p],
+            "possible": po_possible[s, p],
+            "rate": np.round(po_earned[s, p] * 100 / po_possible[s, p], 2),
+        }
+    )
+    for frame in (lo_frame, po_frame):
+        frame["semester"] = semester_id
+        frame["department"] = department_id
+    return lo_frame, po_frame
+
+
+def _student_partitions(semester_ids=None):
+    """Kaydı olan tüm (dönem, bölüm) çiftleri."""
+    enrollments = Enrollment.objects.all()
+    if semester_ids is not None:
+        enrollments = enrollments.filter(course__semester_id__in=semester_ids)
+    return set(
+        chain.from_iterable(
+            enrollments.using(db)
+            .annotate(department=_department)
+            .values_list("course__semester_id", "department")
+            .distinct()
+            for db in cold_storage.databases(Enrollment)
+        )
+    )
+
+
+def export_attainment(root, run_id, partitions):
+    """partitions içindeki (dönem, bölüm) bölümlerini baştan yazar."""
+    counts = {LO_ATTAINMENT: 0, PO_ATTAINMENT: 0}
+    for semester_id, department_id in sorted(partitions):
+        lo_frame, po_frame = attainment_frames(semester_id, department_id)
+        for name, frame in ((LO_ATTAINMENT, lo_frame), (PO_ATTAINMENT, po_frame)):
+            directory = (
+                root / name / f"semester={semester_id}" / f"department={department_id}"
+            )
+            shutil.rmtree(directory, ignore_errors=True)
+            if len(frame):
+                _write(frame, root / name, STUDENT_PARTITIONS, run_id)
+            counts[name] += len(frame)
+    return counts
+
+
+# --- ÇALIŞTIRMA ---
+
+
+def export(target, full=False, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Tüm tabloları target dizinine yazar. full=False ise son filigrandan sonraki
+    değişiklikler eklenir (ilk çalıştırma her zaman tam aktarımdır).
+    {tablo: satır sayısı} döner.
+    """
+    progress = progress or (lambda percent, message="": None)
+    root = Path(target)
+    since = None if full else read_watermark(root)
+    if since is None:
+        for name in TABLES:
+            shutil.rmtree(root / name, ignore_errors=True)
+    root.mkdir(parents=True, exist_ok=True)
+    until = timezone.now()
+    run_id = until.strftime("%Y%m%dT%H%M%S%f")
+
+    counts, touched = {}, set()
+    for i, name in enumerate(RAW_TABLES):
+        progress(int(80 * i / len(RAW_TABLES)), f"{name} yazılıyor")
+        counts[name], partitions = export_raw(
+            name, root, run_id, since, until, chunk_size
+        )
+        touched |= partitions
+
+    progress(80, "LO/PO başarımları hesaplanıyor")
+    if since is None:
+        partitions = _student_partitions()
+    else:
+        # Müfredat değişikliği dönemin tüm bölümlerini etkiler
+        whole = {semester for semester, department in touched if department is None}
+        partitions = {pair for pair in touched if pair[1] is not None}
+        if whole:
+            partitions |= _student_partitions(whole)
+    counts.update(export_attainment(root, run_id, partitions))
+
+    # Okuma sırasında onaylanmamış satırlar bir sonraki çalıştırmada yakalanır
+    write_watermark(root, until - WATERMARK_LAG, counts)
+    progress(100, "Tamamlandı")
+    return counts
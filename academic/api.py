@@ -0,0 +1,91 @@
+"""
+REST API (mobil uygulama).
+
+GET api/v1/student/dashboard/ öğrenci panelinin tamamını tek istekte döner (bkz.
+student_dashboard.py; sabit sorgu sayısı). Seçenekler:
+    ?fields=courses,po_radar          sadece bu bölümler (hesaplanmayanlar sorgu atmaz)
+    ?fields[courses]=code,average     bölümün (her öğenin) sadece bu alanları
+    ?semester=<id>                    aktif dönem yerine bu dönem
+Yanıt gzip'lenir (Accept-Encoding) ve ETag taşır; istemci If-None-Match gönderirse veri
+değişmediğinde gövdesiz 304 döner. ETag gövdenin özetidir: 304 hesaplamayı değil aktarımı
+kurtarır; mobil istemcide asıl maliyet aktarımdır.
+
+Kimlik doğrulama: web oturumu ya da api/v1/auth/token/'dan alınan token
+("Authorization: Token <anahtar>").
+"""
+
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    set_response_etag,
+)
+from django.views.decorators.gzip import gzip_page
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+
+from .models import Student
+from .semesters import get_active_semester, semester_choices
+from .serializers import StudentDashboardSerializer
+from .student_dashboard import SECTIONS, build_payload
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _sparse_fields(params):
+    """(bölümler, {bölüm: [alan, ...]}) — ?fields= ve ?fields[bölüm]= parametrelerinden."""
+    sections = _split(params["fields"]) if "fields" in params else list(SECTIONS)
+    unknown = set(sections) - set(SECTIONS)
+    fieldsets = {}
+    for key, value in params.items():
+        if key.startswith("fields[") and key.endswith("]"):
+            section = key[len("fields[") : -1]
+            if section not in SECTIONS:
+                unknown.add(section)
+            fieldsets[section] = _split(value)
+    if unknown:
+        raise ValidationError(
+            {"fields": f"Bilinmeyen bölüm: {', '.join(sorted(unknown))}"}
+        )
+    return sections, fieldsets
+
+
+def _semester(request):
+    if "semester" not in request.query_params:
+        return get_active_semester(request)
+    selected = request.query_params["semester"]
+    for semester in semester_choices():
+        if str(semester.id) == selected:
+            return semester
+    raise ValidationError({"semester": "Dönem bulunamadı."})
+
+
+@gzip_page
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def student_dashboard(request):
+    student = (
+        Student.objects.select_related("department").filter(user=request.user).first()
+    )
+    if student is None:
+        raise PermissionDenied("Bu uç nokta sadece öğrenciler içindir.")
+    sections, fieldsets = _sparse_fields(request.query_params)
+    serializer = StudentDashboardSerializer(
+        build_payload(student, _semester(request), sections),
+        fields=sections,
+        context={"fieldsets": fieldsets},
+    )
+    # Gövde ETag için burada bir kez üretilir (DRF Response'un yeniden üretmemesi için)
+    response = HttpResponse(
+        JSONRenderer().render(serializer.data), content_type="application/json"
+    )
+    set_response_etag(response)
+    # Kişisel veri: paylaşılan önbelleklerde tutulmaz, her kullanımda yeniden doğrulanır
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie", "Authorization"])
+    return get_conditional_response(request, etag=response["ETag"], response=response)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AcademicConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'academic'
+
+    def ready(self):
+        # Önbellek geçersizleştirme sinyallerini kaydet
+        from . import signals  # noqa: F401
+
+        # Arka plan görevlerini iş kuyruğuna kaydet
+        from . import tasks  # noqa: F401
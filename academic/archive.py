@@ -0,0 +1,147 @@
+"""
+Dönem arşivi.
+
+Kapatılan dönemde notlar artık değişmez; her radar/başarım sayfasının o dönemin bütün kayıt
+ve notlarını yeniden dolaşmasına gerek yoktur. Dönem kapatılırken öğrenci başına:
+    - PO katkı toplamları (ArchivedPOAttainment: kazanılan / mümkün puan),
+    - LO başarım oranları (ArchivedLOAttainment),
+    - ders ortalamaları (ArchivedCourseAverage)
+hesaplanıp yazılır. Canlı hesaplar (bkz. attainment.py) sadece açık dönemleri dolaşır ve
+arşivdeki toplamları ekler. Dönem yeniden açılırsa arşiv silinir, hesaplar canlıya döner.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, FloatField, Sum
+from django.utils import timezone
+
+from .caching import TAG_ATTAINMENT, invalidate_tag
+from .jobs import enqueue
+from .models import (
+    ArchivedCourseAverage,
+    ArchivedLOAttainment,
+    ArchivedPOAttainment,
+    Course,
+    Job,
+    Semester,
+    Student,
+    StudentScore,
+)
+from .semesters import invalidate_semesters
+from .simulation import Cohort
+
+CLOSE_SEMESTER_TASK = "close_semester"
+
+BULK_BATCH_SIZE = 2000
+
+
+def closing_semester_ids():
+    """Kapatma işi sırada veya çalışıyor olan dönemler."""
+    payloads = Job.objects.filter(
+        task=CLOSE_SEMESTER_TASK,
+        status__in=[Job.STATUS_PENDING, Job.STATUS_RUNNING],
+    ).values_list("payload", flat=True)
+    return {payload.get("semester_id") for payload in payloads}
+
+
+def request_close(semester, user=None):
+    """Kapatma işini sıraya koyar; dönem zaten kapalıysa veya sıradaysa False döner."""
+    if semester.is_closed or semester.id in closing_semester_ids():
+        return False
+    enqueue(CLOSE_SEMESTER_TASK, {"semester_id": semester.id}, user=user)
+    return True
+
+
+def _course_averages(semester):
+    # Öğrenci notları sayfasındaki ağırlıklı ortalama, tek GROUP BY sorgusuyla
+    return (
+        StudentScore.objects.filter(assessment__course__semester=semester)
+        .values("student_id", "assessment__course_id")
+        .annotate(
+            weighted=Sum(
+                F("score") * F("assessment__weight"), output_field=FloatField()
+            ),
+            total=Sum("assessment__weight"),
+        )
+    )
+
+
+def close_semester(semester, progress=None):
+    """Dönemin başarım verilerini arşive yazar ve dönemi kapalı işaretler."""
+    progress = progress or (lambda percent, message="": None)
+    courses = Course.objects.filter(semester=semester)
+    students = Student.objects.filter(enrollment__course__in=courses).distinct()
+
+    progress(5, "Notlar okunuyor")
+    cohort = Cohort(students, courses=courses)
+    lo_rates = cohort.lo_rates()
+    po_earned, po_possible = cohort.po_totals()
+
+    po_rows = [
+        ArchivedPOAttainment(
+            semester=semester,
+            student_id=int(cohort.student_ids[s]),
+            po_code=cohort.po_codes[p],
+            earned=float(po_earned[s, p]),
+            possible=float(po_possible[s, p]),
+        )
+        for s, p in zip(*np.nonzero(po_possible > 0))
+    ]
+    lo_rows = [
+        ArchivedLOAttainment(
+            semester=semester,
+            student_id=int(cohort.student_ids[s]),
+            learning_outcome_id=int(cohort.lo_ids[lo]),
+            rate=round(float(rate), 2),
+        )
+        for s, lo, rate in zip(*cohort.enrolled, lo_rates)
+    ]
+    course_rows = [
+        ArchivedCourseAverage(
+            semester=semester,
+            student_id=row["student_id"],
+            course_id=row["assessment__course_id"],
+            average=round(row["weighted"] / row["total"], 2) if row["total"] else 0,
+        )
+        for row in _course_averages(semester)
+    ]
+
+    progress(40, "Arşiv yazılıyor")
+    with transaction.atomic():
+        # Yarıda kalmış eski bir denemenin satırları varsa temizle
+        discard_archive(semester)
+        ArchivedPOAttainment.objects.bulk_create(po_rows, batch_size=BULK_BATCH_SIZE)
+        progress(60, "Arşiv yazılıyor")
+        ArchivedLOAttainment.objects.bulk_create(lo_rows, batch_size=BULK_BATCH_SIZE)
+        progress(90, "Arşiv yazılıyor")
+        ArchivedCourseAverage.objects.bulk_create(
+            course_rows, batch_size=BULK_BATCH_SIZE
+        )
+        Semester.objects.filter(pk=semester.pk).update(
+            is_closed=True, closed_at=timezone.now()
+        )
+    # Arşiv toplu yazıldığı için sinyal yok; önbellekteki raporlar elle geçersizlenir
+    invalidate_tag(TAG_ATTAINMENT)
+    invalidate_semesters()
+
+    return {
+        "students": len(cohort),
+        "po_rows": len(po_rows),
+        "lo_rows": len(lo_rows),
+        "course_rows": len(course_rows),
+    }
+
+
+def discard_archive(semester):
+    ArchivedPOAttainment.objects.filter(semester=semester).delete()
+    ArchivedLOAttainment.objects.filter(semester=semester).delete()
+    ArchivedCourseAverage.objects.filter(semester=semester).delete()
+
+
+def reopen_semester(semester):
+    """Arşivi siler; dönem yeniden canlı hesaplara döner."""
+    with transaction.atomic():
+        discard_archive(semester)
+        Semester.objects.filter(pk=semester.pk).update(is_closed=False, closed_at=None)
+    invalidate_tag(TAG_ATTAINMENT)
+    invalidate_semesters()
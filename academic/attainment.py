@@ -0,0 +1,103 @@
+"""
+Öğrenci PO başarımı (radar grafikleri).
+
+Açık dönemlerdeki dersler canlı hesaplanır (müfredat yapısı curriculum.py'deki süreç içi
+grafik önbelleğinden, notlar tek sorguyla); kapatılmış dönemlerin katkısı arşivden
+(ArchivedPOAttainment) tek sorguyla eklenir. Böylece sayfa maliyeti öğrencinin geçmiş
+dönem sayısıyla büyümez.
+
+Rapor öğrenci başına ortak önbelleğe yazılır. Sonuçlar açıklandığında aynı anda gelen
+isteklerden yalnızca biri hesaplar (bkz. caching.get_or_compute).
+"""
+
+from .caching import (
+    REPORT_CACHE_TIMEOUT,
+    TAG_ATTAINMENT,
+    TAG_LEARNING_OUTCOMES,
+    TAG_PROGRAM_OUTCOMES,
+    get_or_compute,
+    tag_version,
+)
+from .curriculum import curriculum_version, get_course_graphs
+from .models import ArchivedPOAttainment, Enrollment, ProgramOutcome, StudentScore
+
+
+def score_color(score):
+    return "success" if score >= 70 else "warning" if score >= 50 else "danger"
+
+
+def student_po_buckets(student):
+    """{PO kodu: {"earned", "max", "desc"}} — tüm dönemlerin toplam katkısı."""
+    all_pos = ProgramOutcome.objects.all()
+    po_buckets = {
+        po.code: {"earned": 0, "max": 0, "desc": po.description} for po in all_pos
+    }
+
+    # 1. Açık dönemler: notlar canlı, ders grafikleri süreç içi önbellekten
+    course_ids = list(
+        Enrollment.objects.filter(
+            student=student, course__semester__is_closed=False
+        ).values_list("course_id", flat=True)
+    )
+    score_maps = {course_id: {} for course_id in course_ids}
+    scores = StudentScore.objects.filter(
+        student=student, assessment__course_id__in=course_ids
+    ).values_list("assessment__course_id", "assessment_id", "score")
+    for course_id, assessment_id, score in scores:
+        score_maps[course_id][assessment_id] = score
+
+    for course_id, graph in get_course_graphs(course_ids).items():
+        lo_rates = graph.lo_rates(score_maps[course_id])
+        for po_code, (earned, possible) in graph.po_totals(lo_rates).items():
+            po_buckets[po_code]["earned"] += earned
+            po_buckets[po_code]["max"] += possible
+
+    # 2. Kapatılmış dönemler: dondurulmuş toplamlar
+    archived = ArchivedPOAttainment.objects.filter(student=student).values_list(
+        "po_code", "earned", "possible"
+    )
+    for po_code, earned, possible in archived:
+        # Dönem kapandıktan sonra silinen PO'lar canlı hesapta da yer almaz
+        if po_code in po_buckets:
+            po_buckets[po_code]["earned"] += earned
+            po_buckets[po_code]["max"] += possible
+    return po_buckets
+
+
+def _report_cache_key(student_id):
+    versions = ":".join(
+        str(tag_version(tag))
+        for tag in (TAG_ATTAINMENT, TAG_LEARNING_OUTCOMES, TAG_PROGRAM_OUTCOMES)
+    )
+    return f"academic:report:student-po:{student_id}:{versions}:{curriculum_version()}"
+
+
+def student_po_report(student):
+    """Radar grafiği ve PO kartları için (labels, scores, details)."""
+    return get_or_compute(
+        _report_cache_key(student.pk),
+        lambda: build_student_po_report(student),
+        REPORT_CACHE_TIMEOUT,
+    )
+
+
+def build_student_po_report(student):
+    po_labels = []
+    po_scores = []
+    po_details = []
+    for code, data in student_po_buckets(student).items():
+        final_score = 0
+        if data["max"] > 0:
+            final_score = round((data["earned"] / data["max"]) * 100, 1)
+
+        po_labels.append(code)
+        po_scores.append(final_score)
+        po_details.append(
+            {
+                "code": code,
+                "description": data["desc"],
+                "score": final_score,
+                "color": score_color(final_score),
+            }
+        )
+    return po_labels, po_scores, po_details
@@ -0,0 +1,48 @@
+"""
+Oturum ve kimlik doğrulama hızlı yolu.
+
+Giriş yapmış her istek, sayfanın kendi işinden önce oturum satırını, kullanıcı satırını ve
+yetki kontrolleri için grup üyeliklerini okuyordu. Oturumlar settings.SESSION_ENGINE ile
+ortak önbellekte (cached_db) tutulur; kullanıcı nesnesi de öğrenci profili ve menü rolüyle
+birlikte önbelleğe alınır. Böylece kimlik doğrulama uygulama veritabanına hiç gitmez.
+
+Geçersizleştirme: kullanıcı, grup üyeliği veya öğrenci profili değişince ya da kullanıcı
+silinince signals.py invalidate_layout çağırır; bu, önbellekteki kullanıcı nesnesini de siler. Şifre değişikliği
+de kullanıcıyı kaydettiği için eski nesne (ve oturum doğrulama özeti) hemen düşer.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .caching import (
+    LAYOUT_CACHE_TIMEOUT,
+    _compute_role,
+    layout_version,
+    user_cache_key,
+)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend; get_user sonucu (öğrenci profili ve rolüyle) önbellekten gelir."""
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Versiyon sorgudan önce okunur: arada invalidate_layout gelirse eski veri
+            # yeni versiyonla önbelleğe yazılmaz
+            version = layout_version(user_id)
+            user = (
+                get_user_model()
+                ._default_manager.select_related("student")
+                .filter(pk=user_id)
+                .first()
+            )
+            if user is None:
+                return None
+            # Grup sorgusu burada bir kez atılır (bkz. caching.get_user_role)
+            user.cached_role = _compute_role(user)
+            user.cached_layout_version = version
+            cache.set(key, user, LAYOUT_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,196 @@
+"""
+Önbellek (cache) yardımcıları.
+
+Şablon parçaları (sidebar, navbar, PO/LO listeleri) doğrudan silinmez; anahtarlarına
+bir "versiyon" numarası eklenir. Veri değişince versiyon artırılır ve eski parçalar
+kendiliğinden geçersiz kalır (zaman aşımında önbellekten düşerler).
+
+Önbellek tüm worker'ların paylaştığı SQLite tablosudur (bkz. settings.CACHES). Pahalı
+hesaplar get_or_compute ile alınır: aynı anahtarı aynı anda isteyenlerden yalnızca biri
+kilidi (cache.add) alıp hesaplar, diğerleri sonucun önbelleğe düşmesini bekler.
+"""
+
+import time
+
+from django.core.cache import cache
+
+# Süreler (saniye)
+LAYOUT_CACHE_TIMEOUT = 60 * 15
+CURRICULUM_CACHE_TIMEOUT = 60 * 60
+LANDING_PAGE_CACHE_TIMEOUT = 60 * 60
+REPORT_CACHE_TIMEOUT = 60 * 60 * 6
+
+LANDING_PAGE_CACHE_KEY = "academic:page:landing"
+
+# Hesap kilidi: sahibi çökerse en geç bu sürede düşer; bekleyenler bu aralıkla yoklar
+COMPUTE_LOCK_TIMEOUT = 30
+COMPUTE_POLL_INTERVAL = 0.05
+
+# Menüyü belirleyen roller
+ROLE_DEPARTMENT_HEAD = "department_head"
+ROLE_TEACHER = "teacher"
+ROLE_STUDENT = "student"
+
+# Müfredat etiketleri: sadece müfredat verisine bağlı parçalar bu etiketlerle önbelleğe alınır
+TAG_PROGRAM_OUTCOMES = "po"
+TAG_LEARNING_OUTCOMES = "lo"
+# Not, kayıt ve ağırlık verisinden hesaplanan raporlar (heatmap vb.)
+TAG_ATTAINMENT = "attainment"
+
+
+def _version_key(name):
+    return f"academic:version:{name}"
+
+
+def _initial_version():
+    # Önbellekten düşen bir versiyon 1'e dönüp eski parçalarla çakışmasın diye zaman damgası
+    return int(time.time() * 1000)
+
+
+def get_version(name):
+    return cache.get_or_set(_version_key(name), _initial_version, None)
+
+
+def bump_version(name):
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        cache.set(_version_key(name), _initial_version(), None)
+
+
+# --- HESAP KİLİDİ (STAMPEDE KORUMASI) ---
+
+_MISSING = object()
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def get_or_compute(key, compute, timeout, lock_timeout=COMPUTE_LOCK_TIMEOUT):
+    """
+    cache.get_or_set gibi; ancak anahtar boşken aynı anda gelen istekler compute()'u tek
+    tek çalıştırmaz. Kilit sahibi lock_timeout içinde bitiremezse bekleyen kendisi hesaplar.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    deadline = time.monotonic() + lock_timeout
+    while True:
+        if cache.add(_lock_key(key), 1, lock_timeout):
+            try:
+                # Kilit, önceki sahibi sonucu yazıp bıraktıktan sonra alınmış olabilir
+                value = cache.get(key, _MISSING)
+                if value is _MISSING:
+                    value = compute()
+                    cache.set(key, value, timeout)
+                return value
+            finally:
+                cache.delete(_lock_key(key))
+        time.sleep(COMPUTE_POLL_INTERVAL)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if time.monotonic() >= deadline:
+            return compute()
+
+
+def get_or_compute_many(keys, compute, timeout, lock_timeout=COMPUTE_LOCK_TIMEOUT):
+    """
+    keys: {öğe: önbellek anahtarı}; compute(öğeler) -> {öğe: değer}.
+    Eksik öğeler tek compute çağrısıyla hesaplanır; başka süreçte hesaplanmakta olanlar
+    (kilidi alınamayanlar) beklenir. {öğe: değer} döner.
+    """
+    values = {}
+
+    def fetch(items):
+        found = cache.get_many([keys[item] for item in items])
+        values.update({item: found[keys[item]] for item in items if keys[item] in found})
+        return [item for item in items if item not in values]
+
+    missing = fetch(list(keys))
+    if not missing:
+        return values
+
+    mine = [item for item in missing if cache.add(_lock_key(keys[item]), 1, lock_timeout)]
+    if mine:
+        try:
+            todo = fetch(mine)
+            if todo:
+                computed = compute(todo)
+                cache.set_many({keys[item]: computed[item] for item in todo}, timeout)
+                values.update(computed)
+        finally:
+            cache.delete_many([_lock_key(keys[item]) for item in mine])
+
+    waiting = [item for item in missing if item not in values]
+    deadline = time.monotonic() + lock_timeout
+    while waiting and time.monotonic() < deadline:
+        time.sleep(COMPUTE_POLL_INTERVAL)
+        waiting = fetch(waiting)
+    if waiting:
+        values.update(compute(waiting))
+    return values
+
+
+# --- KULLANICI ARAYÜZÜ (LAYOUT) ---
+
+
+def layout_version(user_id):
+    return get_version(f"layout:{user_id}")
+
+
+def user_layout_version(user):
+    # auth.CachedModelBackend versiyonu kullanıcı nesnesiyle birlikte önbelleğe alır;
+    # invalidate_layout ikisini birlikte yenilediği için ayrıca okumaya gerek yok
+    version = getattr(user, "cached_layout_version", None)
+    return layout_version(user.pk) if version is None else version
+
+
+def invalidate_layout(user_id):
+    """Kullanıcının grupları/profili değişince sidebar ve navbar parçalarını yeniler."""
+    bump_version(f"layout:{user_id}")
+    # Oturumdaki önbellekli kullanıcı nesnesi de aynı olaylarla eskir (bkz. auth.py)
+    cache.delete(user_cache_key(user_id))
+
+
+def user_cache_key(user_id):
+    return f"academic:auth:user:{user_id}"
+
+
+def _compute_role(user):
+    if user.is_superuser:
+        return ROLE_DEPARTMENT_HEAD
+    groups = set(user.groups.values_list("name", flat=True))
+    if "Bölüm Başkanı" in groups:
+        return ROLE_DEPARTMENT_HEAD
+    if "Öğretmen" in groups:
+        return ROLE_TEACHER
+    return ROLE_STUDENT
+
+
+def get_user_role(user):
+    """Menüde kullanılan rolü döner; grup sorgusu kullanıcı başına bir kez yapılır."""
+    if not user.is_authenticated:
+        return None
+    # auth.CachedModelBackend rolü kullanıcı nesnesiyle birlikte önbelleğe alır
+    role = getattr(user, "cached_role", None)
+    if role is not None:
+        return role
+    key = f"academic:role:{user.pk}:{layout_version(user.pk)}"
+    role = cache.get(key)
+    if role is None:
+        role = _compute_role(user)
+        cache.set(key, role, LAYOUT_CACHE_TIMEOUT)
+    return role
+
+
+# --- MÜFREDAT ETİKETLERİ ---
+
+
+def tag_version(tag):
+    return get_version(f"tag:{tag}")
+
+
+def invalidate_tag(tag):
+    bump_version(f"tag:{tag}")
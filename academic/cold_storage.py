@@ -0,0 +1,351 @@
+"""
+Sıcak/soğuk veri ayrımı: eski dönemlerin satırları arşiv veritabanında.
+
+Kapatılmış bir dönem arşivlenince sınavları, sınav → LO yüzdeleri, notları, kayıtları ve not
+olguları "archive" veritabanına kopyalanır ve sıcak veritabanından (default) silinir. Böylece
+StudentScore/Enrollment tablolarının ve indekslerinin boyu geçmiş dönem sayısıyla büyümez;
+not girişindeki yazmalar sadece güncel satırların indekslerini günceller.
+
+Ders, LO ve LO → PO eşleştirmeleri sıcak tarafta kalır: dönem arşivi toplamları
+(ArchivedLOAttainment, ArchivedCourseAverage) onlara bağlıdır ve satır sayıları küçüktür.
+Arşivde bunların, bölümlerin, PO'ların, öğrencilerin ve kullanıcıların (şifresiz) birer
+kopyası da tutulur; arşivdeki sorgular birleştirmeleri kendi içinde yapar.
+
+Okuma şeffaftır: reading(dönem id) bloğu içindeki sorgular, dönem arşivlenmişse arşive
+yönlendirilir (bkz. routers.ArchiveRouter); arşivlenmemiş dönemde blok bir şey yapmaz.
+Arşivlenmiş dönem salt okunurdur; yeniden açmak için önce restore_semester ile geri alınır.
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from .caching import TAG_ATTAINMENT, invalidate_tag
+from .curriculum import invalidate_curriculum
+from .facts import sync_scores
+from .models import (
+    Assessment,
+    AssessmentWeight,
+    Course,
+    Department,
+    Enrollment,
+    LearningOutcome,
+    OutcomeMapping,
+    ProgramOutcome,
+    ScoreFact,
+    Semester,
+    Student,
+    StudentScore,
+)
+from .percentiles import invalidate_all as invalidate_percentiles
+from .routers import ARCHIVE_DATABASE, use_archive
+from .semesters import invalidate_semesters, semester_choices
+
+ARCHIVE_SEMESTER_TASK = "archive_semester"
+
+CHUNK_SIZE = 2000
+
+# Arşive taşınan tablolar, silme sırasıyla (önce çocuklar); kopyalama ters sırada.
+# Her tablo için dönem/ders/öğrenci filtresinin yolu.
+MOVED_TABLES = [
+    (
+        ScoreFact,
+        {"semester": "semester_id", "course": "course_id", "student": "student_id"},
+    ),
+    (
+        StudentScore,
+        {
+            "semester": "assessment__course__semester_id",
+            "course": "assessment__course_id",
+            "student": "student_id",
+        },
+    ),
+    (
+        AssessmentWeight,
+        {"semester": "assessment__course__semester_id", "course": "assessment__course_id"},
+    ),
+    (Assessment, {"semester": "course__semester_id", "course": "course_id"}),
+    (
+        Enrollment,
+        {"semester": "course__semester_id", "course": "course_id", "student": "student_id"},
+    ),
+]
+
+
+def enabled():
+    return ARCHIVE_DATABASE in settings.DATABASES
+
+
+def archived_semester_ids():
+    """Arşivlenmiş dönemler; ortak önbellekteki dönem listesinden (sorgusuz)."""
+    return {semester.id for semester in semester_choices() if semester.archived_at}
+
+
+def is_archived(semester_id):
+    return semester_id in archived_semester_ids()
+
+
+@contextmanager
+def reading(semester_id):
+    """Blok içindeki dönem sorguları, dönem arşivlenmişse arşivden okunur."""
+    if is_archived(semester_id):
+        with use_archive():
+            yield
+    else:
+        yield
+
+
+@asynccontextmanager
+async def areading(semester_id):
+    """reading'in async view'lar için olanı (thread havuzundaki sorgular da arşivden okur)."""
+    if await sync_to_async(is_archived)(semester_id):
+        with use_archive():
+            yield
+    else:
+        yield
+
+
+def stream(semester_id, lines):
+    """StreamingHttpResponse satırları görünüm döndükten sonra üretilir; blok orada açılır."""
+    with reading(semester_id):
+        yield from lines
+
+
+def databases(model):
+    """Tablonun satırlarının bulunduğu veritabanları; taşınan tablolarda arşiv de."""
+    if (
+        any(model is moved for moved, _paths in MOVED_TABLES)
+        and enabled()
+        and archived_semester_ids()
+    ):
+        return [DEFAULT_DB_ALIAS, ARCHIVE_DATABASE]
+    return [DEFAULT_DB_ALIAS]
+
+
+def get_object_or_404(queryset, **lookup):
+    """Sıcak veritabanında yoksa arşive bakar (arşivlenmiş dönemin sınavı gibi)."""
+    obj = queryset.filter(**lookup).first()
+    if obj is None and enabled() and archived_semester_ids():
+        obj = queryset.using(ARCHIVE_DATABASE).filter(**lookup).first()
+    if obj is None:
+        raise Http404(f"{queryset.model._meta.object_name} bulunamadı.")
+    return obj
+
+
+def _moved(using, dimension, value):
+    return [
+        model.objects.using(using).filter(**{paths[dimension]: value})
+        for model, paths in MOVED_TABLES
+        if dimension in paths
+    ]
+
+
+def _copy(queryset, target, overrides=None, chunk_size=CHUNK_SIZE, copied=None):
+    """
+    Satırları kolonlarıyla olduğu gibi target'a yazar (auto_now alanları korunur).
+    Hedefte aynı anahtarlı satır varsa önce silinir; yarıda kalan bir aktarım tekrar
+    çalıştırılabilir. Yazılan satır sayısını döner; copied (küme) verilirse yazılan
+    satırların anahtarları eklenir.
+    """
+    model = queryset.model
+    fields = model._meta.concrete_fields
+    connection = connections[target]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    pk_column = quote(model._meta.pk.column)
+    insert = "INSERT INTO {} ({}) VALUES ({})".format(
+        table,
+        ", ".join(quote(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    position = {field.attname: i for i, field in enumerate(fields)}
+    rows = queryset.order_by("pk").values_list(*position)
+    last_pk, total = None, 0
+    while True:
+        chunk = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        chunk = [list(row) for row in chunk[:chunk_size]]
+        if not chunk:
+            return total
+        last_pk = chunk[-1][position[model._meta.pk.attname]]
+        for attname, value in (overrides or {}).items():
+            for row in chunk:
+                row[position[attname]] = value
+        params = [
+            [field.get_db_prep_save(value, connection) for field, value in zip(fields, row)]
+            for row in chunk
+        ]
+        keys = [row[position[model._meta.pk.attname]] for row in params]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {pk_column} IN ({', '.join(['%s'] * len(keys))})",
+                keys,
+            )
+            cursor.executemany(insert, params)
+        if copied is not None:
+            copied.update(row[position[model._meta.pk.attname]] for row in chunk)
+        total += len(chunk)
+
+
+def _delete_keys(model, keys, using, chunk_size=CHUNK_SIZE):
+    keys = sorted(keys)
+    for start in range(0, len(keys), chunk_size):
+        model._base_manager.using(using).filter(
+            pk__in=keys[start : start + chunk_size]
+        )._raw_delete(using)
+
+
+def _invalidate():
+    # Satırlar sinyalsiz taşındığı için önbellekler elle geçersizlenir
+    invalidate_semesters()
+    invalidate_tag(TAG_ATTAINMENT)
+    invalidate_curriculum()
+    invalidate_percentiles()
+
+
+# --- ARŞİVLEME ---
+
+
+def _snapshots(semester, archived_at):
+    """Arşivdeki birleştirmeler için kopyalanan boyut tabloları: (sorgu, değiştirilen alanlar)."""
+    courses = Course.objects.filter(semester=semester)
+    enrolled = Enrollment.objects.filter(course__in=courses).values("student_id")
+    graded = StudentScore.objects.filter(assessment__course__in=courses).values(
+        "student_id"
+    )
+    students = Student.objects.filter(id__in=enrolled) | Student.objects.filter(
+        id__in=graded
+    )
+    users = User.objects.filter(id__in=courses.values("teacher_id")) | User.objects.filter(
+        id__in=students.values("user_id")
+    )
+    los = LearningOutcome.objects.filter(course__in=courses)
+    return [
+        (Department.objects.all(), None),
+        (ProgramOutcome.objects.all(), None),
+        # Arşivdeki kullanıcı sadece isim için; giriş yapamaz
+        (users, {"password": "!"}),
+        (Semester.objects.filter(pk=semester.pk), {"archived_at": archived_at}),
+        (students, None),
+        (courses, None),
+        (los, None),
+        (OutcomeMapping.objects.filter(learning_outcome__in=los), None),
+    ]
+
+
+def archive_semester(semester, progress=None):
+    """
+    Kapatılmış dönemin satırlarını arşive taşır; taşınan satır sayılarını döner.
+
+    Sıcak veritabanından sadece arşive yazılmış anahtarlar silinir. Kopyalama sürerken
+    yazılan satırlar (yönetim paneli, komutlar) silme işleminin içinde, yazma kilidi
+    alındıktan sonra ayrıca kopyalanır; hiçbir satır iki veritabanında da eksik kalmaz.
+    """
+    progress = progress or (lambda percent, message="": None)
+    if not semester.is_closed:
+        raise ValueError("Sadece kapatılmış dönemler arşivlenebilir.")
+    if semester.archived_at:
+        return {"skipped": True}
+    archived_at = timezone.now()
+
+    progress(0, "Boyut tabloları kopyalanıyor")
+    moved = _moved(DEFAULT_DB_ALIAS, "semester", semester.id)
+    copied = {queryset.model: set() for queryset in moved}
+    counts = {}
+    with transaction.atomic(using=ARCHIVE_DATABASE):
+        for queryset, overrides in _snapshots(semester, archived_at):
+            _copy(queryset, ARCHIVE_DATABASE, overrides)
+        for i, queryset in enumerate(reversed(moved)):
+            name = queryset.model._meta.model_name
+            progress(10 + int(70 * i / len(moved)), f"{name} kopyalanıyor")
+            counts[name] = _copy(
+                queryset, ARCHIVE_DATABASE, copied=copied[queryset.model]
+            )
+
+    progress(80, "Sıcak veritabanından siliniyor")
+    with transaction.atomic():
+        # İlk yazma (SQLite) veritabanı kilidini alır; bundan sonra dönemin tablolarına
+        # yeni satır gelmez. Kopyalama sırasında eklenenler şimdi arşive yazılır,
+        # silinenler arşivden de silinir.
+        Semester.objects.filter(pk=semester.pk).update(archived_at=archived_at)
+        current = {
+            queryset.model: set(queryset.values_list("pk", flat=True))
+            for queryset in moved
+        }
+        with transaction.atomic(using=ARCHIVE_DATABASE):
+            if any(current[model] - copied[model] for model in copied):
+                # Yeni satırların öğrencisi/kullanıcısı da arşivde bulunsun
+                for queryset, overrides in _snapshots(semester, archived_at):
+                    _copy(queryset, ARCHIVE_DATABASE, overrides)
+            for queryset in reversed(moved):
+                model = queryset.model
+                late = sorted(current[model] - copied[model])
+                for start in range(0, len(late), CHUNK_SIZE):
+                    chunk = model._base_manager.filter(
+                        pk__in=late[start : start + CHUNK_SIZE]
+                    )
+                    counts[model._meta.model_name] += _copy(
+                        chunk, ARCHIVE_DATABASE, copied=copied[model]
+                    )
+                _delete_keys(model, copied[model] - current[model], ARCHIVE_DATABASE)
+                copied[model] &= current[model]
+        for queryset in moved:
+            # Satırlar arşivde duruyor; CASCADE toplama ve sinyaller gereksiz (ve yavaş).
+            # Yabancı anahtarlar işlem sonunda denetlenir; silme sırası önemsiz.
+            _delete_keys(queryset.model, copied[queryset.model], DEFAULT_DB_ALIAS)
+    _invalidate()
+    progress(100, "Tamamlandı")
+    return counts
+
+
+def restore_semester(semester, progress=None):
+    """Arşivlenmiş dönemin satırlarını sıcak veritabanına geri taşır."""
+    progress = progress or (lambda percent, message="": None)
+    if not semester.archived_at:
+        return {"skipped": True}
+
+    # Olgular kopyalanmaz; notlardan güncel boyutlarla yeniden yazılır
+    moved = _moved(ARCHIVE_DATABASE, "semester", semester.id)
+    counts = {}
+    with transaction.atomic():
+        for i, queryset in enumerate(reversed(moved[1:])):
+            name = queryset.model._meta.model_name
+            progress(int(70 * i / len(moved)), f"{name} geri yükleniyor")
+            counts[name] = _copy(queryset, DEFAULT_DB_ALIAS)
+        progress(70, "Not olguları yazılıyor")
+        counts["scorefact"] = sync_scores(
+            StudentScore.objects.filter(assessment__course__semester=semester)
+        )
+        Semester.objects.filter(pk=semester.pk).update(archived_at=None)
+
+    progress(90, "Arşivden siliniyor")
+    with transaction.atomic(using=ARCHIVE_DATABASE):
+        for queryset in moved:
+            queryset._raw_delete(ARCHIVE_DATABASE)
+    _invalidate()
+    progress(100, "Tamamlandı")
+    return counts
+
+
+def purge(dimension, value):
+    """
+    Sıcak tarafta silinen dönem/ders/öğrencinin arşivdeki satırlarını siler (CASCADE'in
+    arşiv karşılığı; bkz. signals.py).
+    """
+    if not enabled():
+        return
+    with transaction.atomic(using=ARCHIVE_DATABASE):
+        for queryset in _moved(ARCHIVE_DATABASE, dimension, value):
+            queryset._raw_delete(ARCHIVE_DATABASE)
+
+
+def vacuum():
+    """Silinen satırların yerini dosyadan geri verir (SQLite; dosya boyu küçülür)."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM")
@@ -0,0 +1,36 @@
+"""
+Async view'lar için eşzamanlı sorgu yardımcıları.
+
+Django'nun async ORM çağrıları (aget, acount, ...) şimdilik tek bir "sync" thread'inde sırayla
+çalışır; birbirinden bağımsız toplamlar bu yolla paralelleşmez. run_concurrently her
+fonksiyonu thread havuzunda, kendi veritabanı bağlantısıyla çalıştırır ve bağlantıyı iş
+bitince kapatır. Fonksiyonlar sonucu tamamen üretmelidir (list(), count(), aggregate());
+tembel bir QuerySet döndürmek sorguyu çağıran thread'e geri taşır.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+
+def _with_own_connection(func):
+    def run():
+        try:
+            return func()
+        finally:
+            # Havuz thread'leri istek döngüsü dışında; bağlantı açık kalmasın
+            connections.close_all()
+
+    return run
+
+
+async def run_concurrently(*funcs):
+    """Sorgu fonksiyonlarını aynı anda çalıştırır; sonuçları aynı sırayla döner."""
+    return await asyncio.gather(
+        *(
+            sync_to_async(_with_own_connection(func), thread_sensitive=False)()
+            for func in funcs
+        )
+    )
+
@@ -0,0 +1,39 @@
+from django.utils.functional import SimpleLazyObject
+
+from .caching import (
+    CURRICULUM_CACHE_TIMEOUT,
+    LAYOUT_CACHE_TIMEOUT,
+    get_user_role,
+    user_layout_version,
+    tag_version,
+)
+from .semesters import get_active_semester, semester_choices
+
+
+class CacheTagVersions:
+    """Şablonda {{ cache_tags.po }} gibi kullanılır; sadece istenen etiket okunur."""
+
+    def __getitem__(self, tag):
+        return tag_version(tag)
+
+
+def layout(request):
+    """
+    base.html'deki önbellekli parçalar için rol ve versiyon bilgisi.
+    Değerler tembel (lazy) hesaplanır; parça önbellekteyse grup sorgusu atılmaz.
+    """
+    context = {
+        "layout_cache_timeout": LAYOUT_CACHE_TIMEOUT,
+        "curriculum_cache_timeout": CURRICULUM_CACHE_TIMEOUT,
+        "cache_tags": CacheTagVersions(),
+    }
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        context["layout_role"] = SimpleLazyObject(lambda: get_user_role(user))
+        context["layout_version"] = SimpleLazyObject(lambda: user_layout_version(user))
+        # Üst çubuktaki dönem seçici (bkz. semesters.py)
+        context["active_semester"] = SimpleLazyObject(
+            lambda: get_active_semester(request)
+        )
+        context["semester_choices"] = SimpleLazyObject(semester_choices)
+    return context
@@ -0,0 +1,172 @@
+"""
+Ders müfredat grafiği önbelleği (süreç içi).
+
+Sınav → LO → PO yapısı (AssessmentWeight, OutcomeMapping) nadiren değişir ama her öğrenci
+sayfasında LO başına yeniden sorgulanıyordu. Her dersin grafiği bir kez okunup küçük
+numpy dizileri olarak süreç belleğinde tutulur:
+    lo_ids            : dersin LO'ları (id sırasıyla)
+    assessment_ids    : LO'lara yüzde veren sınavlar
+    weights[A×L]      : sınav başına LO yüzde vektörleri
+    po_codes          : LO'ların bağlandığı PO kodları
+    mappings[L×P]     : PO başına LO ağırlık vektörleri
+
+Geçersizleştirme: ilgili modellerde post_save/post_delete sinyalleri ortak önbellekteki
+"curriculum" versiyonunu artırır (bkz. signals.py). Her süreç istek başına bu versiyonu bir
+kez okur; değişmişse yerel grafiklerini atar. Yerelde olmayan grafikler önce ortak
+önbellekten alınır; orada da yoksa tek bir süreç kurar, diğerleri onu bekler.
+"""
+
+import numpy as np
+
+from .caching import (
+    CURRICULUM_CACHE_TIMEOUT,
+    bump_version,
+    get_or_compute_many,
+    get_version,
+)
+from .models import AssessmentWeight, LearningOutcome, OutcomeMapping
+
+CURRICULUM_VERSION = "curriculum"
+
+# Bu süreçteki grafikler; versiyon değişince tamamen yenilenir
+_local = {"version": None, "graphs": {}}
+
+
+class CourseGraph:
+    __slots__ = (
+        "course_id",
+        "lo_ids",
+        "lo_codes",
+        "lo_descriptions",
+        "assessment_ids",
+        "weights",
+        "po_codes",
+        "mappings",
+    )
+
+    def __init__(self, course_id, los, weights, mappings):
+        self.course_id = course_id
+        self.lo_ids = [lo_id for lo_id, _code, _description in los]
+        self.lo_codes = [code for _lo_id, code, _description in los]
+        self.lo_descriptions = [description for _lo_id, _code, description in los]
+        lo_position = {lo_id: i for i, lo_id in enumerate(self.lo_ids)}
+
+        self.assessment_ids = sorted({assessment for assessment, _lo, _v in weights})
+        assessment_position = {a: i for i, a in enumerate(self.assessment_ids)}
+        self.weights = np.zeros((len(self.assessment_ids), len(self.lo_ids)))
+        for assessment, lo_id, value in weights:
+            self.weights[assessment_position[assessment], lo_position[lo_id]] += value
+
+        self.po_codes = list(dict.fromkeys(code for _lo, code, _v in mappings))
+        po_position = {code: i for i, code in enumerate(self.po_codes)}
+        self.mappings = np.zeros((len(self.lo_ids), len(self.po_codes)))
+        for lo_id, code, value in mappings:
+            self.mappings[lo_position[lo_id], po_position[code]] += value
+
+    def lo_rates(self, score_map):
+        """score_map: {sınav id: puan}. Öğrencinin LO başarımları (0-100)."""
+        rates = np.zeros(len(self.lo_ids))
+        if not self.assessment_ids:
+            return rates
+        scores = np.array([float(score_map.get(a, 0)) for a in self.assessment_ids])
+        has_score = np.array([a in score_map for a in self.assessment_ids], float)
+        earned = scores @ self.weights
+        possible = 100 * (has_score @ self.weights)
+        return np.divide(earned * 100, possible, out=rates, where=possible > 0)
+
+    def held_los(self, held_assessment_ids):
+        """Yapılmış (en az bir notu olan) sınavlardan yüzde alan LO'ların maskesi."""
+        if not self.assessment_ids:
+            return np.zeros(len(self.lo_ids), dtype=bool)
+        held = np.array([a in held_assessment_ids for a in self.assessment_ids], float)
+        return (held @ self.weights) > 0
+
+    def po_totals(self, lo_rates, los=None):
+        """
+        PO kodu başına (kazanılan, mümkün) katkı toplamları.
+        los (bool maskesi) verilirse sadece bu LO'lar hesaba katılır.
+        """
+        mappings = self.mappings if los is None else self.mappings[los]
+        lo_rates = lo_rates if los is None else lo_rates[los]
+        earned = lo_rates @ mappings
+        possible = 100 * mappings.sum(axis=0)
+        return {
+            code: (float(earned[p]), float(possible[p]))
+            for p, code in enumerate(self.po_codes)
+        }
+
+
+def curriculum_version():
+    return get_version(CURRICULUM_VERSION)
+
+
+def invalidate_curriculum():
+    bump_version(CURRICULUM_VERSION)
+
+
+def _build_graphs(course_ids):
+    los, weights, mappings = {}, {}, {}
+    lo_rows = (
+        LearningOutcome.objects.filter(course_id__in=course_ids)
+        .order_by("id")
+        .values_list("id", "course_id", "code", "description")
+    )
+    for lo_id, course_id, code, description in lo_rows:
+        los.setdefault(course_id, []).append((lo_id, code, description))
+
+    weight_rows = AssessmentWeight.objects.filter(
+        learning_outcome__course_id__in=course_ids
+    ).values_list(
+        "assessment_id",
+        "learning_outcome_id",
+        "learning_outcome__course_id",
+        "percentage",
+    )
+    for assessment_id, lo_id, course_id, percentage in weight_rows:
+        weights.setdefault(course_id, []).append(
+            (assessment_id, lo_id, float(percentage))
+        )
+
+    mapping_rows = OutcomeMapping.objects.filter(
+        learning_outcome__course_id__in=course_ids
+    ).values_list(
+        "learning_outcome_id",
+        "learning_outcome__course_id",
+        "program_outcome__code",
+        "weight",
+    )
+    for lo_id, course_id, code, weight in mapping_rows:
+        mappings.setdefault(course_id, []).append((lo_id, code, float(weight)))
+
+    return {
+        course_id: CourseGraph(
+            course_id,
+            los.get(course_id, []),
+            weights.get(course_id, []),
+            mappings.get(course_id, []),
+        )
+        for course_id in course_ids
+    }
+
+
+def get_course_graphs(course_ids):
+    """{ders id: CourseGraph}; eksik olanlar üç sorguda toplu okunur."""
+    version = curriculum_version()
+    if _local["version"] != version:
+        _local["version"] = version
+        _local["graphs"] = {}
+    graphs = _local["graphs"]
+    missing = [course_id for course_id in course_ids if course_id not in graphs]
+    if missing:
+        keys = {
+            course_id: f"academic:curriculum:{version}:{course_id}"
+            for course_id in missing
+        }
+        graphs.update(
+            get_or_compute_many(keys, _build_graphs, CURRICULUM_CACHE_TIMEOUT)
+        )
+    return {course_id: graphs[course_id] for course_id in course_ids}
+
+
+def get_course_graph(course_id):
+    return get_course_graphs([course_id])[course_id]
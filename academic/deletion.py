@@ -0,0 +1,176 @@
+"""
+Dönem ve ders silme (arka planda, parça parça).
+
+Django'nun .delete()'i CASCADE zincirindeki bütün satırları (ders, sınav, ağırlık, not, kayıt,
+...) önce belleğe toplar, sinyallerini gönderir ve hepsini tek uzun işlemde siler; dolu bir
+dönemde bu, SQLite'ı herkes için dakikalarca kilitler. Burada silme iş kuyruğunda çalışır:
+    - ilişki ağacı modellerin _meta bilgisinden çıkarılır (yeni bir CASCADE ilişkisi
+      eklendiğinde burada değişiklik gerekmez),
+    - en alttaki tablolardan başlanarak her tablo CHUNK_SIZE'lık id parçaları halinde, her
+      parça kendi kısa işleminde silinir; bellekte en fazla bir parçanın id'leri durur,
+    - kök satır (dönem/ders) en son, kalan çocuklarla birlikte tek işlemde normal
+      .delete() ile silinir.
+İş sırada veya çalışırken kök "siliniyor" sayılır (is_deleting); görünümler o ders ve
+dönemdeki yazmaları reddeder.
+Silme çocuklardan ebeveyne ilerlediği için iş yarıda kesilse de yabancı anahtarlar tutarlıdır;
+tekrar denemede kalan satırlar silinir.
+
+Çocuk satırlar sinyalsiz silindiği için önbellekler iş sonunda elle geçersizlenir.
+"""
+
+from collections import defaultdict
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import CASCADE, SET_NULL, Q
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+from .caching import TAG_ATTAINMENT, TAG_LEARNING_OUTCOMES, invalidate_tag
+from .curriculum import invalidate_curriculum
+from .jobs import enqueue
+from .models import Course, Job, Semester
+from .percentiles import invalidate_all as invalidate_percentiles
+from .trends import request_refresh as request_trend_refresh
+
+DELETE_TASK = "cascade_delete"
+
+CHUNK_SIZE = 1000
+
+# Payload'daki ad -> model
+TARGETS = {"semester": Semester, "course": Course}
+
+
+def _target_name(obj):
+    return next(name for name, model in TARGETS.items() if isinstance(obj, model))
+
+
+def pending_jobs(name):
+    """{kök id: Job} — sırada veya çalışan silme işleri (arayüzdeki ilerleme çubuğu için)."""
+    jobs = Job.objects.filter(
+        task=DELETE_TASK,
+        status__in=[Job.STATUS_PENDING, Job.STATUS_RUNNING],
+        payload__model=name,
+    ).order_by("id")
+    return {job.payload["id"]: job for job in jobs}
+
+
+def is_deleting(course_id, semester_id):
+    """
+    Ders ya da dönemi için silme işi sırada veya çalışıyorsa True. İş sıraya girdiği andan
+    itibaren kök "siliniyor" sayılır; görünümler bu sürede yazmaları reddeder (silinmiş bir
+    parçaya yeni satır eklenmesin).
+    """
+    return Job.objects.filter(
+        Q(payload__model="course", payload__id=course_id)
+        | Q(payload__model="semester", payload__id=semester_id),
+        task=DELETE_TASK,
+        status__in=[Job.STATUS_PENDING, Job.STATUS_RUNNING],
+    ).exists()
+
+
+def request_delete(obj, user=None):
+    """Silme işini sıraya koyar ve döner; zaten sıradaysa None."""
+    name = _target_name(obj)
+    if obj.pk in pending_jobs(name):
+        return None
+    return enqueue(DELETE_TASK, {"model": name, "id": obj.pk}, user=user)
+
+
+# --- PLAN ---
+
+
+def plan(queryset):
+    """
+    Silme adımları, çalışma sırasıyla (önce çocuklar): ("delete", sorgu) ya da
+    ("null", sorgu, alan) — SET_NULL ilişkileri için.
+    """
+    steps = []
+    # Collector'ın kullandığı ilişkiler: gizli olanlar (related_name="+") ve otomatik
+    # many-to-many ara tabloları dahil
+    for rel in get_candidate_relations_to_delete(queryset.model._meta):
+        children = rel.related_model._base_manager.filter(
+            **{f"{rel.field.name}__in": queryset}
+        )
+        if rel.on_delete is CASCADE:
+            steps.extend(plan(children))
+        elif rel.on_delete is SET_NULL:
+            steps.append(("null", children, rel.field.name))
+    steps.append(("delete", queryset))
+    return steps
+
+
+def _estimate(steps):
+    """
+    Silinecek satır sayısı. Aynı tabloya birden çok yoldan varılır (ör. ScoreFact: not,
+    sınav, ders ve dönem üzerinden); hepsi aynı alt ağaçtaki satırlardır, en büyüğü alınır.
+    """
+    counts = defaultdict(int)
+    for kind, queryset, *_field in steps:
+        if kind == "delete":
+            model = queryset.model
+            counts[model] = max(counts[model], queryset.count())
+    return sum(counts.values())
+
+
+# --- ÇALIŞTIRMA ---
+
+
+def _delete_chunks(queryset, chunk_size):
+    """Satırları id parçaları halinde siler; her parçada silinen sayıyı üretir."""
+    model = queryset.model
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            # Çocuklar önceki adımlarda silindi; CASCADE toplayıcısı ve sinyaller gereksiz
+            model._base_manager.filter(pk__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
+        yield len(ids)
+
+
+def delete(name, pk, chunk_size=CHUNK_SIZE, progress=None):
+    """Kök satırı (dönem/ders) ve bütün alt ağacını parça parça siler."""
+    progress = progress or (lambda percent, message="": None)
+    model = TARGETS[name]
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None:
+        return {"skipped": True}
+
+    progress(0, "Silinecek satırlar sayılıyor")
+    # Kökün kendisi en sonda .delete() ile (sinyaller: dönem listesi, arşiv, LO listeleri)
+    steps = plan(model.objects.filter(pk=pk))[:-1]
+    total = max(_estimate(steps), 1)
+    deleted = defaultdict(int)
+    done = 0
+    for kind, queryset, *field in steps:
+        label = queryset.model._meta.verbose_name_plural
+        if kind == "null":
+            queryset.update(**{field[0]: None})
+            continue
+        for count in _delete_chunks(queryset, chunk_size):
+            deleted[queryset.model._meta.model_name] += count
+            done += count
+            progress(min(99, 100 * done // total), f"{label}: {done} / {total} satır")
+
+    semester_id = getattr(obj, "semester_id", None)
+    with transaction.atomic():
+        # Parçalar silinirken yazılmış çocuklar (görünümler reddetse de yönetim paneli,
+        # komutlar) kökle aynı işlemde silinir; kök hiçbir zaman çocuklu kalmaz
+        for kind, queryset, *field in steps:
+            if kind == "null":
+                queryset.update(**{field[0]: None})
+            else:
+                deleted[queryset.model._meta.model_name] += queryset._raw_delete(
+                    DEFAULT_DB_ALIAS
+                )
+        obj.delete()
+
+    # Sinyalsiz silinen satırların önbellekleri
+    invalidate_tag(TAG_ATTAINMENT)
+    invalidate_tag(TAG_LEARNING_OUTCOMES)
+    invalidate_curriculum()
+    invalidate_percentiles()
+    if semester_id:
+        # Dönemin kalan dersleriyle eğilim noktaları yeniden hesaplanır
+        request_trend_refresh(semester_id)
+    progress(100, "Tamamlandı")
+    return dict(deleted)
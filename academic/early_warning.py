@@ -0,0 +1,161 @@
+"""
+Erken uyarı: dersi geçme riski taşıyan öğrenciler.
+
+Öğrenci × ders başına iki gösterge hesaplanır:
+    - Tahmini ortalama: yapılmış sınavların (en az bir notu olan) Assessment.weight ile
+      ağırlıklı ortalaması. Öğrencinin girmediği yapılmış sınav 0 sayılır; henüz yapılmamış
+      sınavlar paydaya girmez.
+    - PO eğilimi: öğrencinin bu dersteki PO başarımı (sadece yapılmış sınavların kapsadığı
+      LO'lar) ile kapatılmış dönemlerdeki (arşiv) başarımı arasındaki ortalama fark.
+Eşiklerden birini aşan öğrenciler RiskFlag tablosuna yazılır.
+
+Hesap ders bazında yapılır: not/kayıt değişince o ders için tek bir yenileme işi sıraya
+girer (bkz. signals.py); gece tüm açık dönem dersleri `manage.py refresh_risk_flags` ile
+yenilenebilir.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import FloatField, Sum
+from django.db.models.functions import Cast
+
+from .curriculum import get_course_graphs
+from .jobs import enqueue
+from .models import (
+    ArchivedPOAttainment,
+    Assessment,
+    Course,
+    Enrollment,
+    Job,
+    RiskFlag,
+    StudentScore,
+)
+
+REFRESH_RISK_TASK = "refresh_risk_flags"
+
+# Not girişi sırasında gelen değişiklikler tek işte toplansın diye kısa bir bekleme
+REFRESH_DELAY = timedelta(seconds=60)
+
+COURSE_CHUNK_SIZE = 50
+
+
+def request_refresh(course_id):
+    """Dersin risk listesini yenileme işini sıraya koyar; zaten sıradaysa tekrar koymaz."""
+    if Job.objects.filter(
+        task=REFRESH_RISK_TASK,
+        status=Job.STATUS_PENDING,
+        payload__course_id=course_id,
+    ).exists():
+        return False
+    enqueue(REFRESH_RISK_TASK, {"course_id": course_id}, delay=REFRESH_DELAY)
+    return True
+
+
+def _prior_po_rates(student_ids):
+    """{(öğrenci, PO kodu): başarım} — kapatılmış dönemlerin toplamlarından."""
+    rows = (
+        ArchivedPOAttainment.objects.filter(student_id__in=student_ids)
+        .values("student_id", "po_code")
+        .annotate(earned=Sum("earned"), possible=Sum("possible"))
+        .values_list("student_id", "po_code", "earned", "possible")
+    )
+    return {
+        (student_id, code): earned / possible * 100
+        for student_id, code, earned, possible in rows
+        if possible
+    }
+
+
+def compute_flags(course_ids):
+    """Verilen dersler için (kaydedilmemiş) RiskFlag nesneleri."""
+    course_ids = list(course_ids)
+    enrollments = list(
+        Enrollment.objects.filter(course_id__in=course_ids).values_list(
+            "student_id", "course_id"
+        )
+    )
+    if not enrollments:
+        return []
+
+    course_assessments = {}
+    for assessment_id, course_id, weight in Assessment.objects.filter(
+        course_id__in=course_ids
+    ).values_list("id", "course_id", "weight"):
+        course_assessments.setdefault(course_id, []).append((assessment_id, weight))
+
+    score_maps = {}
+    scores = (
+        StudentScore.objects.filter(assessment__course_id__in=course_ids)
+        .annotate(value=Cast("score", FloatField()))
+        .values_list("student_id", "assessment__course_id", "assessment_id", "value")
+    )
+    held = set()
+    for student_id, course_id, assessment_id, value in scores:
+        score_maps.setdefault((student_id, course_id), {})[assessment_id] = value
+        held.add(assessment_id)
+
+    graphs = get_course_graphs(course_ids)
+    held_los = {
+        course_id: graph.held_los(held) for course_id, graph in graphs.items()
+    }
+    prior = _prior_po_rates({student_id for student_id, _course in enrollments})
+
+    flags = []
+    for student_id, course_id in enrollments:
+        completed = [
+            (assessment_id, weight)
+            for assessment_id, weight in course_assessments.get(course_id, [])
+            if assessment_id in held and weight > 0
+        ]
+        completed_weight = sum(weight for _assessment, weight in completed)
+        if not completed_weight:
+            continue
+        score_map = score_maps.get((student_id, course_id), {})
+        earned = sum(score_map.get(assessment, 0) * weight for assessment, weight in completed)
+        projected = earned / completed_weight
+
+        graph = graphs[course_id]
+        totals = graph.po_totals(graph.lo_rates(score_map), held_los[course_id])
+        deltas = [
+            earned / possible * 100 - prior[(student_id, code)]
+            for code, (earned, possible) in totals.items()
+            if possible and (student_id, code) in prior
+        ]
+        trend = sum(deltas) / len(deltas) if deltas else None
+
+        flag = RiskFlag(
+            student_id=student_id,
+            course_id=course_id,
+            projected_average=round(projected, 1),
+            completed_weight=completed_weight,
+            po_trend=round(trend, 1) if trend is not None else None,
+        )
+        if flag.is_failing or flag.is_declining:
+            flags.append(flag)
+    return flags
+
+
+def refresh_course_flags(course_ids):
+    """Derslerin risk listesini yeniden yazar; yazılan uyarı sayısını döner."""
+    flags = compute_flags(course_ids)
+    with transaction.atomic():
+        RiskFlag.objects.filter(course_id__in=course_ids).delete()
+        RiskFlag.objects.bulk_create(flags)
+    return len(flags)
+
+
+def refresh_all(progress=None):
+    """Açık dönemlerdeki tüm derslerin risk listesi, ders grupları halinde."""
+    progress = progress or (lambda percent, message="": None)
+    course_ids = list(
+        Course.objects.filter(semester__is_closed=False)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    flagged = 0
+    for start in range(0, len(course_ids), COURSE_CHUNK_SIZE):
+        flagged += refresh_course_flags(course_ids[start : start + COURSE_CHUNK_SIZE])
+        done = min(start + COURSE_CHUNK_SIZE, len(course_ids))
+        progress(100 * done // len(course_ids), f"{done}/{len(course_ids)} ders")
+    return {"courses": len(course_ids), "flags": flagged}
@@ -0,0 +1,196 @@
+"""
+Not olgu tablosu (ScoreFact) bakımı ve sorgu arayüzü.
+
+ScoreFact her StudentScore için boyut anahtarlarını (öğrenci, bölüm, ders, öğretmen,
+dönem, sınav) ve sınav etkisini kopya olarak tutar. Bakım artımlıdır:
+    - not kaydı/silinmesi: sinyalle tek satır yazılır (silme CASCADE ile),
+    - öğrencinin bölümü, dersin öğretmeni/dönemi, sınavın etkisi değişince: sinyalle
+      ilgili olgular tek UPDATE ile güncellenir (bkz. signals.py),
+    - sinyal tetiklemeyen toplu yazımlar (bulk_create, queryset.update): sync_pending
+      notun updated_at değerine bakarak geride kalan satırları tamamlar.
+
+Sorgular aggregate() ile yapılır: istenen boyutlara göre tek GROUP BY taraması.
+    aggregate(["department", "semester"])
+    aggregate(["course"], semester=3, teacher=7)
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Min, Q, Sum
+from django.db.models.functions import Cast
+
+from .models import ScoreFact, StudentScore
+
+BULK_BATCH_SIZE = 2000
+
+# Sorguda kullanılabilen boyutlar: ad -> ScoreFact kolonu
+DIMENSIONS = {
+    "student": "student_id",
+    "department": "department_id",
+    "course": "course_id",
+    "teacher": "teacher_id",
+    "semester": "semester_id",
+    "assessment": "assessment_id",
+}
+
+# StudentScore satırından olgu kolonları
+_FACT_COLUMNS = {
+    "student_score_id": F("id"),
+    "student_id": F("student_id"),
+    "department_id": F("student__department_id"),
+    "course_id": F("assessment__course_id"),
+    "teacher_id": F("assessment__course__teacher_id"),
+    "semester_id": F("assessment__course__semester_id"),
+    "assessment_id": F("assessment_id"),
+    "assessment_weight": F("assessment__weight"),
+    "score": Cast("score", FloatField()),
+    "score_updated_at": F("updated_at"),
+}
+_UPDATE_FIELDS = [name for name in _FACT_COLUMNS if name != "student_score_id"]
+
+
+# --- BAKIM ---
+
+
+def sync_scores(scores, batch_size=BULK_BATCH_SIZE):
+    """
+    scores (StudentScore sorgusu) için olguları yazar ya da günceller (upsert).
+    Notlar id sırasıyla parça parça okunur. Yazılan satır sayısını döner.
+    """
+    fields = [f"_f_{name}" for name in _FACT_COLUMNS]
+    rows = scores.annotate(**dict(zip(fields, _FACT_COLUMNS.values()))).order_by("id")
+    last_id, total = 0, 0
+    while True:
+        chunk = list(rows.filter(id__gt=last_id).values_list(*fields)[:batch_size])
+        if not chunk:
+            return total
+        last_id = chunk[-1][0]
+        ScoreFact.objects.bulk_create(
+            [ScoreFact(**dict(zip(_FACT_COLUMNS, row))) for row in chunk],
+            update_conflicts=True,
+            unique_fields=["student_score"],
+            update_fields=_UPDATE_FIELDS,
+        )
+        total += len(chunk)
+
+
+def sync_pending(batch_size=BULK_BATCH_SIZE):
+    """Olgusu olmayan ya da olgusundan sonra değişmiş notları yazar."""
+    return sync_scores(
+        StudentScore.objects.filter(
+            Q(fact__isnull=True) | Q(updated_at__gt=F("fact__score_updated_at"))
+        ),
+        batch_size,
+    )
+
+
+def rebuild(batch_size=BULK_BATCH_SIZE):
+    """Tabloyu baştan kurar (boyut tablolarına toplu UPDATE yapıldıysa)."""
+    with transaction.atomic():
+        ScoreFact.objects.all().delete()
+        return sync_scores(StudentScore.objects.all(), batch_size)
+
+
+# --- SORGU ---
+
+
+def _filter_kwargs(filters):
+    kwargs = {}
+    for name, value in filters.items():
+        column = DIMENSIONS[name]
+        if isinstance(value, (list, tuple, set)):
+            kwargs[f"{column}__in"] = value
+        else:
+            kwargs[column] = value
+    return kwargs
+
+
+# Veritabanı başına kısmi toplamlar; birleştirilip ortalamalara çevrilir
+_PARTIALS = {
+    "scores": Count("pk"),
+    "students": Count("student_id", distinct=True),
+    "score_sum": Sum("score"),
+    "minimum": Min("score"),
+    "maximum": Max("score"),
+    "weighted_sum": Sum(F("score") * F("assessment_weight")),
+    "weight_sum": Sum("assessment_weight"),
+}
+
+
+def _aliases(filters):
+    """Olguların okunacağı veritabanları; arşivlenmiş dönemlerin olguları arşivde."""
+    from . import cold_storage  # cold_storage bu modülü içe aktarır
+
+    aliases = cold_storage.databases(ScoreFact)
+    if len(aliases) == 1 or "semester" not in filters:
+        return aliases
+    wanted = filters["semester"]
+    wanted = set(wanted) if isinstance(wanted, (list, tuple, set)) else {wanted}
+    archived = cold_storage.archived_semester_ids()
+    return [
+        alias
+        for alias, needed in zip(aliases, [wanted - archived, wanted & archived])
+        if needed
+    ]
+
+
+def _merge(total, part):
+    if total is None:
+        return dict(part)
+    for name in ("scores", "students", "score_sum", "weighted_sum", "weight_sum"):
+        total[name] = (total[name] or 0) + (part[name] or 0)
+    for name, pick in (("minimum", min), ("maximum", max)):
+        values = [v for v in (total[name], part[name]) if v is not None]
+        total[name] = pick(values) if values else None
+    return total
+
+
+def _metrics(partial):
+    return {
+        "scores": partial["scores"],
+        "students": partial["students"],
+        "average": partial["score_sum"] / partial["scores"] if partial["scores"] else None,
+        "minimum": partial["minimum"],
+        "maximum": partial["maximum"],
+        "weighted_average": partial["weighted_sum"] / partial["weight_sum"]
+        if partial["weight_sum"]
+        else None,
+    }
+
+
+def aggregate(group_by, **filters):
+    """
+    group_by: DIMENSIONS adları (boş liste: tek toplam satırı).
+    filters: boyut adı -> id veya id listesi (örn. semester=3, department=[1, 2]).
+    Her grup için not sayısı, öğrenci sayısı, ortalama/en düşük/en yüksek not ve sınav
+    etkisiyle ağırlıklı ortalama döner. Veritabanı başına tek sorgu; değerler indeksten
+    okunur. Arşivlenmiş dönemlerin olguları arşiv veritabanındadır (bkz. cold_storage.py);
+    iki veritabanının grupları birleştirilir.
+    """
+    columns = [DIMENSIONS[name] for name in group_by]
+    aliases = _aliases(filters)
+    groups = {}
+    students = {}
+    # Bir dönem tek veritabanındadır; dönemsiz gruplarda aynı öğrenci iki tarafta da olabilir
+    split_students = len(aliases) > 1 and "semester" not in group_by
+    for alias in aliases:
+        queryset = ScoreFact.objects.using(alias).filter(**_filter_kwargs(filters))
+        if not columns:
+            rows = [queryset.aggregate(**_PARTIALS)]
+        else:
+            rows = queryset.values(*columns).annotate(**_PARTIALS).order_by()
+        for row in rows:
+            key = tuple(row[column] for column in columns)
+            groups[key] = _merge(groups.get(key), row)
+        if split_students:
+            for *key, student_id in queryset.values_list(
+                *columns, "student_id"
+            ).distinct():
+                students.setdefault(tuple(key), set()).add(student_id)
+    result = []
+    # SQL'deki gibi artan sıra, boş (NULL) değerler başta
+    for key in sorted(groups, key=lambda key: [(v is not None, v) for v in key]):
+        partial = groups[key]
+        if split_students:
+            partial["students"] = len(students.get(key, ()))
+        result.append({**dict(zip(group_by, key)), **_metrics(partial)})
+    return result
@@ -1,5 +1,6 @@
 from django import forms
 from django.contrib.auth.models import User
+from django.forms.models import ModelChoiceIterator
 from .models import (
     LearningOutcome,
     ProgramOutcome,
@@ -14,6 +15,67 @@ from .models import (
 )
 
 
+# --- SEÇİM KUTUSU (DROPDOWN) PERFORMANSI ---
+# Course.__str__ hocayı, Assessment/LearningOutcome.__str__ dersi, AssessmentWeight.__str__
+# ise sınavı ve LO'yu okur. Bu ilişkiler select_related ile gelmezse her seçenek için
+# ayrı bir sorgu atılır (1000 seçenek = 1000 sorgu).
+CHOICE_RELATED_FIELDS = {
+    Course: ("teacher",),
+    Assessment: ("course",),
+    LearningOutcome: ("course",),
+    AssessmentWeight: ("assessment", "learning_outcome"),
+}
+
+
+def choice_queryset(model, queryset=None):
+    """Seçim listesi için __str__'in ihtiyaç duyduğu ilişkileri tek sorguda getirir."""
+    if queryset is None:
+        queryset = model._default_manager.all()
+    related = CHOICE_RELATED_FIELDS.get(model)
+    return queryset.select_related(*related) if related else queryset
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """
+    Seçenekleri ilk kullanımda bir kez hesaplar ve alan üzerinde saklar.
+    Aynı form alanı birden çok kez render edilse (veya len() çağrılsa) bile tek sorgu atılır.
+    Queryset değiştirilirse (örn. view içinde filtrelenirse) önbellek kendiliğinden yenilenir.
+    """
+
+    def _cached_choices(self):
+        cache = getattr(self.field, "_choice_cache", None)
+        if cache is None or cache[0] is not self.queryset:
+            cache = (self.queryset, [self.choice(obj) for obj in self.queryset])
+            self.field._choice_cache = cache
+        return cache[1]
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self._cached_choices()
+
+    def __len__(self):
+        return len(self._cached_choices()) + (
+            1 if self.field.empty_label is not None else 0
+        )
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self._cached_choices())
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+def optimize_choice_fields(form):
+    """Formdaki tüm model seçim alanlarına select_related + önbellekli iterator uygular."""
+    for field in form.fields.values():
+        if isinstance(field, forms.ModelChoiceField):
+            field.iterator = CachedModelChoiceIterator
+            # queryset ataması widget seçeneklerini yeni iterator ile yeniden kurar
+            field.queryset = choice_queryset(field.queryset.model, field.queryset)
+
+
 # Aöğrenci oluşturma arayüzü
 class StudentCreationForm(forms.ModelForm):
     first_name = forms.CharField(label="Ad", max_length=30)
@@ -37,6 +99,7 @@ class StudentCreationForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             # Checkbox hariç diğerlerine form-control, checkbox varsa form-check-input (gerçi burada yok)
             self.fields[field].widget.attrs.update({"class": "form-control"})
@@ -79,6 +142,7 @@ class CourseForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             self.fields[field].widget.attrs.update({"class": "form-control"})
             if field in ["semester", "teacher"]:
@@ -117,6 +181,7 @@ class LearningOutcomeForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             self.fields[field].widget.attrs.update(
                 {"class": "form-control", "placeholder": "..."}
@@ -154,6 +219,7 @@ class AssessmentForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             self.fields[field].widget.attrs.update(
                 {"class": "form-control", "placeholder": "..."}
@@ -172,6 +238,7 @@ class AssessmentWeightForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             self.fields[field].widget.attrs.update(
                 {"class": "form-control", "placeholder": "..."}
@@ -190,6 +257,7 @@ class OutcomeMappingForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             self.fields[field].widget.attrs.update(
                 {"class": "form-control", "placeholder": "..."}
@@ -205,5 +273,6 @@ class EnrollmentForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        optimize_choice_fields(self)
         for field in self.fields:
             self.fields[field].widget.attrs.update({"class": "form-select"})
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Şifre özet (hash) ayarı.
+
+Her girişte şifre doğrulaması kasıtlı olarak yavaştır ve sonuç açıklama anında giriş
+gecikmesinin çoğunu oluşturur. Yineleme sayısı settings.PASSWORD_PBKDF2_ITERATIONS ile
+artırılabilir; Django'nun varsayılanının altına inilmez (gecikme için güvenlikten
+vazgeçilmez). Değer bu sunucuda `manage.py benchmark_hashers` ile ölçülerek seçilebilir.
+Daha az yinelemeyle kaydedilmiş şifreler ilk başarılı girişte yeni sayıyla yeniden
+özetlenir; daha fazla yinelemeyle kaydedilmiş olanlar olduğu gibi kalır.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = max(
+        getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", 0),
+        PBKDF2PasswordHasher.iterations,
+    )
+
+    def must_update(self, encoded):
+        # Algoritma adı aynı (pbkdf2_sha256); sadece daha zayıf özetler yenilenir
+        decoded = self.decode(encoded)
+        return decoded["iterations"] < self.iterations
@@ -0,0 +1,236 @@
+"""
+Ders bazında sınav (madde) analizi.
+
+Dersin bütün notları tek sorguyla öğrenci × sınav matrisine (S×A, notu olmayan hücre NaN)
+okunur; istatistiklerin hepsi bu matris üzerinde numpy ile hesaplanır:
+    - sınav başına dağılım: histogram (0-10, ..., 90-100), yüzdelikler, ortalama,
+      standart sapma, geçme oranı,
+    - güçlük indeksi (ortalama / 100) ve ayırt edicilik: sınav notunun öğrencinin diğer
+      sınavlarındaki ortalamasıyla korelasyonu (düzeltilmiş madde-toplam korelasyonu),
+    - sınavlar arası korelasyon matrisi (her çift için ikisine de giren öğrenciler),
+    - LO güçlüğü: müfredat grafiğindeki sınav → LO yüzdeleriyle öğrenci LO başarımları.
+Sonuç önbelleğe alınır; not, ağırlık veya müfredat değişince anahtarı eskir.
+"""
+
+import numpy as np
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from .caching import (
+    REPORT_CACHE_TIMEOUT,
+    TAG_ATTAINMENT,
+    get_or_compute,
+    tag_version,
+)
+from .curriculum import curriculum_version, get_course_graph
+from .models import Assessment, StudentScore
+from .simulation import HISTOGRAM_EDGES, PASS_THRESHOLD
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+# Korelasyon için bir çiftte en az bu kadar ortak öğrenci olmalı
+MIN_PAIR_COUNT = 3
+
+# Klasik güçlük indeksi sınırları (p = ortalama / 100)
+EASY_INDEX = 0.7
+HARD_INDEX = 0.4
+
+
+def _round(value, digits=2):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def difficulty_label(index):
+    if index is None:
+        return ""
+    if index >= EASY_INDEX:
+        return "Kolay"
+    if index < HARD_INDEX:
+        return "Zor"
+    return "Orta"
+
+
+def score_matrix(course):
+    """(öğrenci id'leri, sınavlar, S×A not matrisi); notu olmayan hücre NaN."""
+    assessments = list(
+        Assessment.objects.filter(course=course).order_by("date", "id").values(
+            "id", "name", "weight"
+        )
+    )
+    rows = np.array(
+        StudentScore.objects.filter(assessment__course=course)
+        .annotate(value=Cast("score", FloatField()))
+        .values_list("student_id", "assessment_id", "value"),
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    student_ids = np.unique(rows[:, 0].astype(np.int64))
+    assessment_ids = np.array([a["id"] for a in assessments], dtype=np.int64)
+    matrix = np.full((len(student_ids), len(assessment_ids)), np.nan)
+    if len(rows):
+        # Sınav listesi sıralı değil; id -> sütun eşlemesi argsort ile
+        order = np.argsort(assessment_ids)
+        columns = order[
+            np.searchsorted(assessment_ids[order], rows[:, 1].astype(np.int64))
+        ]
+        students = np.searchsorted(student_ids, rows[:, 0].astype(np.int64))
+        matrix[students, columns] = rows[:, 2]
+    return student_ids, assessments, matrix
+
+
+def correlation_matrix(matrix):
+    """
+    Çift bazında (pairwise complete) Pearson korelasyonu. Eksik hücreler 0 ve maske
+    olarak alınıp tüm çiftlerin toplamları tek seferde matris çarpımıyla bulunur.
+    """
+    present = (~np.isnan(matrix)).astype(np.float64)
+    values = np.nan_to_num(matrix)
+    n = present.T @ present  # çiftte ortak öğrenci sayısı
+    sum_x = values.T @ present  # [i, j]: j'ye de girenler arasında i'nin toplamı
+    sum_xx = (values**2).T @ present
+    sum_xy = values.T @ values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_x = sum_xx - sum_x**2 / n
+        corr = cov / np.sqrt(var_x * var_x.T)
+    corr[(n < MIN_PAIR_COUNT) | ~np.isfinite(corr)] = np.nan
+    np.fill_diagonal(corr, np.where(np.diag(n) >= MIN_PAIR_COUNT, 1.0, np.nan))
+    return np.clip(corr, -1, 1), n
+
+
+def _column_stats(matrix):
+    """Sınav başına (n, ortalama, örneklem std); boş sütunlar NaN (uyarı üretmeden)."""
+    present = ~np.isnan(matrix)
+    counts = present.sum(axis=0)
+    values = np.nan_to_num(matrix)
+    means = np.divide(
+        values.sum(axis=0), counts, out=np.full(len(counts), np.nan), where=counts > 0
+    )
+    squares = (np.where(present, matrix - means, 0) ** 2).sum(axis=0)
+    stds = np.sqrt(
+        np.divide(squares, counts - 1, out=np.full(len(counts), np.nan), where=counts > 1)
+    )
+    return counts, means, stds
+
+
+def _discrimination(matrix):
+    """Her sınav için: not ile öğrencinin diğer sınavlarındaki ortalaması arasındaki r."""
+    A = matrix.shape[1]
+    result = np.full(A, np.nan)
+    if A < 2:
+        return result
+    present = ~np.isnan(matrix)
+    totals = np.nansum(matrix, axis=1)
+    counts = present.sum(axis=1)
+    for a in range(A):
+        others = counts - present[:, a]
+        rest = np.divide(
+            totals - np.nan_to_num(matrix[:, a]),
+            others,
+            out=np.full(len(totals), np.nan),
+            where=others > 0,
+        )
+        both = present[:, a] & ~np.isnan(rest)
+        if both.sum() >= MIN_PAIR_COUNT:
+            x, y = matrix[both, a], rest[both]
+            if x.std() > 0 and y.std() > 0:
+                result[a] = np.corrcoef(x, y)[0, 1]
+    return result
+
+
+def _lo_difficulty(course, assessments, matrix):
+    graph = get_course_graph(course.id)
+    if not graph.lo_ids or not graph.assessment_ids or not len(matrix):
+        return []
+    # Grafiğin sınav sırasına göre sütunlar (ağırlığı olmayan sınavlar dışarıda kalır)
+    column = {a["id"]: i for i, a in enumerate(assessments)}
+    known = [i for i, a in enumerate(graph.assessment_ids) if a in column]
+    scores = matrix[:, [column[graph.assessment_ids[i]] for i in known]]
+    weights = graph.weights[known]
+    has = ~np.isnan(scores)
+    earned = np.nan_to_num(scores) @ weights
+    possible = 100 * (has.astype(np.float64) @ weights)
+    rates = np.divide(
+        earned * 100, possible, out=np.full(earned.shape, np.nan), where=possible > 0
+    )
+    counts, means, _stds = _column_stats(rates)
+    result = []
+    for lo, code in enumerate(graph.lo_codes):
+        mean = _round(means[lo], 1) if counts[lo] else None
+        index = _round(means[lo] / 100) if counts[lo] else None
+        result.append(
+            {
+                "code": code,
+                "description": graph.lo_descriptions[lo],
+                "students": int(counts[lo]),
+                "mean": mean,
+                "index": index,
+                "label": difficulty_label(index),
+            }
+        )
+    return result
+
+
+def build_course_item_analysis(course):
+    student_ids, assessments, matrix = score_matrix(course)
+    present = ~np.isnan(matrix)
+    counts, means, stds = _column_stats(matrix)
+
+    percentiles = np.full((len(PERCENTILES), len(assessments)), np.nan)
+    if counts.any():
+        percentiles[:, counts > 0] = np.nanpercentile(
+            matrix[:, counts > 0], PERCENTILES, axis=0
+        )
+    discrimination = _discrimination(matrix)
+    corr, _pairs = correlation_matrix(matrix)
+
+    items = []
+    for a, assessment in enumerate(assessments):
+        column = matrix[present[:, a], a]
+        histogram, _edges = np.histogram(column, bins=HISTOGRAM_EDGES)
+        n = int(counts[a])
+        index = _round(means[a] / 100) if n else None
+        items.append(
+            {
+                "id": assessment["id"],
+                "name": assessment["name"],
+                "weight": assessment["weight"],
+                "students": n,
+                "mean": _round(means[a], 1) if n else None,
+                "std": _round(stds[a], 1) if n > 1 else None,
+                "min": _round(column.min(), 1) if n else None,
+                "max": _round(column.max(), 1) if n else None,
+                "percentiles": [
+                    _round(percentiles[p, a], 1) if n else None
+                    for p in range(len(PERCENTILES))
+                ],
+                "pass_rate": _round(100 * (column >= PASS_THRESHOLD).mean(), 1)
+                if n
+                else None,
+                "histogram": histogram.tolist(),
+                "index": index,
+                "label": difficulty_label(index),
+                "discrimination": _round(discrimination[a]),
+            }
+        )
+
+    return {
+        "students": len(student_ids),
+        "items": items,
+        "percentile_labels": PERCENTILES,
+        "histogram_labels": [
+            f"{int(low)}-{int(high)}"
+            for low, high in zip(HISTOGRAM_EDGES[:-1], HISTOGRAM_EDGES[1:])
+        ],
+        "correlation": [[_round(value) for value in row] for row in corr.tolist()],
+        "learning_outcomes": _lo_difficulty(course, assessments, matrix),
+    }
+
+
+def course_item_analysis(course):
+    key = (
+        f"academic:report:items:{course.pk}:{tag_version(TAG_ATTAINMENT)}:"
+        f"{curriculum_version()}"
+    )
+    return get_or_compute(
+        key, lambda: build_course_item_analysis(course), REPORT_CACHE_TIMEOUT
+    )
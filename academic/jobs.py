@@ -0,0 +1,225 @@
+"""
+Veritabanı tabanlı, harici broker gerektirmeyen arka plan iş kuyruğu.
+
+Kullanım:
+    @register_task("rapor_olustur")
+    def rapor_olustur(job, payload):
+        job.set_progress(50, "Yarısı bitti")
+        return {"dosya": "..."}          # Job.result alanına yazılır
+
+    enqueue("rapor_olustur", {"course_id": 3}, user=request.user)
+
+Worker: python manage.py job_worker  (birden fazla süreç aynı anda çalışabilir)
+"""
+
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+# Tekrar denemeler arasında bekleme: 30 sn, 60 sn, 120 sn ...
+RETRY_BASE_DELAY = 30
+# Bu süre boyunca kalp atışı (set_progress) gelmeyen "çalışıyor" iş, çökmüş bir worker'a
+# aittir ve sıraya geri alınır. Uzun görevler set_progress'i bundan sık çağırmalıdır.
+STALE_LOCK_TIMEOUT = timedelta(minutes=30)
+# Worker'lar kalp atışı kesilmiş işleri bu aralıkla arar (bkz. job_worker)
+STALE_CHECK_INTERVAL = 60
+
+
+class PermanentJobError(Exception):
+    """Tekrar denemenin anlamsız olduğu hatalar (örn. silinmiş kayıt); iş doğrudan başarısız olur."""
+
+
+def register_task(name):
+    def decorator(func):
+        TASKS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(
+    task, payload=None, user=None, priority=0, max_attempts=3, delay=None, run_at=None
+):
+    if task not in TASKS:
+        raise ValueError(f"Tanımsız görev: {task}")
+    run_at = run_at or timezone.now()
+    if delay:
+        run_at += delay
+    return Job.objects.create(
+        task=task,
+        payload=payload or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=run_at,
+    )
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobContext:
+    """Görev fonksiyonuna verilen nesne; ilerleme bildirimi için kullanılır."""
+
+    def __init__(self, job):
+        self.job = job
+
+    @property
+    def id(self):
+        return self.job.id
+
+    def set_progress(self, percent, message=""):
+        percent = max(0, min(100, int(percent)))
+        # Sadece ilerleme alanlarını güncelle; tüm satırı yeniden yazma. locked_at kalp
+        # atışıdır: uzun süren iş requeue_stale_jobs tarafından sıraya geri alınmaz.
+        # İş geri alınıp başka bir worker'a geçtiyse onun satırına dokunulmaz.
+        Job.objects.filter(pk=self.job.pk, **_owner(self.job)).update(
+            progress=percent, progress_message=message[:255], locked_at=timezone.now()
+        )
+        self.job.progress = percent
+        self.job.progress_message = message[:255]
+
+
+def _owner(job):
+    """İşi üstlenen çalıştırmayı tanıyan alanlar (claim_next_job her alışta yeniler)."""
+    return {
+        "status": Job.STATUS_RUNNING,
+        "locked_by": job.locked_by,
+        "started_at": job.started_at,
+    }
+
+
+def requeue_stale_jobs():
+    """
+    Kalp atışı kesilmiş işleri sıraya geri alır; yarım kalan çalıştırma bir deneme sayılır
+    (her seferinde worker'ı çökerten iş sonsuza dek dönmez). Deneme hakkı biten iş başarısız
+    olur. Sıraya geri alınan iş sayısını döner.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.STATUS_RUNNING, locked_at__lt=now - STALE_LOCK_TIMEOUT
+    )
+    error = "Worker yanıt vermedi; iş yarıda kaldı."
+    stale.filter(attempts__gte=F("max_attempts") - 1).update(
+        status=Job.STATUS_FAILED,
+        attempts=F("attempts") + 1,
+        error=error,
+        locked_by="",
+        locked_at=None,
+        finished_at=now,
+    )
+    return stale.update(
+        status=Job.STATUS_PENDING,
+        attempts=F("attempts") + 1,
+        error=error,
+        locked_by="",
+        locked_at=None,
+    )
+
+
+def claim_next_job(worker_id, tasks=None):
+    """
+    Sıradaki işi atomik olarak üstlenir.
+    Aday satır "status=pending" koşuluyla güncellenir (compare-and-set); başka bir süreç
+    aynı işi önce aldıysa güncelleme 0 satır döner ve bir sonraki adaya geçilir.
+    """
+    while True:
+        now = timezone.now()
+        candidates = Job.objects.filter(status=Job.STATUS_PENDING, run_at__lte=now)
+        if tasks:
+            candidates = candidates.filter(task__in=tasks)
+        job_id = (
+            candidates.order_by("priority", "run_at", "id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        claimed = Job.objects.filter(id=job_id, status=Job.STATUS_PENDING).update(
+            status=Job.STATUS_RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=now,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+
+
+def run_job(job):
+    """
+    İşi çalıştırır ve sonucunu yazar. Worker ölü sanılıp iş geri alındıysa (bkz.
+    requeue_stale_jobs) sonuç yazılmaz; işin yeni sahibinin durumu ezilmez.
+    """
+    func = TASKS.get(job.task)
+    owner = _owner(job)
+    job.attempts += 1
+    try:
+        if func is None:
+            raise PermanentJobError(f"Tanımsız görev: {job.task}")
+        result = func(JobContext(job), job.payload)
+    except Exception as exc:
+        retry = not isinstance(exc, PermanentJobError)
+        job.error = traceback.format_exc()
+        if retry and job.attempts < job.max_attempts:
+            job.status = Job.STATUS_PENDING
+            job.run_at = timezone.now() + timedelta(
+                seconds=RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+            )
+            logger.warning("İş #%s hata verdi, tekrar denenecek: %s", job.id, exc)
+        else:
+            job.status = Job.STATUS_FAILED
+            job.finished_at = timezone.now()
+            logger.error("İş #%s başarısız oldu: %s", job.id, exc)
+    else:
+        job.status = Job.STATUS_SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.progress = 100
+        job.finished_at = timezone.now()
+
+    job.locked_by = ""
+    job.locked_at = None
+    fields = [
+        "status",
+        "attempts",
+        "run_at",
+        "result",
+        "error",
+        "progress",
+        "locked_by",
+        "locked_at",
+        "finished_at",
+    ]
+    saved = Job.objects.filter(pk=job.pk, **owner).update(
+        **{name: getattr(job, name) for name in fields}
+    )
+    if not saved:
+        logger.warning("İş #%s başka bir worker'a geçmiş; sonuç yazılmadı.", job.id)
+    return job
+
+
+def work(worker_id=None, tasks=None, max_jobs=None):
+    """Kuyruk boşalana (veya max_jobs'a ulaşılana) kadar çalışır; çalışan iş sayısını döner."""
+    worker_id = worker_id or default_worker_id()
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        close_old_connections()
+        job = claim_next_job(worker_id, tasks=tasks)
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
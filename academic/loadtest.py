@@ -0,0 +1,373 @@
+"""
+Sonuç açıklama anı yük testi (bkz. `manage.py loadtest_results`).
+
+Sentetik öğrenciler gerçek bir sunucuya (runserver, gunicorn, uvicorn) HTTP ile bağlanır:
+CustomLoginView üzerinden giriş yapar, ardından sonuçlar açıklandığında en çok açılan
+sayfaları dolaşır. Her istek için süre, durum kodu ve hata türü kaydedilir; sonunda uç
+nokta başına yüzdelikler, iş hacmi ve hata oranları raporlanır.
+
+Öğretmen senaryosu (SCENARIO_TEACHER) async panelleri ölçer: sentetik bölüm başkanları
+öğretmen ana panelini ve aktif dönemin ders panellerini dolaşır. Aynı senaryo WSGI ve ASGI
+(uvicorn) sunucularına karşı aynı parametrelerle çalıştırılarak karşılaştırılır; raporda
+sunucunun Server başlığı yazılır.
+
+Sadece standart kütüphane kullanılır (urllib + thread havuzu); her öğrencinin kendi çerez
+kavanozu (oturum) vardır.
+"""
+
+import http.cookiejar
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+
+from .caching import TAG_ATTAINMENT, invalidate_tag
+from .facts import sync_scores
+from .models import Assessment, Course, Enrollment, Student, StudentScore
+
+USERNAME_PREFIX = "loadtest-"
+TEACHER_USERNAME_PREFIX = f"{USERNAME_PREFIX}teacher-"
+STUDENT_ID_PREFIX = "LT"
+# Sentetik öğretmenler bütün dersleri görsün diye (kendi dersleri yok) bölüm başkanıdır
+TEACHER_GROUP = "Bölüm Başkanı"
+
+SCENARIO_STUDENT = "student"
+SCENARIO_TEACHER = "teacher"
+
+# Uç nokta adları (rapor satırları)
+LOGIN = "login"
+COURSE_LIST = "student_course_list"
+COURSE_DASHBOARD = "student_course_dashboard"
+GENERAL_SUCCESS = "student_general_success"
+GRADES = "student_grades"
+TEACHER_HOME = "teacher_dashboard_home"
+TEACHER_COURSE = "course_dashboard"
+ENDPOINTS = [
+    LOGIN,
+    COURSE_LIST,
+    COURSE_DASHBOARD,
+    GENERAL_SUCCESS,
+    GRADES,
+    TEACHER_HOME,
+    TEACHER_COURSE,
+]
+
+# Hata türleri
+ERROR_HTTP = "http"
+ERROR_DB_LOCK = "db_lock"
+ERROR_NETWORK = "network"
+ERROR_LOGIN = "login"
+
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+COURSE_LINK_RE = re.compile(r"/student/course/(\d+)/")
+TEACHER_COURSE_LINK_RE = re.compile(r"/course/(\d+)/dashboard/")
+# DEBUG=True iken 500 sayfasında SQLite kilit hatası görünür
+DB_LOCK_MARKERS = ("database is locked", "database table is locked")
+
+SCORE_SEED = 7919
+
+
+# --- SENTETİK VERİ ---
+
+
+def create_students(count, password, courses_per_student=5):
+    """
+    count adet giriş yapabilen öğrenci oluşturur; açık dönem derslerine kaydedip tüm
+    sınavlarına not girer. Sinyal/iş kuyruğu tetiklenmesin diye bulk_create kullanılır.
+    """
+    courses = list(
+        Course.objects.filter(semester__is_closed=False)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if not courses:
+        raise ValueError("Açık dönemde ders yok; önce ders oluşturun.")
+    assessments = {}
+    for assessment_id, course_id in Assessment.objects.filter(
+        course_id__in=courses
+    ).values_list("id", "course_id"):
+        assessments.setdefault(course_id, []).append(assessment_id)
+
+    start = (
+        User.objects.filter(username__startswith=USERNAME_PREFIX)
+        .exclude(username__startswith=TEACHER_USERNAME_PREFIX)
+        .count()
+    )
+    password_hash = make_password(password)  # herkes için bir kez
+    with transaction.atomic():
+        # SQLite 3.35+ bulk_create sonrası id'leri doldurur
+        users = User.objects.bulk_create(
+            User(
+                username=f"{USERNAME_PREFIX}{start + i:05d}",
+                password=password_hash,
+                first_name="Yük",
+                last_name=f"Testi {start + i}",
+            )
+            for i in range(count)
+        )
+        students = Student.objects.bulk_create(
+            Student(
+                user=user,
+                student_id=f"{STUDENT_ID_PREFIX}{start + i:06d}",
+                first_name=user.first_name,
+                last_name=user.last_name,
+            )
+            for i, user in enumerate(users)
+        )
+
+        enrollments, scores = [], []
+        for i, student in enumerate(students):
+            for k in range(min(courses_per_student, len(courses))):
+                course_id = courses[(i * courses_per_student + k) % len(courses)]
+                enrollments.append(Enrollment(student=student, course_id=course_id))
+                for assessment_id in assessments.get(course_id, []):
+                    # Tekrarlanabilir, 20-100 arası dağılmış notlar
+                    score = 20 + (student.id * SCORE_SEED + assessment_id) % 81
+                    scores.append(
+                        StudentScore(
+                            student=student, assessment_id=assessment_id, score=score
+                        )
+                    )
+        Enrollment.objects.bulk_create(enrollments, batch_size=2000)
+        StudentScore.objects.bulk_create(scores, batch_size=2000)
+        sync_scores(StudentScore.objects.filter(student__in=students))
+    invalidate_tag(TAG_ATTAINMENT)
+    return len(students), len(enrollments), len(scores)
+
+
+def delete_students():
+    """Sentetik öğrencileri (kayıt ve notlarıyla) ve öğretmenleri siler."""
+    with transaction.atomic():
+        Student.objects.filter(user__username__startswith=USERNAME_PREFIX).delete()
+        deleted, _by_model = User.objects.filter(
+            username__startswith=USERNAME_PREFIX
+        ).delete()
+    invalidate_tag(TAG_ATTAINMENT)
+    return deleted
+
+
+def student_usernames(limit):
+    return list(
+        User.objects.filter(username__startswith=USERNAME_PREFIX, student__isnull=False)
+        .order_by("username")
+        .values_list("username", flat=True)[:limit]
+    )
+
+
+def create_teachers(count, password):
+    """count adet giriş yapabilen sentetik bölüm başkanı oluşturur (veri değiştirmez)."""
+    group, _created = Group.objects.get_or_create(name=TEACHER_GROUP)
+    start = User.objects.filter(username__startswith=TEACHER_USERNAME_PREFIX).count()
+    password_hash = make_password(password)
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            User(
+                username=f"{TEACHER_USERNAME_PREFIX}{start + i:04d}",
+                password=password_hash,
+                first_name="Yük",
+                last_name=f"Testi Öğretmen {start + i}",
+            )
+            for i in range(count)
+        )
+        group.user_set.add(*users)
+    return len(users)
+
+
+def teacher_usernames(limit):
+    return list(
+        User.objects.filter(username__startswith=TEACHER_USERNAME_PREFIX)
+        .order_by("username")
+        .values_list("username", flat=True)[:limit]
+    )
+
+
+# --- SANAL ÖĞRENCİ ---
+
+
+class VirtualStudent:
+    """Tek bir tarayıcı oturumu; her istek sonucu results listesine yazılır."""
+
+    ROLE = "student"
+
+    def __init__(self, base_url, username, password, timeout, results):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.results = results
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies)
+        )
+
+    def _request(self, endpoint, path, data=None, record=True):
+        """(durum kodu, son URL, gövde, süre, hata türü); ağ hatasında durum 0."""
+        url = self.base_url + path
+        headers = {"Referer": url}
+        if data is not None:
+            data = urllib.parse.urlencode(data).encode()
+        request = urllib.request.Request(url, data=data, headers=headers)
+        start = time.perf_counter()
+        error = None
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, final_url = response.status, response.geturl()
+                body = response.read().decode("utf-8", "replace")
+        except urllib.error.HTTPError as exc:
+            status, final_url = exc.code, url
+            body = exc.read().decode("utf-8", "replace")
+            error = ERROR_HTTP
+            if any(marker in body for marker in DB_LOCK_MARKERS):
+                error = ERROR_DB_LOCK
+        except (urllib.error.URLError, OSError) as exc:
+            status, final_url, body = 0, url, str(exc)
+            error = ERROR_NETWORK
+        elapsed = time.perf_counter() - start
+        if record:
+            self.results.append((endpoint, elapsed, status, error))
+        return status, final_url, body, elapsed, error
+
+    def login(self):
+        path = f"/login/?role={self.ROLE}"
+        status, _url, body, _elapsed, _error = self._request(LOGIN, path, record=False)
+        token = CSRF_RE.search(body)
+        if status != 200 or not token:
+            self.results.append((LOGIN, 0.0, status, ERROR_LOGIN))
+            return False
+        data = {
+            "csrfmiddlewaretoken": token.group(1),
+            "username": self.username,
+            "password": self.password,
+        }
+        status, final_url, _body, elapsed, error = self._request(
+            LOGIN, path, data=data, record=False
+        )
+        if not error and "/login/" in final_url:
+            # Form hatayla geri döndü (yanlış şifre, rol uyuşmazlığı)
+            error = ERROR_LOGIN
+        self.results.append((LOGIN, elapsed, status, error))
+        return error is None
+
+    def run(self, rounds):
+        if not self.login():
+            return
+        for _round in range(rounds):
+            _status, _url, body, _elapsed, error = self._request(
+                COURSE_LIST, "/student/courses/"
+            )
+            course_ids = {} if error else dict.fromkeys(COURSE_LINK_RE.findall(body))
+            for course_id in course_ids:
+                self._request(COURSE_DASHBOARD, f"/student/course/{course_id}/")
+            self._request(GENERAL_SUCCESS, "/student/general-success/")
+            self._request(GRADES, "/student/grades/")
+
+
+class VirtualTeacher(VirtualStudent):
+    """Öğretmen ana paneli ve oradaki her ders paneli (async view'lar)."""
+
+    ROLE = "teacher"
+
+    def run(self, rounds):
+        if not self.login():
+            return
+        for _round in range(rounds):
+            _status, _url, body, _elapsed, error = self._request(
+                TEACHER_HOME, "/teacher-dashboard/"
+            )
+            course_ids = (
+                {} if error else dict.fromkeys(TEACHER_COURSE_LINK_RE.findall(body))
+            )
+            for course_id in course_ids:
+                self._request(TEACHER_COURSE, f"/course/{course_id}/dashboard/")
+
+
+SCENARIOS = {SCENARIO_STUDENT: VirtualStudent, SCENARIO_TEACHER: VirtualTeacher}
+
+
+def server_software(base_url, timeout=30):
+    """Sunucunun Server başlığı (ör. "uvicorn", "WSGIServer/0.2 CPython/3.11.7")."""
+    try:
+        with urllib.request.urlopen(
+            base_url.rstrip("/") + "/login/", timeout=timeout
+        ) as response:
+            return response.headers.get("Server", "?")
+    except urllib.error.HTTPError as exc:
+        return exc.headers.get("Server", "?")
+    except (urllib.error.URLError, OSError):
+        return "?"
+
+
+def run(
+    base_url,
+    usernames,
+    password,
+    concurrency,
+    rounds,
+    timeout=30,
+    scenario=SCENARIO_STUDENT,
+):
+    """Tüm sanal kullanıcıları çalıştırır; (sonuçlar, toplam süre) döner."""
+    results = []  # list.append thread'ler arasında güvenli
+    students = [
+        SCENARIOS[scenario](base_url, username, password, timeout, results)
+        for username in usernames
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda student: student.run(rounds), students))
+    return results, time.perf_counter() - start
+
+
+# --- RAPOR ---
+
+
+def percentile(sorted_values, p):
+    """En yakın sıra yöntemiyle yüzdelik (sıralı liste bekler)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(results, elapsed):
+    rows = []
+    for endpoint in ENDPOINTS + [None]:
+        selected = [r for r in results if endpoint is None or r[0] == endpoint]
+        if not selected:
+            continue
+        latencies = sorted(r[1] for r in selected if r[3] != ERROR_LOGIN)
+        errors = [r for r in selected if r[3]]
+        rows.append(
+            {
+                "endpoint": endpoint or "TOPLAM",
+                "requests": len(selected),
+                "errors": len(errors),
+                "error_rate": round(100 * len(errors) / len(selected), 2),
+                "db_lock_errors": sum(1 for r in errors if r[3] == ERROR_DB_LOCK),
+                "p50": percentile(latencies, 50) * 1000,
+                "p90": percentile(latencies, 90) * 1000,
+                "p95": percentile(latencies, 95) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "max": (latencies[-1] if latencies else 0) * 1000,
+            }
+        )
+    return {
+        "elapsed": elapsed,
+        "throughput": len(results) / elapsed if elapsed else 0,
+        "rows": rows,
+        "status_codes": _count(r[2] for r in results),
+        "error_kinds": _count(r[3] for r in results if r[3]),
+    }
+
+
+def _count(values):
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: str(item[0])))
@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academic import cold_storage
+from academic.jobs import enqueue
+from academic.models import Semester
+
+
+class Command(BaseCommand):
+    help = (
+        "Kapatılmış dönemlerin sınav, not ve kayıtlarını arşiv veritabanına taşır "
+        "(bkz. academic/cold_storage.py). Arşivlenmiş dönemin sayfaları arşivden okunur."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--semester",
+            type=int,
+            action="append",
+            help="Sadece bu dönemi (id) arşivle; birden çok kez verilebilir. Verilmezse "
+            "kapatılmış ve arşivlenmemiş tüm dönemler.",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=0,
+            help="En yeni N kapatılmış dönemi sıcak veritabanında bırak.",
+        )
+        parser.add_argument(
+            "--restore",
+            type=int,
+            metavar="SEMESTER",
+            help="Dönemi (id) arşivden sıcak veritabanına geri taşı.",
+        )
+        parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="Bittikten sonra sıcak veritabanı dosyasını küçült (SQLite VACUUM).",
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Taşımayı burada yapmak yerine iş kuyruğuna koy (job_worker çalıştırır).",
+        )
+
+    def handle(self, *args, **options):
+        if not cold_storage.enabled():
+            raise CommandError("settings.DATABASES içinde 'archive' tanımlı değil.")
+
+        if options["restore"]:
+            semester = Semester.objects.filter(pk=options["restore"]).first()
+            if semester is None:
+                raise CommandError("Dönem bulunamadı.")
+            self._run(semester, {"semester_id": semester.id, "restore": True}, options)
+            return
+
+        semesters = Semester.objects.filter(
+            is_closed=True, archived_at__isnull=True
+        ).order_by("-id")
+        if options["semester"]:
+            semesters = semesters.filter(pk__in=options["semester"])
+        semesters = list(semesters)[options["keep"] :]
+        if not semesters:
+            self.stdout.write("Arşivlenecek dönem yok.")
+        for semester in reversed(semesters):
+            self._run(semester, {"semester_id": semester.id}, options)
+
+        if options["vacuum"] and not options["enqueue"]:
+            cold_storage.vacuum()
+
+    def _run(self, semester, payload, options):
+        if options["enqueue"]:
+            job = enqueue(cold_storage.ARCHIVE_SEMESTER_TASK, payload)
+            self.stdout.write(f"{semester.name}: iş #{job.id} sıraya alındı.")
+            return
+        move = (
+            cold_storage.restore_semester
+            if payload.get("restore")
+            else cold_storage.archive_semester
+        )
+        counts = move(
+            semester,
+            progress=lambda percent, message="": self.stdout.write(
+                f"{semester.name}: %{percent} {message}"
+            ),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{semester.name}: "
+                + ", ".join(f"{name} {count}" for name, count in counts.items())
+            )
+        )
@@ -0,0 +1,70 @@
+import time
+
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    get_hashers,
+)
+from django.core.management.base import BaseCommand
+
+PASSWORD = "benchmark-Pass-123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Şifre özetleyicilerinin bu sunucudaki doğrulama süresini ölçer ve hedef süre "
+        "için PASSWORD_PBKDF2_ITERATIONS önerir (Django varsayılanının altına inilmez). "
+        "Giriş gecikmesinin çoğu bu süredir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250.0,
+            help="Giriş başına kabul edilen doğrulama süresi (varsayılan: 250 ms).",
+        )
+
+    def handle(self, *args, **options):
+        # Ayarlardaki özetleyiciler ve karşılaştırma için Django varsayılanları
+        hashers = list(get_hashers())
+        for candidate in (PBKDF2PasswordHasher(), ScryptPasswordHasher()):
+            if candidate.__class__ not in {h.__class__ for h in hashers}:
+                hashers.append(candidate)
+
+        preferred = hashers[0]
+        for hasher in hashers:
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError as exc:
+                # Kütüphanesi kurulu olmayanlar (argon2, bcrypt)
+                self.stdout.write(f"{hasher.__class__.__name__:<34} atlandı: {exc}")
+                continue
+            elapsed = []
+            for _round in range(options["rounds"]):
+                start = time.perf_counter()
+                hasher.verify(PASSWORD, encoded)
+                elapsed.append(time.perf_counter() - start)
+            ms = sorted(elapsed)[len(elapsed) // 2] * 1000
+            detail = ""
+            if isinstance(hasher, PBKDF2PasswordHasher):
+                detail = f"{hasher.iterations} yineleme"
+            marker = " (tercih edilen)" if hasher is preferred else ""
+            self.stdout.write(
+                f"{hasher.__class__.__name__:<34}{ms:>8.0f} ms  {detail}{marker}"
+            )
+            if hasher is preferred and isinstance(hasher, PBKDF2PasswordHasher):
+                suggested = int(hasher.iterations * options["target_ms"] / ms)
+                if suggested <= PBKDF2PasswordHasher.iterations:
+                    # Varsayılanın altına inilmez (bkz. academic/hashers.py)
+                    self.stdout.write(
+                        f"{options['target_ms']:.0f} ms hedefi Django varsayılanının "
+                        f"({PBKDF2PasswordHasher.iterations}) altında kalıyor; "
+                        "PASSWORD_PBKDF2_ITERATIONS ayarlanmamalı."
+                    )
+                else:
+                    self.stdout.write(
+                        f"{options['target_ms']:.0f} ms hedefi için "
+                        f"PASSWORD_PBKDF2_ITERATIONS ≈ {suggested // 1000 * 1000}"
+                    )
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from academic.analytics_export import CHUNK_SIZE, export, read_watermark
+
+
+class Command(BaseCommand):
+    help = (
+        "Notları, kayıtları, sınav ağırlıklarını, LO→PO eşleştirmelerini ve türetilmiş "
+        "LO/PO başarımlarını dönem ve bölüme göre bölümlenmiş Parquet dosyaları olarak "
+        "yazar. Varsayılan olarak son çalıştırmadan beri değişen satırları ekler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            default=str(settings.ANALYTICS_EXPORT_ROOT),
+            help="Hedef dizin (varsayılan: settings.ANALYTICS_EXPORT_ROOT).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Filigranı yok say; tüm veri kümesini silip baştan yaz.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Veritabanından tek seferde okunan satır sayısı.",
+        )
+
+    def handle(self, *args, **options):
+        since = None if options["full"] else read_watermark(options["target"])
+        self.stdout.write(
+            f"Artımlı aktarım: {since:%Y-%m-%d %H:%M:%S} sonrası"
+            if since
+            else "Tam aktarım"
+        )
+        counts = export(
+            options["target"],
+            full=options["full"],
+            chunk_size=options["chunk_size"],
+            progress=lambda percent, message="": self.stdout.write(f"%{percent} {message}"),
+        )
+        for name, rows in counts.items():
+            self.stdout.write(f"{name:<22}{rows:>10} satır")
+        self.stdout.write(self.style.SUCCESS(f"Yazıldı: {options['target']}"))
@@ -0,0 +1,69 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from academic.jobs import (
+    STALE_CHECK_INTERVAL,
+    default_worker_id,
+    requeue_stale_jobs,
+    work,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Arka plan iş kuyruğunu (Job) işler. Birden fazla süreç aynı anda "
+        "çalıştırılabilir; her iş yalnızca bir worker tarafından alınır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Kuyruktaki işleri bitirince çık (cron / test için).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Kuyruk boşken kaç saniye beklenecek (varsayılan: 2).",
+        )
+        parser.add_argument(
+            "--task",
+            action="append",
+            dest="tasks",
+            help="Sadece bu görevleri çalıştır (birden çok kez verilebilir).",
+        )
+
+    def handle(self, *args, **options):
+        worker_id = default_worker_id()
+        self.stopping = False
+        # SIGTERM/SIGINT geldiğinde elindeki işi bitirip çık
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(f"Worker başladı: {worker_id}")
+
+        last_check = None
+        while not self.stopping:
+            # Çöken başka bir worker'ın işi de (worker yeniden başlamadan) geri alınır
+            now = time.monotonic()
+            if last_check is None or now - last_check >= STALE_CHECK_INTERVAL:
+                last_check = now
+                requeued = requeue_stale_jobs()
+                if requeued:
+                    self.stdout.write(f"{requeued} yarım kalmış iş sıraya geri alındı.")
+            done = 0
+            while not self.stopping and work(worker_id, tasks=options["tasks"], max_jobs=1):
+                done += 1
+            if done:
+                self.stdout.write(f"{done} iş çalıştırıldı.")
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write("Worker durdu.")
+
+    def _stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,161 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academic import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Sonuçların açıklandığı anı yeniden üretir: N sentetik öğrenci çalışan bir "
+        "sunucuya giriş yapar ve ders listesi, ders paneli, genel başarı ve notlar "
+        "sayfalarını eşzamanlı dolaşır. İş hacmi, gecikme yüzdelikleri, hata oranı ve "
+        "veritabanı kilit hataları raporlanır. --scenario teacher ile öğretmen ana "
+        "paneli ve ders panelleri (async view'lar) ölçülür; WSGI ve ASGI sunucularını "
+        "aynı parametrelerle karşılaştırmak için."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://127.0.0.1:8000",
+            help="Test edilen sunucu (varsayılan: http://127.0.0.1:8000).",
+        )
+        parser.add_argument(
+            "--scenario",
+            choices=sorted(loadtest.SCENARIOS),
+            default=loadtest.SCENARIO_STUDENT,
+            help="student: öğrenci sayfaları; teacher: öğretmen ana paneli ve ders "
+            "panelleri.",
+        )
+        parser.add_argument(
+            "--students", type=int, default=200, help="Sanal öğrenci sayısı."
+        )
+        parser.add_argument(
+            "--teachers",
+            type=int,
+            default=20,
+            help="--scenario teacher ile sanal öğretmen (bölüm başkanı) sayısı.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Aynı anda aktif kullanıcı (thread) sayısı.",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=2,
+            help="Her kullanıcının sayfaları kaç tur dolaşacağı.",
+        )
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--password", default="loadtest-Pass-123")
+        parser.add_argument(
+            "--setup",
+            action="store_true",
+            help="Önce eksik sentetik öğrencileri (kayıt ve notlarıyla) ya da "
+            "öğretmenleri oluştur.",
+        )
+        parser.add_argument(
+            "--courses-per-student",
+            type=int,
+            default=5,
+            help="--setup ile oluşturulan öğrencinin kayıtlı olacağı ders sayısı.",
+        )
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="Sadece sentetik öğrencileri ve öğretmenleri sil ve çık.",
+        )
+
+    def handle(self, *args, **options):
+        if options["cleanup"]:
+            deleted = loadtest.delete_students()
+            self.stdout.write(f"{deleted} sentetik kayıt silindi.")
+            return
+
+        if options["scenario"] == loadtest.SCENARIO_TEACHER:
+            usernames = self._teachers(options)
+        else:
+            usernames = self._students(options)
+
+        # WSGI/ASGI karşılaştırmasında sonuçların hangi sunucuya ait olduğu görünsün
+        server = loadtest.server_software(options["base_url"], options["timeout"])
+        self.stdout.write(
+            f"{len(usernames)} kullanıcı ({options['scenario']}), "
+            f"{options['concurrency']} eşzamanlı, {options['rounds']} tur -> "
+            f"{options['base_url']} (sunucu: {server})"
+        )
+        results, elapsed = loadtest.run(
+            options["base_url"],
+            usernames,
+            options["password"],
+            options["concurrency"],
+            options["rounds"],
+            options["timeout"],
+            options["scenario"],
+        )
+        self._report(loadtest.summarize(results, elapsed))
+
+    def _teachers(self, options):
+        wanted = options["teachers"]
+        usernames = loadtest.teacher_usernames(wanted)
+        if options["setup"] and len(usernames) < wanted:
+            created = loadtest.create_teachers(
+                wanted - len(usernames), options["password"]
+            )
+            self.stdout.write(f"{created} öğretmen oluşturuldu.")
+            usernames = loadtest.teacher_usernames(wanted)
+        if not usernames:
+            raise CommandError("Sentetik öğretmen yok; --setup ile oluşturun.")
+        return usernames
+
+    def _students(self, options):
+        wanted = options["students"]
+        usernames = loadtest.student_usernames(wanted)
+        if options["setup"] and len(usernames) < wanted:
+            try:
+                created = loadtest.create_students(
+                    wanted - len(usernames),
+                    options["password"],
+                    options["courses_per_student"],
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(
+                "{} öğrenci, {} kayıt, {} not oluşturuldu.".format(*created)
+            )
+            usernames = loadtest.student_usernames(wanted)
+        if not usernames:
+            raise CommandError("Sentetik öğrenci yok; --setup ile oluşturun.")
+        return usernames
+
+    def _report(self, summary):
+        header = (
+            f"{'Uç nokta':<26}{'İstek':>7}{'Hata':>7}{'Hata%':>7}{'Kilit':>7}"
+            f"{'p50':>8}{'p90':>8}{'p95':>8}{'p99':>8}{'max':>8}"
+        )
+        self.stdout.write("")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for row in summary["rows"]:
+            self.stdout.write(
+                f"{row['endpoint']:<26}{row['requests']:>7}{row['errors']:>7}"
+                f"{row['error_rate']:>7}{row['db_lock_errors']:>7}"
+                f"{row['p50']:>8.0f}{row['p90']:>8.0f}{row['p95']:>8.0f}"
+                f"{row['p99']:>8.0f}{row['max']:>8.0f}"
+            )
+        self.stdout.write("(süreler ms)")
+        self.stdout.write("")
+        self.stdout.write(
+            f"Süre: {summary['elapsed']:.1f} sn, iş hacmi: "
+            f"{summary['throughput']:.1f} istek/sn"
+        )
+        self.stdout.write(f"Durum kodları: {summary['status_codes']}")
+        if summary["error_kinds"]:
+            self.stdout.write(
+                self.style.WARNING(f"Hata türleri: {summary['error_kinds']}")
+            )
+            self.stdout.write(
+                "Not: kilit hataları 500 sayfasından tanınır; sunucu DEBUG=True ile "
+                "çalışmıyorsa 'http' olarak sayılır."
+            )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academic import trends
+from academic.jobs import enqueue
+from academic.models import Semester
+
+
+class Command(BaseCommand):
+    help = (
+        "Dönemler arası PO eğilim serilerini hesaplar. Not, kayıt ve müfredat "
+        "değişiklikleri ilgili dönemi zaten yeniler; bu komut ilk kurulumda ve PO kodu "
+        "değişikliklerinden sonra tüm dönemler için çalıştırılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--semester", type=int, help="Sadece bu dönemi (id) yeniden hesapla."
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Hesabı burada yapmak yerine iş kuyruğuna koy (job_worker çalıştırır).",
+        )
+
+    def handle(self, *args, **options):
+        payload = {}
+        if options["semester"]:
+            payload["semester_id"] = options["semester"]
+        if options["enqueue"]:
+            job = enqueue(trends.REFRESH_TREND_TASK, payload)
+            self.stdout.write(f"İş #{job.id} sıraya alındı.")
+            return
+
+        if options["semester"]:
+            semester = Semester.objects.filter(pk=options["semester"]).first()
+            if semester is None:
+                raise CommandError("Dönem bulunamadı.")
+            points = trends.refresh_semester(semester)
+            self.stdout.write(self.style.SUCCESS(f"{semester.name}: {points} nokta yazıldı."))
+            return
+        result = trends.refresh_all(
+            progress=lambda percent, message="": self.stdout.write(f"%{percent} {message}")
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['semesters']} dönem, {result['points']} nokta yazıldı."
+            )
+        )
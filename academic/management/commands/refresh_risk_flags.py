@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from academic.early_warning import REFRESH_RISK_TASK, refresh_all
+from academic.jobs import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Açık dönemlerdeki tüm derslerin erken uyarı (risk) listesini yeniden hesaplar. "
+        "Not girişleri listeyi ders bazında zaten yeniler; bu komut gece cron ile "
+        "çalıştırılarak müfredat ve arşiv değişikliklerini de yansıtır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Hesabı burada yapmak yerine iş kuyruğuna koy (job_worker çalıştırır).",
+        )
+
+    def handle(self, *args, **options):
+        if options["enqueue"]:
+            job = enqueue(REFRESH_RISK_TASK)
+            self.stdout.write(f"İş #{job.id} sıraya alındı.")
+            return
+        result = refresh_all(
+            progress=lambda percent, message="": self.stdout.write(f"%{percent} {message}")
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['courses']} ders tarandı, {result['flags']} risk uyarısı yazıldı."
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from academic import facts
+
+
+class Command(BaseCommand):
+    help = (
+        "Not olgu tablosunu (ScoreFact) kaynak notlarla eşitler. Sinyaller tek tek not "
+        "girişlerini zaten yansıtır; bu komut toplu yüklemelerden sonra veya gece cron "
+        "ile çalıştırılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Tabloyu silip baştan kur (öğrenci/ders/sınav tablolarına toplu "
+            "UPDATE yapıldıysa).",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            written = facts.rebuild()
+        else:
+            written = facts.sync_pending()
+        self.stdout.write(self.style.SUCCESS(f"{written} olgu satırı yazıldı."))
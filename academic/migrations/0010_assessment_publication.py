@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0009_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Bildirim Tarihi'),
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='published_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Yayın Tarihi'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0010_assessment_publication'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='semester',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='semester',
+            name='is_closed',
+            field=models.BooleanField(default=False, verbose_name='Kapatıldı'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedCourseAverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('average', models.FloatField()),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.course')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_archive', to='academic.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.student')),
+            ],
+            options={
+                'unique_together': {('semester', 'student', 'course')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedLOAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rate', models.FloatField()),
+                ('learning_outcome', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.learningoutcome')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lo_archive', to='academic.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.student')),
+            ],
+            options={
+                'unique_together': {('semester', 'student', 'learning_outcome')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedPOAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('po_code', models.CharField(max_length=10)),
+                ('earned', models.FloatField()),
+                ('possible', models.FloatField()),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='po_archive', to='academic.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['student', 'po_code'], name='academic_ar_student_aeb1b8_idx')],
+                'unique_together': {('semester', 'student', 'po_code')},
+            },
+        ),
+    ]
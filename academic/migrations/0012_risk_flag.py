@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0011_semester_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('projected_average', models.FloatField(verbose_name='Tahmini Ortalama')),
+                ('completed_weight', models.PositiveSmallIntegerField(default=0)),
+                ('po_trend', models.FloatField(blank=True, null=True, verbose_name='PO Eğilimi')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='risk_flags', to='academic.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.student')),
+            ],
+            options={
+                'verbose_name': 'Risk Uyarısı',
+                'verbose_name_plural': 'Risk Uyarıları',
+                'indexes': [models.Index(fields=['course', 'projected_average'], name='academic_ri_course__35339a_idx')],
+                'unique_together': {('student', 'course')},
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.4 on 2026-10-19 19:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+def populate_facts(apps, schema_editor):
+    # Mevcut notlar için olgu satırları (facts.sync_scores ile aynı kolonlar)
+    StudentScore = apps.get_model("academic", "StudentScore")
+    ScoreFact = apps.get_model("academic", "ScoreFact")
+    # `migrate --database archive` arşiv veritabanını kendi satırlarıyla doldurur
+    db = schema_editor.connection.alias
+    rows = StudentScore.objects.using(db).annotate(
+        department=F("student__department_id"),
+        course=F("assessment__course_id"),
+        teacher=F("assessment__course__teacher_id"),
+        semester=F("assessment__course__semester_id"),
+        weight=F("assessment__weight"),
+        value=Cast("score", FloatField()),
+    ).values_list(
+        "id", "student_id", "department", "course", "teacher", "semester",
+        "assessment_id", "weight", "value", "updated_at",
+    )
+    ScoreFact.objects.using(db).bulk_create(
+        (
+            ScoreFact(
+                student_score_id=row[0],
+                student_id=row[1],
+                department_id=row[2],
+                course_id=row[3],
+                teacher_id=row[4],
+                semester_id=row[5],
+                assessment_id=row[6],
+                assessment_weight=row[7],
+                score=row[8],
+                score_updated_at=row[9],
+            )
+            for row in rows.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0013_analytics_watermark'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreFact',
+            fields=[
+                ('student_score', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fact', serialize=False, to='academic.studentscore')),
+                ('assessment_weight', models.IntegerField()),
+                ('score', models.FloatField()),
+                ('score_updated_at', models.DateTimeField()),
+                ('assessment', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.assessment')),
+                ('course', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.course')),
+                ('department', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='academic.department')),
+                ('semester', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.semester')),
+                ('student', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.student')),
+                ('teacher', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Not Olgusu',
+                'verbose_name_plural': 'Not Olguları',
+                'indexes': [models.Index(fields=['semester', 'department', 'score'], name='academic_sc_semeste_4ea23a_idx'), models.Index(fields=['semester', 'course', 'score'], name='academic_sc_semeste_1a28d7_idx'), models.Index(fields=['department', 'semester', 'score'], name='academic_sc_departm_b1bcf8_idx'), models.Index(fields=['course', 'assessment', 'score'], name='academic_sc_course__8d421f_idx'), models.Index(fields=['teacher', 'semester', 'score'], name='academic_sc_teacher_6c98fc_idx'), models.Index(fields=['assessment', 'score'], name='academic_sc_assessm_33eab3_idx'), models.Index(fields=['student', 'semester'], name='academic_sc_student_b5cbd4_idx')],
+            },
+        ),
+        migrations.RunPython(populate_facts, migrations.RunPython.noop),
+    ]
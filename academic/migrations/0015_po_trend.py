@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-19 19:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0014_score_fact'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='POTrendPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('po_code', models.CharField(max_length=10)),
+                ('rate', models.FloatField()),
+                ('students', models.PositiveIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.department')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.semester')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic.student')),
+            ],
+            options={
+                'verbose_name': 'PO Eğilim Noktası',
+                'verbose_name_plural': 'PO Eğilim Noktaları',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('student__isnull', False)), fields=('student', 'semester', 'po_code'), name='unique_student_po_trend'), models.UniqueConstraint(condition=models.Q(('department__isnull', False)), fields=('department', 'semester', 'po_code'), name='unique_department_po_trend')],
+            },
+        ),
+    ]
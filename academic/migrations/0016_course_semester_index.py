@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-19 19:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0015_po_trend'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['semester', 'teacher'], name='academic_co_semeste_f0556b_idx'),
+        ),
+    ]
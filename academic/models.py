@@ -15,6 +15,12 @@ class Department(models.Model):
 class Semester(models.Model):
     name = models.CharField(max_length=50)  # örnEğin: Fall 2025
 
+    # Kapatılan dönemin başarım verileri arşiv tablolarına dondurulur (bkz. archive.py)
+    is_closed = models.BooleanField(default=False, verbose_name="Kapatıldı")
+    closed_at = models.DateTimeField(null=True, blank=True)
+    # Sınav/not/kayıt satırları arşiv veritabanına taşındı (bkz. cold_storage.py)
+    archived_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         return self.name
 
@@ -43,6 +49,13 @@ class Course(models.Model):
     name = models.CharField(max_length=100)
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # Aktif döneme daraltılmış listeler: öğretmenin o dönemdeki dersleri
+            # (tek kolonlu semester indeksi ForeignKey ile zaten var)
+            models.Index(fields=["semester", "teacher"]),
+        ]
+
     def __str__(self):
         return f"{self.code} - {self.teacher.username if self.teacher else 'Atanmamış'}"
 
@@ -74,6 +87,8 @@ class OutcomeMapping(models.Model):
     weight = models.DecimalField(
         max_digits=3, decimal_places=2, help_text="Örn: 0.50 (%50)"
     )
+    # Analitik dışa aktarımın artımlı çalışması için (bkz. analytics_export.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.learning_outcome} -> {self.program_outcome} (%{self.weight})"
@@ -91,6 +106,11 @@ class Assessment(models.Model):
     )
     # -------------------------------------------
 
+    # Sonuç yayını: published_at öğretmen "Sonuçları Yayınla" dediğinde,
+    # notified_at öğrencilere e-posta gönderildiğinde dolar
+    published_at = models.DateTimeField(null=True, blank=True, verbose_name="Yayın Tarihi")
+    notified_at = models.DateTimeField(null=True, blank=True, verbose_name="Bildirim Tarihi")
+
     def __str__(self):
         return f"{self.course.code} - {self.name} (%{self.weight})"
 
@@ -101,6 +121,8 @@ class AssessmentWeight(models.Model):
     percentage = models.DecimalField(
         max_digits=5, decimal_places=2, help_text="Örn: 60 için 60 yazınız."
     )
+    # Analitik dışa aktarımın artımlı çalışması için (bkz. analytics_export.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.assessment.name} -> {self.learning_outcome.code} (%{self.percentage})"
@@ -113,6 +135,8 @@ class StudentScore(models.Model):
     score = models.DecimalField(
         max_digits=5, decimal_places=2, help_text="Öğrencinin aldığı not (0-100)"
     )
+    # Analitik dışa aktarımın artımlı çalışması için (bkz. analytics_export.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ("student", "assessment")
@@ -126,6 +150,8 @@ class Enrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     enrollment_date = models.DateField(auto_now_add=True)
+    # Analitik dışa aktarımın artımlı çalışması için (bkz. analytics_export.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ("student", "course")
@@ -177,4 +203,241 @@ class Grade(models.Model):
         avg = self.average
         if avg is None:
             return "Devam Ediyor"
-        return "Geçti" if avg >= 50 else "Kaldı"
\ No newline at end of file
+        return "Geçti" if avg >= 50 else "Kaldı"
+
+# 6. DÖNEM ARŞİVİ
+# Kapatılmış dönemlerin öğrenci başına dondurulmuş sonuçları. Canlı hesaplar sadece açık
+# dönemleri dolaşır ve bu tablolardaki toplamları ekler.
+class ArchivedPOAttainment(models.Model):
+    semester = models.ForeignKey(
+        Semester, on_delete=models.CASCADE, related_name="po_archive"
+    )
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    # PO'lar panellerde koda göre gruplandığı için kod saklanır
+    po_code = models.CharField(max_length=10)
+    # Oran değil toplamlar: farklı dönemlerin katkıları doğrudan toplanabilir
+    earned = models.FloatField()
+    possible = models.FloatField()
+
+    class Meta:
+        unique_together = ("semester", "student", "po_code")
+        indexes = [models.Index(fields=["student", "po_code"])]
+
+    def __str__(self):
+        return f"{self.semester} - {self.student_id} - {self.po_code}"
+
+
+class ArchivedLOAttainment(models.Model):
+    semester = models.ForeignKey(
+        Semester, on_delete=models.CASCADE, related_name="lo_archive"
+    )
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    learning_outcome = models.ForeignKey(LearningOutcome, on_delete=models.CASCADE)
+    rate = models.FloatField()  # 0-100
+
+    class Meta:
+        unique_together = ("semester", "student", "learning_outcome")
+
+    def __str__(self):
+        return f"{self.semester} - {self.student_id} - LO {self.learning_outcome_id}"
+
+
+class ArchivedCourseAverage(models.Model):
+    semester = models.ForeignKey(
+        Semester, on_delete=models.CASCADE, related_name="course_archive"
+    )
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    average = models.FloatField()
+
+    class Meta:
+        unique_together = ("semester", "student", "course")
+
+    def __str__(self):
+        return f"{self.semester} - {self.student_id} - {self.course_id}: {self.average}"
+
+
+# 7. ARKA PLAN İŞLERİ (JOB KUYRUĞU)
+# PDF, içe/dışa aktarma gibi uzun işler istek içinde değil, `manage.py job_worker` ile çalışır.
+class Job(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Sırada"),
+        (STATUS_RUNNING, "Çalışıyor"),
+        (STATUS_SUCCEEDED, "Tamamlandı"),
+        (STATUS_FAILED, "Hata"),
+    ]
+
+    task = models.CharField(max_length=100, verbose_name="Görev")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    priority = models.SmallIntegerField(
+        default=0, help_text="Küçük değer önce çalışır."
+    )
+
+    # Tekrar deneme
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField(help_text="Bu zamandan önce çalıştırılmaz.")
+
+    # İlerleme ve sonuç
+    progress = models.PositiveSmallIntegerField(default=0)  # 0-100
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    # Hangi worker aldı (çökmüş worker'ın işini geri almak için)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at", "priority"]),
+        ]
+        verbose_name = "Arka Plan İşi"
+        verbose_name_plural = "Arka Plan İşleri"
+
+    def __str__(self):
+        return f"#{self.id} {self.task} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+
+# 8. ERKEN UYARI
+# Dersi geçme riski taşıyan öğrenciler arka plan işiyle hesaplanıp burada tutulur
+# (bkz. early_warning.py). Paneller listeyi tek sorguyla okur.
+class RiskFlag(models.Model):
+    PASS_THRESHOLD = 50  # tahmini ortalama bunun altındaysa risk
+    TREND_DROP = -15  # PO başarımı önceki dönemlere göre bu kadar düştüyse risk
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="risk_flags")
+    # Yapılmış sınavlara göre ağırlıklı ortalama; girmediği sınav 0 sayılır
+    projected_average = models.FloatField(verbose_name="Tahmini Ortalama")
+    # Tahminin dayandığı sınavların toplam etkisi (%)
+    completed_weight = models.PositiveSmallIntegerField(default=0)
+    # Bu dersteki PO başarımı ile arşivdeki önceki dönemler arasındaki fark (puan)
+    po_trend = models.FloatField(null=True, blank=True, verbose_name="PO Eğilimi")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("student", "course")
+        indexes = [models.Index(fields=["course", "projected_average"])]
+        verbose_name = "Risk Uyarısı"
+        verbose_name_plural = "Risk Uyarıları"
+
+    def __str__(self):
+        return f"{self.course.code} - {self.student_id}: {self.projected_average}"
+
+    @property
+    def is_failing(self):
+        return self.projected_average < self.PASS_THRESHOLD
+
+    @property
+    def is_declining(self):
+        return self.po_trend is not None and self.po_trend <= self.TREND_DROP
+
+
+# 9. NOT OLGU TABLOSU (STAR ŞEMA)
+# Her not için bir satır; boyut anahtarları (öğrenci, bölüm, ders, öğretmen, dönem, sınav)
+# ve sınav etkisi kopyalanarak tutulur. Bölüm/dönem/öğretmen bazlı ortalamalar
+# StudentScore → Assessment → Course → Semester / Student → Department birleştirmeleri
+# yerine bu tablonun tek taramasıyla alınır (bkz. facts.py). Kaynak satırlarla eşitliği
+# sinyaller ve `manage.py sync_score_facts` korur.
+class ScoreFact(models.Model):
+    student_score = models.OneToOneField(
+        StudentScore, on_delete=models.CASCADE, primary_key=True, related_name="fact"
+    )
+    # Öncü kolonu bu FK olan bileşik indeksler aşağıda; tekil indeksler gereksiz
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    department = models.ForeignKey(
+        Department, on_delete=models.SET_NULL, null=True, related_name="+", db_index=False
+    )
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    teacher = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="+", db_index=False
+    )
+    semester = models.ForeignKey(
+        Semester, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    assessment = models.ForeignKey(
+        Assessment, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    assessment_weight = models.IntegerField()  # Assessment.weight (%)
+    score = models.FloatField()
+    # Kaynak notun updated_at'i; geride kalan (toplu yazılmış) notlar bununla bulunur
+    score_updated_at = models.DateTimeField()
+
+    class Meta:
+        # Sondaki "score" kolonu ile ortalamalar tabloya dokunmadan indeksten okunur
+        indexes = [
+            models.Index(fields=["semester", "department", "score"]),
+            models.Index(fields=["semester", "course", "score"]),
+            models.Index(fields=["department", "semester", "score"]),
+            models.Index(fields=["course", "assessment", "score"]),
+            models.Index(fields=["teacher", "semester", "score"]),
+            models.Index(fields=["assessment", "score"]),
+            models.Index(fields=["student", "semester"]),
+        ]
+        verbose_name = "Not Olgusu"
+        verbose_name_plural = "Not Olguları"
+
+    def __str__(self):
+        return f"{self.student_id} - {self.assessment_id}: {self.score}"
+
+
+# 10. PO EĞİLİMİ
+# Dönem başına PO başarımı; öğrenci satırlarında student, bölüm satırlarında department
+# doludur. Bir dönemin verisi değişince sadece o dönemin satırları yeniden yazılır
+# (bkz. trends.py); çizgi grafikleri tüm geçmişi tek sorguyla okur.
+class POTrendPoint(models.Model):
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name="+")
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    department = models.ForeignKey(
+        Department, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    po_code = models.CharField(max_length=10)
+    rate = models.FloatField()  # 0-100
+    # Bölüm satırlarında ortalamaya giren öğrenci sayısı; öğrenci satırlarında 1
+    students = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "semester", "po_code"],
+                condition=models.Q(student__isnull=False),
+                name="unique_student_po_trend",
+            ),
+            models.UniqueConstraint(
+                fields=["department", "semester", "po_code"],
+                condition=models.Q(department__isnull=False),
+                name="unique_department_po_trend",
+            ),
+        ]
+        verbose_name = "PO Eğilim Noktası"
+        verbose_name_plural = "PO Eğilim Noktaları"
+
+    def __str__(self):
+        owner = f"öğrenci {self.student_id}" if self.student_id else f"bölüm {self.department_id}"
+        return f"{owner} - {self.semester_id} - {self.po_code}: {self.rate}"
@@ -0,0 +1,216 @@
+"""
+Sınav sonucu e-posta bildirimleri.
+
+Öğretmen bir sınavın sonuçlarını yayınladığında bildirimler iş kuyruğuna yazılır (bkz. tasks.py).
+- Anında mod: her yayın için ayrı bir iş, o sınavın öğrencilerine tek e-posta.
+- Özet (digest) modu: gün içindeki yayınlar RESULT_DIGEST_HOUR'da toplanır; aynı gün beş
+  sınavı açıklanan öğrenci beş değil, tek e-posta alır.
+
+Alıcı listesi tek sorguyla kurulur; e-postalar tek bir bağlantı üzerinden partiler halinde
+(send_messages) gönderilir. Testlerde locmem, geliştirmede filebased backend kullanılabilir.
+
+Bir parti gönderilemezse önceki partiler tekrar gönderilmez: hiç e-posta gitmemişse sınavlar
+bırakılır ve iş normal şekilde tekrar denenir; bir kısmı gittiyse sadece kalan öğrenciler
+için yeni bir iş (payload'da student_ids) sıraya girer.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .jobs import RETRY_BASE_DELAY, PermanentJobError, enqueue
+from .models import Assessment, Enrollment, Job, StudentScore
+
+NOTIFY_TASK = "notify_assessment_results"
+DIGEST_TASK = "send_result_digest"
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_DIGEST_HOUR = 18
+
+
+def digest_enabled():
+    return getattr(settings, "RESULT_NOTIFICATION_DIGEST", False)
+
+
+def next_digest_time(now=None):
+    """Bir sonraki özet gönderim zamanı (yerel saatle RESULT_DIGEST_HOUR:00)."""
+    now = timezone.localtime(now)
+    hour = getattr(settings, "RESULT_DIGEST_HOUR", DEFAULT_DIGEST_HOUR)
+    run_at = timezone.make_aware(datetime.combine(now.date(), time(hour)))
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return run_at
+
+
+def publish_assessment(assessment, user=None):
+    """
+    Sınavı yayınlanmış olarak işaretler ve bildirim işini sıraya koyar.
+    Zaten yayınlanmış sınav için False döner (tekrar e-posta gitmez).
+    """
+    # Aynı anda iki kez basılan butona karşı koşullu güncelleme
+    published = Assessment.objects.filter(
+        pk=assessment.pk, published_at__isnull=True
+    ).update(published_at=timezone.now())
+    if not published:
+        return False
+
+    if not digest_enabled():
+        enqueue(NOTIFY_TASK, {"assessment_ids": [assessment.pk]}, user=user)
+    elif not Job.objects.filter(task=DIGEST_TASK, status=Job.STATUS_PENDING).exists():
+        # Günün özeti zaten sıradaysa yeni iş açılmaz; o iş bu yayını da kapsar
+        enqueue(DIGEST_TASK, user=user, run_at=next_digest_time())
+    return True
+
+
+def claim_assessments(assessment_ids):
+    """
+    Bildirimi gönderilecek sınavları üstlenir (notified_at IS NULL koşuluyla).
+    Aynı sınav iki işte birden bulunsa bile e-posta yalnızca bir kez gider.
+    """
+    now = timezone.now()
+    return [
+        assessment_id
+        for assessment_id in assessment_ids
+        if Assessment.objects.filter(
+            pk=assessment_id, published_at__isnull=False, notified_at__isnull=True
+        ).update(notified_at=now)
+    ]
+
+
+def release_assessments(assessment_ids):
+    # Gönderim yarıda kaldıysa işin tekrar denemesi aynı sınavları yeniden alabilsin
+    Assessment.objects.filter(pk__in=assessment_ids).update(notified_at=None)
+
+
+def pending_digest_assessment_ids():
+    return list(
+        Assessment.objects.filter(
+            published_at__isnull=False, notified_at__isnull=True
+        ).values_list("id", flat=True)
+    )
+
+
+class DeliveryError(Exception):
+    """Partilerden biri gönderilemedi; done: o ana kadar gönderilen e-posta sayısı."""
+
+    def __init__(self, done):
+        super().__init__(f"{done} e-posta gönderildikten sonra gönderim kesildi")
+        self.done = done
+
+
+def build_messages(assessment_ids, student_ids=None):
+    """
+    {öğrenci id: EmailMessage}; sınavlar öğrencinin kayıtlı olduğu derslere göre gruplanır.
+    student_ids verilirse sadece o öğrenciler.
+    """
+    assessments = list(
+        Assessment.objects.filter(pk__in=assessment_ids)
+        .select_related("course")
+        .order_by("course__code", "name")
+    )
+    by_course = {}
+    for assessment in assessments:
+        by_course.setdefault(assessment.course_id, []).append(assessment)
+
+    # Alıcı listesi tek sorgu: e-postası olan, bu derslere kayıtlı öğrenciler
+    recipients = Enrollment.objects.filter(
+        course_id__in=by_course, student__user__email__gt=""
+    )
+    if student_ids is not None:
+        recipients = recipients.filter(student_id__in=student_ids)
+    recipients = recipients.order_by("student_id").values_list(
+        "student_id", "course_id", "student__first_name", "student__user__email"
+    )
+    scores = {
+        (student_id, assessment_id): score
+        for student_id, assessment_id, score in StudentScore.objects.filter(
+            assessment_id__in=assessment_ids
+        ).values_list("student_id", "assessment_id", "score")
+    }
+
+    students = {}
+    for student_id, course_id, first_name, email in recipients:
+        entry = students.setdefault(
+            student_id, {"first_name": first_name, "email": email, "results": []}
+        )
+        for assessment in by_course[course_id]:
+            entry["results"].append(
+                {"assessment": assessment, "score": scores.get((student_id, assessment.id))}
+            )
+
+    messages = {}
+    for student_id, entry in students.items():
+        results = entry["results"]
+        if len(results) == 1:
+            assessment = results[0]["assessment"]
+            subject = f"Sınav sonucu açıklandı: {assessment.course.code} - {assessment.name}"
+        else:
+            subject = f"{len(results)} sınavın sonucu açıklandı"
+        body = render_to_string(
+            "emails/result_published.txt",
+            {"first_name": entry["first_name"], "results": results},
+        )
+        messages[student_id] = EmailMessage(subject, body, to=[entry["email"]])
+    return messages
+
+
+def send_in_batches(messages, batch_size=None, progress=None):
+    """
+    Tüm partiler tek (yeniden kullanılan) bağlantı üzerinden gönderilir. Bir parti hata
+    verirse DeliveryError (önceki partilerin e-posta sayısıyla) yükseltilir.
+    """
+    batch_size = batch_size or getattr(
+        settings, "NOTIFICATION_BATCH_SIZE", DEFAULT_BATCH_SIZE
+    )
+    sent = done = 0
+    try:
+        with get_connection() as connection:
+            for start in range(0, len(messages), batch_size):
+                batch = messages[start : start + batch_size]
+                sent += connection.send_messages(batch) or 0
+                done = start + len(batch)
+                if progress:
+                    progress(100 * done // len(messages), f"{sent} e-posta gönderildi")
+    except Exception as exc:
+        raise DeliveryError(done) from exc
+    return sent
+
+
+def notify(assessment_ids, progress=None, student_ids=None):
+    """
+    Verilen sınavları üstlenip e-postaları gönderir; gönderilen e-posta sayısını döner.
+    student_ids: yarıda kalmış bir gönderimin kalan alıcıları; sınavlar o gönderimde
+    üstlenildiği için tekrar üstlenilmez.
+    """
+    if student_ids is None:
+        claimed = claim_assessments(assessment_ids)
+    else:
+        claimed = list(assessment_ids)
+    if not claimed:
+        return {"assessments": 0, "sent": 0}
+    messages = build_messages(claimed, student_ids)
+    try:
+        sent = send_in_batches(list(messages.values()), progress=progress)
+    except DeliveryError as exc:
+        if not exc.done:
+            # Hiçbir e-posta gitmedi; iş aynı sınavlarla tekrar denenir
+            if student_ids is None:
+                release_assessments(claimed)
+            raise
+        # Gönderilen partiler tekrar gönderilmez; kalan öğrenciler ayrı işte
+        remaining = list(messages)[exc.done :]
+        if not remaining:
+            # Hepsi gitti, hata bağlantı kapanırken
+            return {"assessments": len(claimed), "sent": exc.done}
+        job = enqueue(
+            NOTIFY_TASK,
+            {"assessment_ids": claimed, "student_ids": remaining},
+            delay=timedelta(seconds=RETRY_BASE_DELAY),
+        )
+        raise PermanentJobError(
+            f"{exc}; kalan {len(remaining)} öğrenci iş #{job.id} ile gönderilecek"
+        ) from exc
+    return {"assessments": len(claimed), "sent": sent}
@@ -0,0 +1,291 @@
+"""
+Öğrencinin kendi grubundaki yüzdelik sırası.
+
+İki tür dağılım tutulur:
+    - ders: derse kayıtlı öğrencilerin ağırlıklı ders ortalamaları (öğrenci panelindeki
+      "Genel Ortalama" ile aynı hesap),
+    - PO: aynı bölümdeki öğrencilerin PO başarımları (student_po_report ile aynı hesap;
+      açık dönemler canlı, kapatılmış dönemler arşivden).
+Dağılımlar sıralı listeler olarak ortak önbellekte durur; bir öğrencinin sırası bisect ile
+bulunur. İstek sırasında sınıf arkadaşlarının başarımı hesaplanmaz.
+
+Güncelleme artımlıdır: not, kayıt veya müfredat değişince ders için bir yenileme işi sıraya
+girer (bkz. signals.py). İş, dersin dağılımını tek sorguyla yeniden kurar; PO tarafında sadece
+o derse kayıtlı öğrencilerin başarımlarını hesaplayıp bölüm dağılımlarındaki eski değerlerini
+yenileriyle değiştirir. Önbellekte olmayan dağılım ilk okumada kurulur.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import F, Sum
+
+from .caching import bump_version, get_or_compute, get_or_compute_many, get_version
+from .jobs import enqueue
+from .models import ArchivedPOAttainment, Course, Enrollment, Job, Student, StudentScore
+from .simulation import Cohort
+
+REFRESH_PERCENTILE_TASK = "refresh_percentiles"
+
+# Not girişi sırasında gelen değişiklikler tek işte toplansın diye kısa bir bekleme
+REFRESH_DELAY = timedelta(seconds=30)
+
+PERCENTILE_CACHE_TIMEOUT = 60 * 60 * 24
+PATCH_LOCK_TIMEOUT = 30
+
+# Bundan küçük gruplarda sıra gösterilmez
+MIN_COHORT_SIZE = 5
+
+# Dağılımdaki değerler panellerde gösterilen yuvarlamayla tutulur (ders: 2, PO: 1 hane).
+# Öğrencinin değeri bu tolerans içinde dağılımda yoksa (henüz yenilenmemiş ya da grupta
+# değil) sıra gösterilmez.
+COURSE_TOLERANCE = 0.005
+PO_TOLERANCE = 0.05
+
+_VERSION = "percentile"
+
+
+def request_refresh(course_id):
+    """Dersin dağılımlarını yenileme işini sıraya koyar; zaten sıradaysa koymaz."""
+    if Job.objects.filter(
+        task=REFRESH_PERCENTILE_TASK,
+        status=Job.STATUS_PENDING,
+        payload__course_id=course_id,
+    ).exists():
+        return False
+    enqueue(REFRESH_PERCENTILE_TASK, {"course_id": course_id}, delay=REFRESH_DELAY)
+    return True
+
+
+def invalidate_all():
+    """Tüm dağılımlar ilk okumada baştan kurulur (bölüm değişikliği, PO ekleme/silme)."""
+    bump_version(_VERSION)
+
+
+def percentile_rank(sorted_values, value, tolerance=0):
+    """
+    value'nun dağılımdaki yüzdelik sırası (0-100): altındakiler + eşitlerin yarısı.
+    value dağılımda yoksa ya da grup küçükse None.
+    """
+    if value is None or len(sorted_values) < MIN_COHORT_SIZE:
+        return None
+    below = bisect_left(sorted_values, value - tolerance)
+    ties = bisect_right(sorted_values, value + tolerance) - below
+    if not ties:
+        return None
+    return round((below + ties / 2) * 100 / len(sorted_values))
+
+
+# --- DERS DAĞILIMI ---
+
+
+def _course_key(course_id, version=None):
+    version = version or get_version(_VERSION)
+    return f"academic:percentile:course:{course_id}:{version}"
+
+
+def build_course_distributions(course_ids):
+    """{ders id: sıralı ortalamalar} — kayıtlı ve etkisi olan notu bulunan öğrenciler."""
+    rows = (
+        StudentScore.objects.filter(
+            assessment__course_id__in=course_ids,
+            student__enrollment__course_id=F("assessment__course_id"),
+        )
+        .order_by("assessment_id")
+        .values_list(
+            "assessment__course_id", "student_id", "score", "assessment__weight"
+        )
+    )
+    totals = {course_id: defaultdict(lambda: [0, 0]) for course_id in course_ids}
+    for course_id, student_id, score, weight in rows:
+        # Panel ile aynı sırada ve aynı işlemlerle; sonuçlar bire bir eşleşsin
+        totals[course_id][student_id][0] += float(score) * weight
+        totals[course_id][student_id][1] += weight
+    return {
+        course_id: sorted(
+            round(weighted_sum / total_weight, 2)
+            for weighted_sum, total_weight in students.values()
+            if total_weight > 0
+        )
+        for course_id, students in totals.items()
+    }
+
+
+def build_course_distribution(course_id):
+    return build_course_distributions([course_id])[course_id]
+
+
+def course_distribution(course_id):
+    return get_or_compute(
+        _course_key(course_id),
+        lambda: build_course_distribution(course_id),
+        PERCENTILE_CACHE_TIMEOUT,
+    )
+
+
+def course_distributions(course_ids):
+    """{ders id: dağılım}; önbellekte olmayanlar tek sorguda kurulur."""
+    version = get_version(_VERSION)
+    return get_or_compute_many(
+        {course_id: _course_key(course_id, version) for course_id in course_ids},
+        build_course_distributions,
+        PERCENTILE_CACHE_TIMEOUT,
+    )
+
+
+def course_percentile(course_id, average):
+    return percentile_rank(course_distribution(course_id), average, COURSE_TOLERANCE)
+
+
+# --- PO DAĞILIMI (BÖLÜM) ---
+
+
+def _po_key(department_id):
+    return f"academic:percentile:po:{department_id}:{get_version(_VERSION)}"
+
+
+def _values_key(department_id):
+    return f"{_po_key(department_id)}:values"
+
+
+def po_rates(students):
+    """{öğrenci id: {PO kodu: başarım}} — sadece verisi (mümkün > 0) olan PO'lar."""
+    cohort = Cohort(students, courses=Course.objects.filter(semester__is_closed=False))
+    earned, possible = cohort.po_totals()
+    totals = defaultdict(lambda: [0.0, 0.0])
+    for s, p in zip(*np.nonzero(possible > 0)):
+        total = totals[int(cohort.student_ids[s]), cohort.po_codes[p]]
+        total[0] += float(earned[s, p])
+        total[1] += float(possible[s, p])
+
+    # Kapatılmış dönemler; dönem kapandıktan sonra silinen PO'lar sayılmaz
+    archived = (
+        ArchivedPOAttainment.objects.filter(
+            student__in=students, po_code__in=cohort.po_codes
+        )
+        .values("student_id", "po_code")
+        .annotate(earned=Sum("earned"), possible=Sum("possible"))
+    )
+    for row in archived:
+        total = totals[row["student_id"], row["po_code"]]
+        total[0] += row["earned"]
+        total[1] += row["possible"]
+
+    rates = defaultdict(dict)
+    for (student_id, code), (earned_sum, possible_sum) in totals.items():
+        if possible_sum > 0:
+            rates[student_id][code] = round((earned_sum / possible_sum) * 100, 1)
+    return dict(rates)
+
+
+def build_department_distribution(department_id):
+    """({PO kodu: sıralı başarımlar}, {öğrenci id: {PO kodu: başarım}})."""
+    values = po_rates(Student.objects.filter(department_id=department_id))
+    distribution = defaultdict(list)
+    for rates in values.values():
+        for code, rate in rates.items():
+            distribution[code].append(rate)
+    return {code: sorted(rates) for code, rates in distribution.items()}, values
+
+
+def department_distribution(department_id):
+    def compute():
+        distribution, values = build_department_distribution(department_id)
+        # Artımlı güncelleme eski değerleri buradan okur; sayfalar okumaz
+        cache.set(_values_key(department_id), values, PERCENTILE_CACHE_TIMEOUT)
+        return distribution
+
+    return get_or_compute(_po_key(department_id), compute, PERCENTILE_CACHE_TIMEOUT)
+
+
+def student_po_percentiles(student, po_labels, po_scores):
+    """{PO kodu: yüzdelik sıra} — bölümü olmayan öğrenci için boş."""
+    if not student.department_id:
+        return {}
+    distribution = department_distribution(student.department_id)
+    return {
+        code: percentile_rank(distribution.get(code, []), score, PO_TOLERANCE)
+        for code, score in zip(po_labels, po_scores)
+    }
+
+
+def _replace(sorted_values, old, new):
+    if old is not None:
+        i = bisect_left(sorted_values, old)
+        if i < len(sorted_values) and sorted_values[i] == old:
+            del sorted_values[i]
+    if new is not None:
+        insort(sorted_values, new)
+
+
+def patch_department(department_id, new_values):
+    """
+    Önbellekteki bölüm dağılımında verilen öğrencilerin değerlerini değiştirir.
+    Dağılım önbellekte yoksa bir şey yapmaz (ilk okumada zaten güncel kurulur). Aynı anda
+    başka bir iş aynı bölümü güncelliyorsa dağılım silinir ve baştan kurulmaya bırakılır.
+    Kilit sahibi bu işin değişikliğini görmeden yazacağı için silme yetmez: bırakılan işareti
+    sahibi yazdıktan sonra görür ve kendi yazdığını da siler.
+    """
+    key, values_key = _po_key(department_id), _values_key(department_id)
+    lock, stale = f"{key}:patch-lock", f"{key}:patch-stale"
+    if not cache.add(lock, 1, PATCH_LOCK_TIMEOUT):
+        # Önce işaret, sonra silme: sahip işareti görmeden yazdıysa yazdığı burada silinir
+        cache.set(stale, 1, PATCH_LOCK_TIMEOUT)
+        cache.delete_many([key, values_key])
+        return False
+    try:
+        cached = cache.get_many([key, values_key])
+        if key not in cached:
+            return False
+        if values_key not in cached:
+            cache.delete(key)
+            return False
+        distribution, values = cached[key], cached[values_key]
+        for student_id, rates in new_values.items():
+            old = values.get(student_id, {})
+            for code in set(old) | set(rates):
+                _replace(
+                    distribution.setdefault(code, []), old.get(code), rates.get(code)
+                )
+            if rates:
+                values[student_id] = rates
+            else:
+                values.pop(student_id, None)
+        cache.set_many(
+            {key: distribution, values_key: values}, PERCENTILE_CACHE_TIMEOUT
+        )
+        if cache.get(stale):
+            # Başka bir işin yaması bu yazmada yok; dağılım ilk okumada baştan kurulur
+            cache.delete_many([key, values_key, stale])
+            return False
+        return True
+    finally:
+        cache.delete(lock)
+
+
+# --- YENİLEME İŞİ ---
+
+
+def refresh_course(course_id):
+    """Ders dağılımını kurar ve derse kayıtlı öğrencilerin PO değerlerini günceller."""
+    cache.set(
+        _course_key(course_id),
+        build_course_distribution(course_id),
+        PERCENTILE_CACHE_TIMEOUT,
+    )
+    students = Student.objects.filter(
+        id__in=Enrollment.objects.filter(course_id=course_id).values("student_id"),
+        department__isnull=False,
+    )
+    departments = defaultdict(dict)
+    rates = po_rates(students)
+    for student_id, department_id in students.values_list("id", "department_id"):
+        departments[department_id][student_id] = rates.get(student_id, {})
+    patched = sum(
+        patch_department(department_id, new_values)
+        for department_id, new_values in departments.items()
+    )
+    return {"course_id": course_id, "students": len(rates), "departments": patched}
@@ -0,0 +1,241 @@
+"""
+Personel (is_staff) için isteğe bağlı istek profilleyici.
+
+Tetikleme: URL'ye ?_profile=1 eklenir veya "X-Profile: 1" başlığı gönderilir.
+View cProfile altında çalıştırılır, atılan her SQL süresi ve çağrıldığı kod satırıyla
+kaydedilir. Sonuç PROFILER_ROOT altına <id>.prof (pstats) ve <id>.json (özet) olarak yazılır.
+Tetiklenmeyen isteklerde sadece bir başlık/sorgu metni kontrolü yapılır.
+Süreçte aynı anda tek profil alınır (Python 3.12+ ikinci cProfile'ı reddeder); meşgulken
+gelen istek profilsiz çalışır ve kullanıcıya mesaj gösterilir.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import traceback
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.db import connections
+from django.urls import reverse
+from django.utils.deprecation import MiddlewareMixin
+
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_HEADER = "HTTP_X_PROFILE"
+
+# Özet sayfasında gösterilecek fonksiyon sayısı ve SQL kaynağı için yığın derinliği
+TOP_FUNCTIONS = 40
+ORIGIN_DEPTH = 3
+
+# cProfile süreç başına tek profilleyiciye izin verir (sys.monitoring)
+_PROFILE_LOCK = threading.Lock()
+
+
+def profiler_root():
+    return Path(getattr(settings, "PROFILER_ROOT", settings.BASE_DIR / "profiles"))
+
+
+def profile_paths(profile_id):
+    # profile_id URL'de <uuid:...> ile doğrulanır; dosya yolu dışına çıkamaz
+    root = profiler_root()
+    return root / f"{profile_id}.prof", root / f"{profile_id}.json"
+
+
+class SQLRecorder:
+    """connection.execute_wrapper ile her sorgunun süresini ve kaynağını toplar."""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries.append(
+                {
+                    "alias": self.alias,
+                    "sql": sql,
+                    "duration_ms": round(duration * 1000, 3),
+                    "origin": self._origin(),
+                }
+            )
+
+    @staticmethod
+    def _origin():
+        # Sadece proje içindeki (site-packages dışı) son birkaç satır
+        base_dir = str(settings.BASE_DIR)
+        frames = [
+            f"{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} {frame.name}"
+            for frame in traceback.extract_stack()
+            if frame.filename.startswith(base_dir)
+            and "site-packages" not in frame.filename
+            and not frame.filename.endswith("profiling.py")
+        ]
+        return frames[-ORIGIN_DEPTH:]
+
+
+def _function_rows(stats):
+    rows = []
+    for (filename, lineno, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{os.path.basename(filename)}:{lineno}({func})",
+                "calls": nc,
+                "primitive_calls": cc,
+                "tottime_ms": round(tt * 1000, 3),
+                "cumtime_ms": round(ct * 1000, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+def _duplicate_queries(queries):
+    # Aynı SQL metni birden çok kez çalıştıysa (N+1 şüphesi) grupla
+    groups = {}
+    for query in queries:
+        group = groups.setdefault(
+            query["sql"], {"sql": query["sql"], "count": 0, "total_ms": 0}
+        )
+        group["count"] += 1
+        group["total_ms"] += query["duration_ms"]
+    duplicates = [g for g in groups.values() if g["count"] > 1]
+    duplicates.sort(key=lambda g: g["count"], reverse=True)
+    for group in duplicates:
+        group["total_ms"] = round(group["total_ms"], 3)
+    return duplicates
+
+
+def run_profiled(request, view_func, view_args, view_kwargs):
+    """
+    View'ı profilleyerek çalıştırır, sonucu diske yazar; yanıta profil linkini ekler.
+    Başka bir profil sürüyorsa None döner; view normal (profilsiz) çalışır.
+    """
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        messages.warning(
+            request,
+            "Başka bir istek profilleniyor; bu istek profilsiz çalıştırıldı.",
+            fail_silently=True,
+        )
+        return None
+    try:
+        return _run_profiled(request, view_func, view_args, view_kwargs)
+    finally:
+        _PROFILE_LOCK.release()
+
+
+def _run_profiled(request, view_func, view_args, view_kwargs):
+    recorders = [SQLRecorder(alias) for alias in connections]
+    profiler = cProfile.Profile()
+
+    with ExitStack() as stack:
+        for recorder in recorders:
+            stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            if iscoroutinefunction(view_func):
+                # Async view'ların thread havuzundaki sorguları SQL kaydına girmez
+                view_func = async_to_sync(view_func)
+            response = view_func(request, *view_args, **view_kwargs)
+            # TemplateResponse ise render süresi de profile dahil olsun
+            if hasattr(response, "render") and callable(response.render):
+                response = response.render()
+        finally:
+            profiler.disable()
+            total = time.perf_counter() - start
+
+    queries = [query for recorder in recorders for query in recorder.queries]
+    sql_total = sum(query["duration_ms"] for query in queries)
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+
+    profile_id = str(uuid.uuid4())
+    prof_path, summary_path = profile_paths(profile_id)
+    prof_path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(prof_path)
+
+    summary = {
+        "id": profile_id,
+        "path": request.get_full_path(),
+        "method": request.method,
+        "user": request.user.get_username(),
+        "status_code": response.status_code,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "total_ms": round(total * 1000, 3),
+        "sql_ms": round(sql_total, 3),
+        "python_ms": round(max(total * 1000 - sql_total, 0), 3),
+        "query_count": len(queries),
+        "functions": _function_rows(stats),
+        "queries": sorted(queries, key=lambda q: q["duration_ms"], reverse=True),
+        "duplicates": _duplicate_queries(queries),
+    }
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False), encoding="utf-8")
+
+    response["X-Profile-Id"] = profile_id
+    response["X-Profile-URL"] = reverse("profile_detail", args=[profile_id])
+    return response
+
+
+def load_summary(profile_id):
+    _prof_path, summary_path = profile_paths(profile_id)
+    if not summary_path.exists():
+        return None
+    return json.loads(summary_path.read_text(encoding="utf-8"))
+
+
+def list_summaries(limit=50):
+    root = profiler_root()
+    if not root.exists():
+        return []
+    paths = sorted(root.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    summaries = []
+    for path in paths[:limit]:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data.pop("functions")
+        data.pop("queries")
+        data.pop("duplicates")
+        summaries.append(data)
+    return summaries
+
+
+def _triggered(request):
+    return request.META.get(PROFILE_HEADER) or (
+        PROFILE_QUERY_PARAM in request.META.get("QUERY_STRING", "")
+        and PROFILE_QUERY_PARAM in request.GET
+    )
+
+
+class ProfilerMiddleware(MiddlewareMixin):
+    """
+    MIDDLEWARE listesinin en sonunda durmalı; böylece view'dan hemen önce çalışır.
+    Tetiklenmeyen isteklerde request.user'a bile dokunmaz.
+    ASGI altında zinciri senkron moda düşürmemek için async de çalışır.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            self.process_view = self.aprocess_view
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not _triggered(request) or not request.user.is_staff:
+            return None
+        return run_profiled(request, view_func, view_args, view_kwargs)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not _triggered(request) or not (await request.auser()).is_staff:
+            return None
+        return await sync_to_async(run_profiled)(
+            request, view_func, view_args, view_kwargs
+        )
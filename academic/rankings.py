@@ -0,0 +1,105 @@
+"""
+Ders sıralaması (öğretmen listesi).
+
+Ağırlıklı ortalama ve sıra tamamen veritabanında hesaplanır: dersin notları öğrenciye göre
+gruplanır (SUM(not * etki) / SUM(etki); öğrenci panelindeki "Genel Ortalama" ile aynı hesap)
+ve RANK() OVER ile sıralanır. Python'a sadece istenen sayfa gelir; pencere fonksiyonu
+LIMIT/OFFSET'ten önce dersin tamamı üzerinde çalıştığı için sayfadaki sıralar geneldir.
+Eşit ortalamalar aynı sırayı alır (1, 1, 3, ...).
+"""
+
+import csv
+
+from django.db.models import Count, F, FloatField, Sum, Window
+from django.db.models.functions import Cast, NullIf, Rank, Round
+
+from .models import Enrollment, StudentScore
+from .simulation import PASS_THRESHOLD
+
+PAGE_SIZE = 50
+EXPORT_CHUNK_SIZE = 2000
+
+CSV_HEADER = [
+    "Sıra",
+    "Öğrenci No",
+    "Ad",
+    "Soyad",
+    "Not Sayısı",
+    "Ağırlıklı Ortalama",
+    "Geçme Sınırına Uzaklık",
+]
+
+
+def course_ranking(course):
+    """
+    Derse kayıtlı ve en az bir notu olan öğrenciler; sıra, öğrenci no sırasıyla.
+    Her satır: rank, student_id, student_number, first_name, last_name, scores, average
+    (etkisi olan notu yoksa None), gap (average - PASS_THRESHOLD).
+    """
+    average = Round(
+        Sum(Cast("score", FloatField()) * F("assessment__weight"))
+        / NullIf(Sum("assessment__weight"), 0),
+        2,
+    )
+    return (
+        StudentScore.objects.filter(
+            assessment__course=course, student__enrollment__course=course
+        )
+        .values("student_id")
+        .annotate(
+            scores=Count("id"),
+            average=average,
+            gap=Round(average - PASS_THRESHOLD, 2),
+            rank=Window(Rank(), order_by=F("average").desc(nulls_last=True)),
+        )
+        .values(
+            "rank",
+            "student_id",
+            "scores",
+            "average",
+            "gap",
+            student_number=F("student__student_id"),
+            first_name=F("student__first_name"),
+            last_name=F("student__last_name"),
+        )
+        .order_by("rank", "student__student_id")
+    )
+
+
+def ungraded_count(course):
+    """Derse kayıtlı ama henüz hiç notu olmayan (sıralamaya girmeyen) öğrenci sayısı."""
+    return (
+        Enrollment.objects.filter(course=course)
+        .exclude(
+            student_id__in=StudentScore.objects.filter(
+                assessment__course=course
+            ).values("student_id")
+        )
+        .count()
+    )
+
+
+class _Echo:
+    """csv.writer için: yazılanı geri döner (StreamingHttpResponse satır satır gönderir)."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(course):
+    """Sıralamanın tamamı CSV satırları olarak; veritabanından parça parça okunur."""
+    writer = csv.writer(_Echo())
+    # Excel'in Türkçe karakterleri doğru açması için UTF-8 BOM
+    yield "\ufeff" + writer.writerow(CSV_HEADER)
+    for row in course_ranking(course).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(
+            [
+                row["rank"],
+                row["student_number"],
+                row["first_name"],
+                row["last_name"],
+                row["scores"],
+                "" if row["average"] is None else row["average"],
+                "" if row["gap"] is None else row["gap"],
+            ]
+        )
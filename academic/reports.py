@@ -0,0 +1,178 @@
+"""
+Bölüm düzeyi raporları.
+
+PO × ders ısı haritası (heatmap): satırlar bölüm öğrencilerinin aldığı dersler, sütunlar
+PO'lar. Hücrede dersin o PO'ya kapsama ağırlığı (LO→PO ağırlıkları toplamı) ve bölüm
+öğrencilerinin o dersten aldığı ortalama PO başarımı bulunur.
+
+Veri hücre hücre sorgulanmaz. (öğrenci, LO) başarımları tek GROUP BY sorgusuyla seyrek
+(koordinat) listesi olarak gelir, ardından numpy bincount ile LO → ders × PO hücrelerine
+toplanır. Sonuç (bölüm, dönem) başına önbelleğe alınır (eşzamanlı isteklerde tek hesap);
+veri değişince TAG_ATTAINMENT versiyonu artar.
+"""
+
+import numpy as np
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast
+
+from .caching import (
+    REPORT_CACHE_TIMEOUT,
+    TAG_ATTAINMENT,
+    TAG_LEARNING_OUTCOMES,
+    TAG_PROGRAM_OUTCOMES,
+    get_or_compute,
+    tag_version,
+)
+from .models import Course, Enrollment, OutcomeMapping, ProgramOutcome, StudentScore
+
+
+def _heatmap_cache_key(department_id, semester_id):
+    versions = ":".join(
+        str(tag_version(tag))
+        for tag in (TAG_ATTAINMENT, TAG_LEARNING_OUTCOMES, TAG_PROGRAM_OUTCOMES)
+    )
+    return f"academic:report:heatmap:{department_id}:{semester_id}:{versions}"
+
+
+def _cell(mean, weight):
+    return {"mean": round(float(mean), 1), "weight": round(float(weight), 2)}
+
+
+def department_po_heatmap(department, semester):
+    return get_or_compute(
+        _heatmap_cache_key(department.pk, semester.pk),
+        lambda: build_department_po_heatmap(department, semester),
+        REPORT_CACHE_TIMEOUT,
+    )
+
+
+def build_department_po_heatmap(department, semester):
+    # Satırlar: bu dönem, bölüm öğrencilerinin kayıtlı olduğu dersler
+    enrolled_counts = dict(
+        Enrollment.objects.filter(
+            student__department=department, course__semester=semester
+        )
+        .values("course_id")
+        .annotate(n=Count("id"))
+        .values_list("course_id", "n")
+    )
+    courses = list(
+        Course.objects.filter(id__in=enrolled_counts)
+        .select_related("teacher")
+        .order_by("code")
+    )
+    # PO'lar panellerdeki gibi koda göre gruplanır
+    po_codes = list(
+        dict.fromkeys(
+            ProgramOutcome.objects.order_by("code").values_list("code", flat=True)
+        )
+    )
+    if not courses or not po_codes:
+        return {"po_codes": po_codes, "rows": [], "columns": [], "students": 0}
+
+    course_position = {course.id: i for i, course in enumerate(courses)}
+    po_position = {code: i for i, code in enumerate(po_codes)}
+    C, P = len(courses), len(po_codes)
+
+    # LO → PO eşleştirmeleri (seyrek: lo, ders, po, ağırlık)
+    mappings = list(
+        OutcomeMapping.objects.filter(learning_outcome__course_id__in=course_position)
+        .annotate(value=Cast("weight", FloatField()))
+        .values_list(
+            "learning_outcome_id",
+            "learning_outcome__course_id",
+            "program_outcome__code",
+            "value",
+        )
+    )
+    if not mappings:
+        lo_ids = np.zeros(0, dtype=np.int64)
+    else:
+        lo_ids = np.unique(np.array([m[0] for m in mappings], dtype=np.int64))
+
+    # (öğrenci, LO) başarım oranları tek sorguda; notu olmayan kayıtlı öğrenci 0 sayılır
+    lo_scores = (
+        StudentScore.objects.filter(
+            student__department=department,
+            assessment__course__semester=semester,
+            student__enrollment__course=F("assessment__course"),
+            assessment__assessmentweight__learning_outcome_id__in=lo_ids.tolist(),
+        )
+        .values(
+            "student_id", lo=F("assessment__assessmentweight__learning_outcome_id")
+        )
+        .annotate(
+            earned=Sum(
+                F("score") * F("assessment__assessmentweight__percentage"),
+                output_field=FloatField(),
+            ),
+            possible=Sum(
+                F("assessment__assessmentweight__percentage") * 100,
+                output_field=FloatField(),
+            ),
+        )
+        .values_list("lo", "earned", "possible")
+    )
+    rate_sum = np.zeros(len(lo_ids))
+    if lo_scores:
+        triples = np.array(list(lo_scores), dtype=np.float64).reshape(-1, 3)
+        rates = np.divide(
+            triples[:, 1] * 100,
+            triples[:, 2],
+            out=np.zeros(len(triples)),
+            where=triples[:, 2] > 0,
+        )
+        lo_index = np.searchsorted(lo_ids, triples[:, 0].astype(np.int64))
+        rate_sum = np.bincount(lo_index, weights=rates, minlength=len(lo_ids))
+
+    # LO ortalaması: derse kayıtlı bölüm öğrencisi sayısına bölünür
+    m_lo = np.searchsorted(lo_ids, np.array([m[0] for m in mappings], dtype=np.int64))
+    m_course = np.array([course_position[m[1]] for m in mappings], dtype=np.int64)
+    m_po = np.array([po_position[m[2]] for m in mappings], dtype=np.int64)
+    m_weight = np.array([m[3] for m in mappings], dtype=np.float64)
+    enrolled = np.array([enrolled_counts[m[1]] for m in mappings], dtype=np.float64)
+    lo_mean = rate_sum[m_lo] / enrolled
+
+    # Hücre = ders * P + po; ağırlıklı toplamlar tek geçişte
+    cells = m_course * P + m_po
+    weight = np.bincount(cells, weights=m_weight, minlength=C * P).reshape(C, P)
+    weighted_rate = np.bincount(
+        cells, weights=lo_mean * m_weight, minlength=C * P
+    ).reshape(C, P)
+    mean = np.divide(weighted_rate, weight, out=np.zeros_like(weight), where=weight > 0)
+
+    rows = []
+    for c, course in enumerate(courses):
+        rows.append(
+            {
+                "course_id": course.id,
+                "code": course.code,
+                "name": course.name,
+                "teacher": course.teacher.username if course.teacher else "",
+                "students": enrolled_counts[course.id],
+                "cells": [
+                    _cell(mean[c, p], weight[c, p]) if weight[c, p] > 0 else None
+                    for p in range(P)
+                ],
+            }
+        )
+
+    # PO sütun özetleri: kapsama ağırlığıyla ağırlıklı ortalama
+    column_weight = weight.sum(axis=0)
+    column_mean = np.divide(
+        weighted_rate.sum(axis=0),
+        column_weight,
+        out=np.zeros(P),
+        where=column_weight > 0,
+    )
+    return {
+        "po_codes": po_codes,
+        "rows": rows,
+        "columns": [_cell(column_mean[p], column_weight[p]) for p in range(P)],
+        "students": Enrollment.objects.filter(
+            student__department=department, course__semester=semester
+        )
+        .values("student_id")
+        .distinct()
+        .count(),
+    }
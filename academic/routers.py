@@ -0,0 +1,97 @@
+"""
+Veritabanı yönlendiricileri.
+
+CacheRouter: DatabaseCache tablosu (app_label "django_cache") "cache" veritabanında durur;
+o veritabanına uygulama tabloları taşınmaz.
+
+ArchiveRouter: arşivlenmiş dönemlerin sınav, not ve kayıtları "archive" veritabanındadır
+(bkz. cold_storage.py). use_archive() bloğu içindeki okumalar ARCHIVE_MODELS için arşive
+gider; arşivden okunmuş bir nesnenin ilişkileri de arşivden okunur. Blok dışındaki sorgular
+sıcak veritabanına (default) gider.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS
+
+CACHE_DATABASE = "cache"
+CACHE_APP_LABEL = "django_cache"
+
+ARCHIVE_DATABASE = "archive"
+
+# Arşive taşınan tablolar (sıcak veritabanından silinir)
+MOVED_MODELS = {"assessment", "assessmentweight", "studentscore", "enrollment", "scorefact"}
+# Arşivde birleştirmeler için kopyası tutulan tablolar (sıcak veritabanında da kalır)
+SNAPSHOT_MODELS = {
+    "department",
+    "semester",
+    "student",
+    "course",
+    "programoutcome",
+    "learningoutcome",
+    "outcomemapping",
+}
+ARCHIVE_MODELS = MOVED_MODELS | SNAPSHOT_MODELS
+
+_reading_archive = ContextVar("reading_archive", default=False)
+
+
+@contextmanager
+def use_archive():
+    token = _reading_archive.set(True)
+    try:
+        yield
+    finally:
+        _reading_archive.reset(token)
+
+
+def _is_archive_model(model):
+    return model._meta.app_label == "academic" and model._meta.model_name in ARCHIVE_MODELS
+
+
+class CacheRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return CACHE_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return CACHE_DATABASE
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == CACHE_APP_LABEL:
+            return db == CACHE_DATABASE
+        if db == CACHE_DATABASE:
+            return False
+        return None
+
+
+class ArchiveRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        instance_db = instance._state.db if instance is not None else None
+        if _is_archive_model(model) or model._meta.label == "auth.User":
+            if instance_db == ARCHIVE_DATABASE:
+                return ARCHIVE_DATABASE
+            # Sıcak nesnenin kopyalanan ilişkileri (user.student, course.semester) sıcaktan
+            if (
+                _reading_archive.get()
+                and _is_archive_model(model)
+                and not (
+                    instance_db == DEFAULT_DB_ALIAS
+                    and model._meta.model_name in SNAPSHOT_MODELS
+                )
+            ):
+                return ARCHIVE_DATABASE
+        elif instance_db == ARCHIVE_DATABASE:
+            # Arşivde kopyası olmayan tablolar (ArchivedPOAttainment, RiskFlag, ...)
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, ARCHIVE_DATABASE}:
+            return True
+        return None
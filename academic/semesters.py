@@ -0,0 +1,62 @@
+"""
+Aktif dönem.
+
+Ders listeleri, not sayfaları ve öğretmen panelleri varsayılan olarak tek bir döneme
+daraltılır; böylece sayfaların okuduğu satır sayısı geçmiş dönem sayısıyla büyümez. Seçim
+oturumda tutulur ve üst çubuktaki seçiciyle değiştirilir. Seçim yoksa (veya seçilen dönem
+silinmişse) en son açık dönem, o da yoksa en son dönem kullanılır.
+
+Dönem listesi ortak önbellektedir; dönem eklenince, kapatılınca veya silinince signals.py
+invalidate_semesters çağırır.
+"""
+
+from .caching import CURRICULUM_CACHE_TIMEOUT, bump_version, get_or_compute, get_version
+from .models import Semester
+
+SESSION_KEY = "active_semester_id"
+
+_VERSION = "semesters"
+
+
+def invalidate_semesters():
+    bump_version(_VERSION)
+
+
+def semester_choices():
+    """Tüm dönemler, en yeni başta."""
+    return get_or_compute(
+        f"academic:semesters:{get_version(_VERSION)}",
+        lambda: list(Semester.objects.order_by("-id")),
+        CURRICULUM_CACHE_TIMEOUT,
+    )
+
+
+def default_semester(semesters):
+    for semester in semesters:
+        if not semester.is_closed:
+            return semester
+    return semesters[0] if semesters else None
+
+
+def get_active_semester(request):
+    """Oturumdaki dönem (istek başına bir kez çözülür); hiç dönem yoksa None."""
+    if not hasattr(request, "_active_semester"):
+        semesters = semester_choices()
+        selected = request.session.get(SESSION_KEY)
+        request._active_semester = next(
+            (semester for semester in semesters if semester.id == selected),
+            None,
+        ) or default_semester(semesters)
+    return request._active_semester
+
+
+def set_active_semester(request, semester_id):
+    """Geçerli bir dönemse oturuma yazar; seçilen dönemi (yoksa None) döner."""
+    semester = next(
+        (semester for semester in semester_choices() if str(semester.id) == semester_id),
+        None,
+    )
+    if semester is not None:
+        request.session[SESSION_KEY] = semester.id
+        request._active_semester = semester
+    return semester
@@ -0,0 +1,111 @@
+"""
+REST API yanıt şemaları (bkz. api.py).
+
+Veriler student_dashboard.build_payload'un ürettiği sözlüklerdir; serializer'lar sadece
+şemayı belgeler ve istenmeyen alanları (sparse fieldsets) yanıttan çıkarır.
+"""
+
+from rest_framework import serializers
+
+
+class SparseFieldsMixin:
+    """fields=[...] verilirse sadece o alanlar serileştirilir."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            return
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Bilinmeyen alan: {', '.join(sorted(unknown))}"}
+            )
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+
+
+class StudentSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    student_number = serializers.CharField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    department = serializers.CharField(allow_null=True)
+
+
+class SemesterSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    is_closed = serializers.BooleanField()
+    is_archived = serializers.BooleanField()
+
+
+class CourseSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    code = serializers.CharField()
+    name = serializers.CharField()
+    teacher = serializers.CharField(allow_null=True)
+    average = serializers.FloatField()
+    # Sınıftaki yüzdelik sıra; grup küçükse ya da henüz notu yoksa None
+    percentile = serializers.IntegerField(allow_null=True)
+
+
+class ScoreSerializer(serializers.Serializer):
+    assessment_id = serializers.IntegerField()
+    name = serializers.CharField()
+    date = serializers.DateField()
+    weight = serializers.IntegerField()
+    score = serializers.FloatField()
+
+
+class CourseGradesSerializer(SparseFieldsMixin, serializers.Serializer):
+    course_id = serializers.IntegerField()
+    code = serializers.CharField()
+    scores = ScoreSerializer(many=True)
+
+
+class OutcomeDetailSerializer(serializers.Serializer):
+    code = serializers.CharField()
+    description = serializers.CharField()
+    score = serializers.FloatField()
+    color = serializers.CharField()
+
+
+class CourseRadarSerializer(SparseFieldsMixin, serializers.Serializer):
+    course_id = serializers.IntegerField()
+    labels = serializers.ListField(child=serializers.CharField())
+    data = serializers.ListField(child=serializers.FloatField())
+    details = OutcomeDetailSerializer(many=True)
+
+
+class PODetailSerializer(OutcomeDetailSerializer):
+    # Bölümdeki yüzdelik sıra
+    percentile = serializers.IntegerField(allow_null=True)
+
+
+class PORadarSerializer(SparseFieldsMixin, serializers.Serializer):
+    labels = serializers.ListField(child=serializers.CharField())
+    data = serializers.ListField(child=serializers.FloatField())
+    details = PODetailSerializer(many=True)
+
+
+class StudentDashboardSerializer(SparseFieldsMixin, serializers.Serializer):
+    """
+    Bölümler student_dashboard.SECTIONS ile aynı adlardadır. context["fieldsets"]:
+    {bölüm: [alan, ...]} — bölümün (liste bölümlerinde her öğenin) alanlarını daraltır.
+    """
+
+    SECTIONS = {
+        "student": (StudentSerializer, {}),
+        "semester": (SemesterSerializer, {"allow_null": True}),
+        "courses": (CourseSerializer, {"many": True}),
+        "grades": (CourseGradesSerializer, {"many": True}),
+        "course_radars": (CourseRadarSerializer, {"many": True}),
+        "po_radar": (PORadarSerializer, {}),
+    }
+
+    def get_fields(self):
+        fieldsets = self.context.get("fieldsets", {})
+        return {
+            name: serializer_class(fields=fieldsets.get(name), **kwargs)
+            for name, (serializer_class, kwargs) in self.SECTIONS.items()
+        }
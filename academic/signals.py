@@ -0,0 +1,373 @@
+from django.contrib.auth.models import User
+from django.db.models import Subquery
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import (
+    TAG_ATTAINMENT,
+    TAG_LEARNING_OUTCOMES,
+    TAG_PROGRAM_OUTCOMES,
+    invalidate_layout,
+    invalidate_tag,
+)
+from . import cold_storage
+from .curriculum import invalidate_curriculum
+from .early_warning import request_refresh
+from .facts import sync_scores
+from .percentiles import invalidate_all as invalidate_percentiles
+from .semesters import invalidate_semesters
+from .percentiles import request_refresh as request_percentile_refresh
+from .trends import request_refresh as request_trend_refresh
+from .models import (
+    Assessment,
+    AssessmentWeight,
+    Course,
+    Department,
+    Enrollment,
+    LearningOutcome,
+    OutcomeMapping,
+    ProgramOutcome,
+    ScoreFact,
+    Semester,
+    Student,
+    StudentScore,
+)
+
+
+# --- ARAYÜZ (SIDEBAR / NAVBAR) ÖNBELLEĞİ ---
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # user.groups.add(...) -> instance kullanıcıdır
+    # group.user_set.add(...) -> instance gruptur, etkilenen kullanıcılar pk_set'tedir
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_layout(instance.pk)
+        return
+
+    if action in ("post_add", "post_remove"):
+        user_ids = pk_set
+    elif action == "pre_clear":
+        user_ids = list(instance.user_set.values_list("pk", flat=True))
+    else:
+        return
+    for user_id in user_ids:
+        invalidate_layout(user_id)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # Her girişte sadece last_login güncellenir, menüyü etkilemez
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    invalidate_layout(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # Önbellekteki kullanıcı nesnesi düşmezse silinen hesabın oturumu çalışmaya devam eder
+    invalidate_layout(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def student_changed(sender, instance, **kwargs):
+    # Navbar'da öğrencinin bölümü gösteriliyor
+    if instance.user_id:
+        invalidate_layout(instance.user_id)
+
+
+@receiver(post_save, sender=Department)
+def department_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    user_ids = Student.objects.filter(department=instance).values_list(
+        "user_id", flat=True
+    )
+    for user_id in user_ids:
+        if user_id:
+            invalidate_layout(user_id)
+
+
+# --- DÖNEM LİSTESİ (ÜST ÇUBUKTAKİ SEÇİCİ) ---
+
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def semester_changed(sender, **kwargs):
+    invalidate_semesters()
+
+
+# --- ARŞİV VERİTABANI (bkz. cold_storage.py) ---
+# Arşive taşınmış satırlar sıcak taraftaki CASCADE'e girmez; silinen dönem, ders ve
+# öğrencinin arşivdeki satırları burada silinir.
+
+
+@receiver(post_delete, sender=Semester)
+def semester_deleted_archive(sender, instance, **kwargs):
+    if instance.archived_at:
+        cold_storage.purge("semester", instance.id)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted_archive(sender, instance, **kwargs):
+    if instance.semester_id in cold_storage.archived_semester_ids():
+        cold_storage.purge("course", instance.id)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted_archive(sender, instance, **kwargs):
+    if cold_storage.archived_semester_ids():
+        cold_storage.purge("student", instance.id)
+
+
+# --- MÜFREDAT (PO / LO LİSTELERİ) ÖNBELLEĞİ ---
+
+
+@receiver(post_save, sender=ProgramOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def program_outcome_changed(sender, **kwargs):
+    invalidate_tag(TAG_PROGRAM_OUTCOMES)
+
+
+@receiver(post_save, sender=LearningOutcome)
+@receiver(post_delete, sender=LearningOutcome)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def learning_outcome_changed(sender, **kwargs):
+    # LO listelerinde ders kodu da gösterildiği için ders değişiklikleri de etkiler
+    invalidate_tag(TAG_LEARNING_OUTCOMES)
+
+
+# --- BAŞARIM RAPORLARI ---
+
+
+@receiver(post_save, sender=StudentScore)
+@receiver(post_delete, sender=StudentScore)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+@receiver(post_save, sender=AssessmentWeight)
+@receiver(post_delete, sender=AssessmentWeight)
+@receiver(post_save, sender=OutcomeMapping)
+@receiver(post_delete, sender=OutcomeMapping)
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def attainment_data_changed(sender, **kwargs):
+    # Öğrencinin bölümü değişirse bölüm raporları da değişir
+    invalidate_tag(TAG_ATTAINMENT)
+
+
+# --- MÜFREDAT GRAFİĞİ (SÜREÇ İÇİ ÖNBELLEK) ---
+
+
+@receiver(post_save, sender=AssessmentWeight)
+@receiver(post_delete, sender=AssessmentWeight)
+@receiver(post_save, sender=OutcomeMapping)
+@receiver(post_delete, sender=OutcomeMapping)
+@receiver(post_save, sender=LearningOutcome)
+@receiver(post_delete, sender=LearningOutcome)
+@receiver(post_save, sender=ProgramOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def curriculum_changed(sender, **kwargs):
+    # Tüm worker'lar bir sonraki istekte yerel grafiklerini yeniler
+    invalidate_curriculum()
+
+
+# --- ERKEN UYARI (RİSK LİSTESİ) ---
+
+
+@receiver(post_save, sender=StudentScore)
+@receiver(post_delete, sender=StudentScore)
+def score_changed_risk(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Not girişinde sınav nesnesi zaten yüklü; toplu silmelerde tek sütun okunur
+    if StudentScore.assessment.is_cached(instance):
+        course_id = instance.assessment.course_id
+    else:
+        course_id = (
+            Assessment.objects.filter(pk=instance.assessment_id)
+            .values_list("course_id", flat=True)
+            .first()
+        )
+    if course_id:
+        request_refresh(course_id)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_save, sender=Assessment)
+def course_data_changed_risk(sender, instance, raw=False, **kwargs):
+    # Yeni kayıt veya sınav etkisi (weight) değişikliği tahmini ortalamayı değiştirir
+    if raw:
+        return
+    request_refresh(instance.course_id)
+
+
+# --- NOT OLGU TABLOSU (bkz. facts.py) ---
+# Not silinince olgusu CASCADE ile gider; boyut değişiklikleri tek UPDATE ile yansıtılır.
+
+
+@receiver(post_save, sender=StudentScore)
+def score_saved_fact(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_scores(StudentScore.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Student)
+def student_saved_fact(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    ScoreFact.objects.filter(student=instance).update(
+        department_id=instance.department_id
+    )
+
+
+@receiver(post_save, sender=Course)
+def course_saved_fact(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    ScoreFact.objects.filter(course=instance).update(
+        teacher_id=instance.teacher_id, semester_id=instance.semester_id
+    )
+
+
+@receiver(post_save, sender=Assessment)
+def assessment_saved_fact(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    # Sonuç yayını gibi sadece başka alanları güncelleyen kayıtlar olguları etkilemez
+    if raw or created:
+        return
+    if update_fields and not {"weight", "course"} & set(update_fields):
+        return
+    course = Course.objects.filter(pk=instance.course_id)
+    ScoreFact.objects.filter(assessment=instance).update(
+        assessment_weight=instance.weight,
+        course_id=instance.course_id,
+        teacher_id=Subquery(course.values("teacher_id")[:1]),
+        semester_id=Subquery(course.values("semester_id")[:1]),
+    )
+
+
+# --- PO EĞİLİMİ (bkz. trends.py) ---
+# Sadece değişikliğin düştüğü dönem yeniden hesaplanır
+
+
+def _refresh_trends(semester_ids):
+    for semester_id in semester_ids:
+        if semester_id:
+            request_trend_refresh(semester_id)
+
+
+@receiver(post_save, sender=StudentScore)
+@receiver(post_delete, sender=StudentScore)
+@receiver(post_save, sender=AssessmentWeight)
+@receiver(post_delete, sender=AssessmentWeight)
+def assessment_data_changed_trend(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_trends(
+        Assessment.objects.filter(pk=instance.assessment_id).values_list(
+            "course__semester_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_changed_trend(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_trends(
+        Course.objects.filter(pk=instance.course_id).values_list(
+            "semester_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=OutcomeMapping)
+@receiver(post_delete, sender=OutcomeMapping)
+def mapping_changed_trend(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_trends(
+        LearningOutcome.objects.filter(pk=instance.learning_outcome_id).values_list(
+            "course__semester_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Student)
+def student_saved_trend(sender, instance, created, raw=False, **kwargs):
+    # Bölüm değişikliği öğrencinin tüm dönemlerindeki bölüm ortalamalarını etkiler
+    if raw or created:
+        return
+    _refresh_trends(
+        Enrollment.objects.filter(student=instance)
+        .values_list("course__semester_id", flat=True)
+        .distinct()
+    )
+
+
+# --- YÜZDELİK SIRALAR (bkz. percentiles.py) ---
+# Değişikliğin düştüğü ders için artımlı güncelleme; öğrencinin gruptan çıktığı ya da
+# PO listesinin değiştiği durumlarda dağılımlar baştan kurulur.
+
+
+@receiver(post_save, sender=StudentScore)
+@receiver(post_delete, sender=StudentScore)
+@receiver(post_save, sender=AssessmentWeight)
+@receiver(post_delete, sender=AssessmentWeight)
+def assessment_data_changed_percentile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = (
+        Assessment.objects.filter(pk=instance.assessment_id)
+        .values_list("course_id", flat=True)
+        .first()
+    )
+    if course_id:
+        request_percentile_refresh(course_id)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=Assessment)
+def course_data_changed_percentile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    request_percentile_refresh(instance.course_id)
+
+
+@receiver(post_save, sender=OutcomeMapping)
+@receiver(post_delete, sender=OutcomeMapping)
+def mapping_changed_percentile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = (
+        LearningOutcome.objects.filter(pk=instance.learning_outcome_id)
+        .values_list("course_id", flat=True)
+        .first()
+    )
+    if course_id:
+        request_percentile_refresh(course_id)
+
+
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=ProgramOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def cohort_changed_percentile(sender, raw=False, **kwargs):
+    invalidate_percentiles()
+
+
+@receiver(post_save, sender=Student)
+def student_saved_percentile(sender, instance, created, raw=False, **kwargs):
+    # Bölüm değişikliği iki bölümün dağılımını birden etkiler
+    if raw or created:
+        return
+    invalidate_percentiles()
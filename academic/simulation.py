@@ -0,0 +1,406 @@
+"""
+"What-if" ağırlık simülatörü.
+
+Bölüm başkanı OutcomeMapping.weight ve AssessmentWeight.percentage için önerdiği değerleri
+kaydetmeden, tüm öğrenci grubunun PO başarımının nasıl değişeceğini görür.
+
+Hesap, öğrenci panelindeki (student_general_success) ile aynıdır; ancak öğrenci öğrenci
+döngü yerine matrislerle yapılır:
+    S: öğrenci, A: sınav, L: ders çıktısı (LO), P: program çıktısı (PO)
+    LO başarımı  = (not[S×A] @ yüzde[A×L]) / (100 * notu_var[S×A] @ yüzde[A×L])
+    PO başarımı  = (LO başarımı * kayıtlı[S×L]) @ ağırlık[L×P] / (100 * kayıtlı @ ağırlık)
+S×A ve S×L matrisleri ders ders (blok) kurulur: her blok dersin kayıtlı öğrencileri ile
+LO'larına ağırlığı olan sınavlardan oluşur. Tüm grup × tüm müfredat boyutunda matris
+oluşmaz; bellek kayıt ve not sayısıyla orantılıdır.
+Veriler birkaç sorguyla bir kez okunur; veritabanına hiçbir şey yazılmaz. Mevcut
+ağırlıklarla ("önce") dağılımlar öneriden bağımsızdır ve önbelleğe alınır (bkz. baseline).
+Yalnızca ana veritabanı okunur; arşivlenmiş dönemler (bkz. cold_storage.py) hesaba girmez.
+"""
+
+import numpy as np
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from .caching import (
+    REPORT_CACHE_TIMEOUT,
+    TAG_ATTAINMENT,
+    TAG_LEARNING_OUTCOMES,
+    TAG_PROGRAM_OUTCOMES,
+    get_or_compute,
+    tag_version,
+)
+from .models import (
+    Assessment,
+    AssessmentWeight,
+    Enrollment,
+    LearningOutcome,
+    OutcomeMapping,
+    ProgramOutcome,
+    StudentScore,
+)
+
+# Histogram aralıkları: 0-10, 10-20, ..., 90-100
+HISTOGRAM_EDGES = np.linspace(0, 100, 11)
+PASS_THRESHOLD = 50
+
+# Model alanlarının (DecimalField) izin verdiği üst sınırlar
+MAX_MAPPING_WEIGHT = 9.99
+MAX_ASSESSMENT_PERCENTAGE = 999.99
+
+
+def _index(ids, values):
+    """values içindeki id'leri, sıralı ids dizisindeki konumlarına çevirir."""
+    return np.searchsorted(ids, values)
+
+
+def _groups(keys, count):
+    """
+    keys[i] ∈ [0, count) olan satırları gruplar: (sıra, sınırlar) döner;
+    k grubunun satırları sıra[sınırlar[k]:sınırlar[k + 1]].
+    """
+    order = np.argsort(keys, kind="stable")
+    return order, np.searchsorted(keys[order], np.arange(count + 1))
+
+
+class _Block:
+    """Bir dersin kayıtlı öğrencileri × sınavları ve LO'ları."""
+
+    def __init__(self, students, outcomes, weights, assessments, scores, has_score):
+        self.students = students  # grup içindeki öğrenci konumları
+        self.outcomes = outcomes  # dersin LO konumları
+        # AssessmentWeight satırlarının konumları ve blok içi (sınav, LO) hücreleri
+        self.weights, self.assessments = weights, assessments
+        self.scores, self.has_score = scores, has_score
+
+
+class Cohort:
+    """Bir öğrenci grubunun not, kayıt ve müfredat verisi (ders blokları halinde)."""
+
+    def __init__(self, students, courses=None):
+        """courses verilirse sadece bu derslerdeki kayıtlar hesaba katılır (örn. bir dönem)."""
+        self.student_ids = np.fromiter(
+            students.order_by("id").values_list("id", flat=True), dtype=np.int64
+        )
+        enrollments = Enrollment.objects.filter(student__in=students)
+        if courses is not None:
+            enrollments = enrollments.filter(course__in=courses)
+        enrollments = np.array(
+            enrollments.values_list("student_id", "course_id"), dtype=np.int64
+        ).reshape(-1, 2)
+        course_ids = np.unique(enrollments[:, 1])
+
+        self.assessment_ids = np.fromiter(
+            Assessment.objects.filter(course_id__in=course_ids.tolist())
+            .order_by("id")
+            .values_list("id", flat=True),
+            dtype=np.int64,
+        )
+        los = np.array(
+            LearningOutcome.objects.filter(course_id__in=course_ids.tolist())
+            .order_by("id")
+            .values_list("id", "course_id"),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        self.lo_ids = los[:, 0]
+
+        # PO'lar panellerdeki gibi koda göre gruplanır
+        self.po_codes = []
+        self.po_descriptions = {}
+        po_code_by_id = {}
+        po_rows = ProgramOutcome.objects.order_by("id").values_list(
+            "id", "code", "description"
+        )
+        for po_id, code, description in po_rows:
+            if code not in self.po_descriptions:
+                self.po_codes.append(code)
+                self.po_descriptions[code] = description
+            po_code_by_id[po_id] = code
+        po_position = {code: i for i, code in enumerate(self.po_codes)}
+
+        S, A, L = len(self.student_ids), len(self.assessment_ids), len(self.lo_ids)
+        C = len(course_ids)
+
+        # Notlar: Decimal dönüşümü satır satır yapılmasın diye SQL'de float'a çevrilir
+        scores = np.array(
+            StudentScore.objects.filter(
+                student__in=students, assessment_id__in=self.assessment_ids.tolist()
+            )
+            .annotate(value=Cast("score", FloatField()))
+            .values_list("student_id", "assessment_id", "value"),
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        score_rows = _index(self.student_ids, scores[:, 0].astype(np.int64))
+        score_cols = _index(self.assessment_ids, scores[:, 1].astype(np.int64))
+
+        # Ağırlık satırları id'leriyle tutulur; öneriler id üzerinden uygulanır
+        weights = list(
+            AssessmentWeight.objects.filter(
+                assessment_id__in=self.assessment_ids.tolist()
+            )
+            .annotate(value=Cast("percentage", FloatField()))
+            .values_list("id", "assessment_id", "learning_outcome_id", "value")
+        )
+        known_los = set(self.lo_ids.tolist())
+        weights = [w for w in weights if w[2] in known_los]
+        self.assessment_weight_ids = [w[0] for w in weights]
+        self.assessment_weight_values = np.array(
+            [w[3] for w in weights], dtype=np.float64
+        )
+        weight_assessments = _index(
+            self.assessment_ids, np.array([w[1] for w in weights], dtype=np.int64)
+        )
+        weight_los = _index(self.lo_ids, np.array([w[2] for w in weights], dtype=np.int64))
+
+        mappings = list(
+            OutcomeMapping.objects.filter(learning_outcome_id__in=self.lo_ids.tolist())
+            .annotate(value=Cast("weight", FloatField()))
+            .values_list("id", "learning_outcome_id", "program_outcome_id", "value")
+        )
+        self.mapping_ids = [m[0] for m in mappings]
+        self.mapping_cells = (
+            _index(self.lo_ids, np.array([m[1] for m in mappings], dtype=np.int64)),
+            np.array(
+                [po_position[po_code_by_id[m[2]]] for m in mappings], dtype=np.int64
+            ),
+        )
+        self.mapping_values = np.array([m[3] for m in mappings], dtype=np.float64)
+
+        # Ders blokları: bir LO'nun başarımı yalnızca dersine kayıtlı öğrenciler için gerekir
+        lo_courses = _index(course_ids, los[:, 1])
+        enrolled_students = _index(self.student_ids, enrollments[:, 0])
+        enrolled_courses = _index(course_ids, enrollments[:, 1])
+        enrollment_order, enrollment_bounds = _groups(enrolled_courses, C)
+        lo_order, lo_bounds = _groups(lo_courses, C)
+        weight_order, weight_bounds = _groups(lo_courses[weight_los], C)
+        score_order, score_bounds = _groups(score_cols, A)
+        row_of = np.full(S, -1)
+
+        self.blocks = []
+        for c in range(C):
+            members = np.unique(
+                enrolled_students[
+                    enrollment_order[enrollment_bounds[c] : enrollment_bounds[c + 1]]
+                ]
+            )
+            outcomes = lo_order[lo_bounds[c] : lo_bounds[c + 1]]
+            block_weights = weight_order[weight_bounds[c] : weight_bounds[c + 1]]
+            assessments = np.unique(weight_assessments[block_weights])
+
+            # Bloğun sınavlarına girilen notlar; kayıtsız öğrencilerin notları atlanır
+            picked = np.concatenate(
+                [score_order[score_bounds[a] : score_bounds[a + 1]] for a in assessments]
+                or [np.empty(0, dtype=np.int64)]
+            )
+            row_of[members] = np.arange(len(members))
+            rows = row_of[score_rows[picked]]
+            row_of[members] = -1
+            kept = rows >= 0
+            rows, picked = rows[kept], picked[kept]
+            cols = np.searchsorted(assessments, score_cols[picked])
+            block_scores = np.zeros((len(members), len(assessments)))
+            block_scores[rows, cols] = scores[picked, 2]
+            has_score = np.zeros((len(members), len(assessments)))
+            has_score[rows, cols] = 1.0
+
+            self.blocks.append(
+                _Block(
+                    members,
+                    outcomes,
+                    block_weights,
+                    (
+                        np.searchsorted(assessments, weight_assessments[block_weights]),
+                        np.searchsorted(outcomes, weight_los[block_weights]),
+                    ),
+                    block_scores,
+                    has_score,
+                )
+            )
+
+        # Kayıtlı (öğrenci, LO) hücreleri, öğrenci sonra LO sırasıyla; lo_rates bu sırada döner
+        students_of = [np.repeat(b.students, len(b.outcomes)) for b in self.blocks]
+        outcomes_of = [np.tile(b.outcomes, len(b.students)) for b in self.blocks]
+        cell_students = np.concatenate(students_of or [np.empty(0, dtype=np.int64)])
+        cell_outcomes = np.concatenate(outcomes_of or [np.empty(0, dtype=np.int64)])
+        self._cell_order = np.lexsort((cell_outcomes, cell_students))
+        self.enrolled = (
+            cell_students[self._cell_order],
+            cell_outcomes[self._cell_order],
+        )
+
+        self.shape = {
+            "students": S,
+            "assessments": A,
+            "outcomes": L,
+            "pos": len(self.po_codes),
+        }
+
+    def __len__(self):
+        return len(self.student_ids)
+
+    @staticmethod
+    def _apply(ids, values, overrides):
+        if not overrides:
+            return values
+        values = values.copy()
+        for position, row_id in enumerate(ids):
+            if row_id in overrides:
+                values[position] = overrides[row_id]
+        return values
+
+    def _block_rates(self, assessment_weights):
+        """Her ders bloğu için (blok, LO başarımı[öğrenci × dersin LO'ları])."""
+        values = self._apply(
+            self.assessment_weight_ids,
+            self.assessment_weight_values,
+            assessment_weights,
+        )
+        for block in self.blocks:
+            percentages = np.zeros((block.scores.shape[1], len(block.outcomes)))
+            np.add.at(percentages, block.assessments, values[block.weights])
+            lo_earned = block.scores @ percentages
+            lo_possible = 100 * (block.has_score @ percentages)
+            yield block, np.divide(
+                lo_earned * 100,
+                lo_possible,
+                out=np.zeros_like(lo_earned),
+                where=lo_possible > 0,
+            )
+
+    def lo_rates(self, assessment_weights=None):
+        """
+        Kayıtlı (öğrenci, LO) hücrelerinin başarımı (0-100), self.enrolled sırasıyla.
+        assessment_weights (ve po_totals'ta mappings): {satır id: önerilen değer};
+        verilmeyen satırlar mevcut değeriyle hesaplanır.
+        """
+        rates = [rate.ravel() for _block, rate in self._block_rates(assessment_weights)]
+        return np.concatenate(rates or [np.empty(0)])[self._cell_order]
+
+    def po_totals(self, assessment_weights=None, mappings=None):
+        """
+        PO başına kazanılan ve mümkün olan puan toplamları (öğrenci × PO).
+        Toplamlar toplanabilir olduğundan dönem arşivinde bu haliyle saklanır.
+        """
+        L, P = len(self.lo_ids), len(self.po_codes)
+        po_weights = np.zeros((L, P))
+        np.add.at(
+            po_weights,
+            self.mapping_cells,
+            self._apply(self.mapping_ids, self.mapping_values, mappings),
+        )
+        po_earned = np.zeros((len(self.student_ids), P))
+        po_possible = np.zeros((len(self.student_ids), P))
+        for block, lo_rate in self._block_rates(assessment_weights):
+            weights = po_weights[block.outcomes]
+            po_earned[block.students] += lo_rate @ weights
+            po_possible[block.students] += 100 * weights.sum(axis=0)
+        return po_earned, po_possible
+
+    def po_attainment(self, assessment_weights=None, mappings=None):
+        """PO başarım matrisi (öğrenci × PO, 0-100) ve kapsama maskesi döner."""
+        po_earned, po_possible = self.po_totals(assessment_weights, mappings)
+        covered = po_possible > 0
+        attainment = np.divide(
+            po_earned * 100, po_possible, out=np.zeros_like(po_earned), where=covered
+        )
+        return attainment, covered
+
+
+def parse_overrides(data, prefix, maximum):
+    """
+    Formdan "<prefix><satır id>" alanlarını okur.
+    ({satır id: değer}, [hatalı alan adları]) döner; virgüllü ondalık da kabul edilir.
+    """
+    overrides, invalid = {}, []
+    for key, raw in data.items():
+        if not key.startswith(prefix):
+            continue
+        try:
+            row_id = int(key[len(prefix) :])
+            value = float(raw.replace(",", "."))
+        except ValueError:
+            invalid.append(key)
+            continue
+        if not 0 <= value <= maximum:
+            invalid.append(key)
+            continue
+        overrides[row_id] = value
+    return overrides, invalid
+
+
+def summarize(values):
+    """Bir PO için dağılım özeti (sadece bu PO'ya katkı alan öğrenciler)."""
+    if not len(values):
+        return {
+            "count": 0,
+            "mean": 0,
+            "median": 0,
+            "p25": 0,
+            "p75": 0,
+            "below_pass": 0,
+            "histogram": [0] * (len(HISTOGRAM_EDGES) - 1),
+        }
+    p25, median, p75 = np.percentile(values, [25, 50, 75])
+    histogram, _edges = np.histogram(values, bins=HISTOGRAM_EDGES)
+    return {
+        "count": int(len(values)),
+        "mean": round(float(values.mean()), 1),
+        "median": round(float(median), 1),
+        "p25": round(float(p25), 1),
+        "p75": round(float(p75), 1),
+        "below_pass": round(float((values < PASS_THRESHOLD).mean() * 100), 1),
+        "histogram": histogram.tolist(),
+    }
+
+
+def distributions(cohort, assessment_weights=None, mappings=None):
+    """PO kodu -> dağılım özeti (bkz. summarize)."""
+    attainment, covered = cohort.po_attainment(assessment_weights, mappings)
+    return {
+        code: summarize(attainment[covered[:, position], position])
+        for position, code in enumerate(cohort.po_codes)
+    }
+
+
+def _baseline_cache_key(department_id):
+    versions = ":".join(
+        str(tag_version(tag))
+        for tag in (TAG_ATTAINMENT, TAG_LEARNING_OUTCOMES, TAG_PROGRAM_OUTCOMES)
+    )
+    return f"academic:report:simulator:{department_id or 'all'}:{versions}"
+
+
+def baseline(cohort, department_id):
+    """
+    Mevcut ağırlıklarla dağılımlar; öneriden bağımsız olduğundan öğrenci grubu (bölüm)
+    başına önbelleğe alınır. Veri değişince TAG_ATTAINMENT versiyonu artar.
+    """
+    return get_or_compute(
+        _baseline_cache_key(department_id),
+        lambda: distributions(cohort),
+        REPORT_CACHE_TIMEOUT,
+    )
+
+
+def simulate(cohort, assessment_weights=None, mappings=None, before=None):
+    """
+    Mevcut ve önerilen ağırlıklarla PO başına önce/sonra dağılımları.
+    before: mevcut ağırlıklarla distributions(cohort) (örn. baseline'dan); verilmezse hesaplanır.
+    """
+    if before is None:
+        before = distributions(cohort)
+    after = distributions(cohort, assessment_weights, mappings)
+
+    results = []
+    for code in cohort.po_codes:
+        old = before[code]
+        new = after[code]
+        results.append(
+            {
+                "code": code,
+                "description": cohort.po_descriptions[code],
+                "before": old,
+                "after": new,
+                "delta": round(new["mean"] - old["mean"], 1),
+            }
+        )
+    return results
@@ -0,0 +1,32 @@
+// Sınav başına not dağılımı (histogram); veri views.assessment_analytics chart_data biçimindedir
+(function () {
+    const canvas = document.getElementById('itemHistogramChart');
+    if (!canvas) return;
+    const series = JSON.parse(document.getElementById('item-histogram').textContent);
+    const palette = ['#4f46e5', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#8b5cf6', '#ec4899', '#64748b'];
+
+    new Chart(canvas.getContext('2d'), {
+        type: 'bar',
+        data: {
+            labels: series.labels,
+            datasets: series.datasets.map(function (dataset, i) {
+                return {
+                    label: dataset.label,
+                    data: dataset.data,
+                    backgroundColor: palette[i % palette.length]
+                };
+            })
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                x: { title: { display: true, text: 'Not aralığı' } },
+                y: { beginAtZero: true, ticks: { precision: 0 }, title: { display: true, text: 'Öğrenci' } }
+            },
+            plugins: {
+                legend: { position: 'bottom' }
+            }
+        }
+    });
+})();
@@ -0,0 +1,36 @@
+// Sol menüyü aç / kapat
+document.getElementById('sidebarCollapse').addEventListener('click', function () {
+    document.getElementById('sidebar').style.marginLeft =
+        document.getElementById('sidebar').style.marginLeft === '-260px' ? '0' : '-260px';
+});
+
+// Seçim değişince formu gönder (örn. üst çubuktaki dönem seçici)
+document.querySelectorAll('select[data-autosubmit]').forEach(function (select) {
+    select.addEventListener('change', function () {
+        select.form.submit();
+    });
+});
+
+// Arka plan işi ilerlemesi (bkz. views.job_status): iş bitince sayfa yenilenir
+document.querySelectorAll('[data-job-status]').forEach(function (box) {
+    var bar = box.querySelector('[data-job-progress]');
+    var message = box.querySelector('[data-job-message]');
+    var poll = function () {
+        fetch(box.dataset.jobStatus, { headers: { Accept: 'application/json' } })
+            .then(function (response) { return response.json(); })
+            .then(function (job) {
+                bar.style.width = job.progress + '%';
+                message.textContent = job.error || (box.dataset.jobLabel + ' · ' + (job.message || 'sırada'));
+                if (job.finished) {
+                    if (job.status === 'succeeded') {
+                        window.location.reload();
+                    } else {
+                        bar.classList.remove('progress-bar-animated');
+                    }
+                    return;
+                }
+                setTimeout(poll, 2000);
+            });
+    };
+    setTimeout(poll, 2000);
+});
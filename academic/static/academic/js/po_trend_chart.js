@@ -0,0 +1,35 @@
+// Dönemlere göre PO başarımı çizgi grafiği; veri trends._series biçimindedir
+function drawPoTrendChart(canvasId, dataId) {
+    const canvas = document.getElementById(canvasId);
+    if (!canvas) return;
+    const series = JSON.parse(document.getElementById(dataId).textContent);
+    const palette = ['#4f46e5', '#10b981', '#f59e0b', '#ef4444', '#06b6d4', '#8b5cf6', '#ec4899', '#64748b'];
+
+    new Chart(canvas.getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: series.labels,
+            datasets: series.datasets.map(function (dataset, i) {
+                const color = palette[i % palette.length];
+                return {
+                    label: dataset.label,
+                    data: dataset.data,
+                    borderColor: color,
+                    backgroundColor: color,
+                    tension: 0.3,
+                    spanGaps: true
+                };
+            })
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: { suggestedMin: 0, suggestedMax: 100, title: { display: true, text: 'Başarım (%)' } }
+            },
+            plugins: {
+                legend: { position: 'bottom' }
+            }
+        }
+    });
+}
@@ -0,0 +1,3 @@
+(function () {
+    drawPoTrendChart('poTrendChart', 'po-trend');
+})();
@@ -0,0 +1,86 @@
+(function () {
+    const readJson = (id) => JSON.parse(document.getElementById(id).textContent);
+
+    // 1. RADAR GRAFİĞİ
+    const radarCtx = document.getElementById('radarChart').getContext('2d');
+    const radarLabels = readJson('radar-labels');
+    const radarData = readJson('radar-data');
+
+    new Chart(radarCtx, {
+        type: 'radar',
+        data: {
+            labels: radarLabels,
+            datasets: [{
+                label: 'Yetkinlik Seviyesi (%)',
+                data: radarData,
+                fill: true,
+                backgroundColor: 'rgba(54, 162, 235, 0.2)',
+                borderColor: 'rgb(54, 162, 235)',
+                pointBackgroundColor: 'rgb(54, 162, 235)',
+                pointBorderColor: '#fff',
+                pointHoverBackgroundColor: '#fff',
+                pointHoverBorderColor: 'rgb(54, 162, 235)'
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                r: {
+                    angleLines: { display: true },
+                    suggestedMin: 0,
+                    suggestedMax: 100,
+                    grid: { color: '#e5e7eb' },
+                    pointLabels: { font: { size: 12, weight: 'bold' } }
+                }
+            },
+            plugins: { legend: { display: false } }
+        }
+    });
+
+    // 2. SINIF KIYASLAMASI (BAR CHART)
+    const comparisonCtx = document.getElementById('comparisonChart').getContext('2d');
+    const examLabels = readJson('exam-labels');
+    const myScores = readJson('my-scores');
+    const classAverages = readJson('class-averages');
+
+    new Chart(comparisonCtx, {
+        type: 'bar',
+        data: {
+            labels: examLabels,
+            datasets: [
+                {
+                    label: 'Benim Notum',
+                    data: myScores,
+                    backgroundColor: '#4f46e5', // Koyu Mavi
+                    borderRadius: 5,
+                    barPercentage: 0.6
+                },
+                {
+                    label: 'Sınıf Ortalaması',
+                    data: classAverages,
+                    backgroundColor: '#e5e7eb', // Gri
+                    borderRadius: 5,
+                    barPercentage: 0.6
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    max: 100,
+                    grid: { borderDash: [2, 4] }
+                },
+                x: {
+                    grid: { display: false }
+                }
+            },
+            plugins: {
+                legend: { position: 'bottom' }
+            }
+        }
+    });
+})();
@@ -0,0 +1,44 @@
+(function () {
+    const ctx = document.getElementById('poRadarChart').getContext('2d');
+    const labels = JSON.parse(document.getElementById('po-labels').textContent);
+    const data = JSON.parse(document.getElementById('po-scores').textContent);
+
+    new Chart(ctx, {
+        type: 'radar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Program Yeterliliği (%)',
+                data: data,
+                fill: true,
+                backgroundColor: 'rgba(16, 185, 129, 0.2)',
+                borderColor: '#10b981',
+                pointBackgroundColor: '#10b981',
+                pointBorderColor: '#fff',
+                pointHoverBackgroundColor: '#fff',
+                pointHoverBorderColor: '#10b981'
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                r: {
+                    angleLines: { display: true },
+                    suggestedMin: 0,
+                    suggestedMax: 100,
+                    grid: { color: '#e5e7eb' },
+                    pointLabels: {
+                        font: { size: 13, weight: 'bold', family: "'Inter', sans-serif" },
+                        color: '#374151'
+                    }
+                }
+            },
+            plugins: {
+                legend: { display: false }
+            }
+        }
+    });
+
+    drawPoTrendChart('poTrendChart', 'po-trend');
+})();
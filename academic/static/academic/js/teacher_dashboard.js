@@ -0,0 +1,69 @@
+(function () {
+    // JSON VERİLERİNİ GÜVENLİ ŞEKİLDE ALIYORUZ (json_script etiketlerinden)
+    const readJson = (id) => JSON.parse(document.getElementById(id).textContent);
+    const courseLabels = readJson('graph-comparison-labels');
+    const courseData = readJson('graph-comparison-data');
+    const examLabels = readJson('graph-exams-labels');
+    const examData = readJson('graph-exams-data');
+    
+    const activeCourseCode = readJson('active-course-code');
+    
+    const bgColors = courseLabels.map(code => 
+        code === activeCourseCode ? '#4f46e5' : '#e5e7eb'
+    );
+    const borderColors = courseLabels.map(code => 
+        code === activeCourseCode ? '#4f46e5' : '#9ca3af'
+    );
+
+    // 1. DERS KARŞILAŞTIRMA GRAFİĞİ
+    const ctxComp = document.getElementById('comparisonChart').getContext('2d');
+    new Chart(ctxComp, {
+        type: 'bar',
+        data: {
+            labels: courseLabels,
+            datasets: [{
+                label: 'Not Ortalaması',
+                data: courseData,
+                backgroundColor: bgColors,
+                borderColor: borderColors,
+                borderWidth: 1,
+                borderRadius: 5,
+                barPercentage: 0.6
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: { legend: { display: false } },
+            scales: { y: { beginAtZero: true, max: 100 } }
+        }
+    });
+
+    // 2. SINAV TREND GRAFİĞİ
+    const ctxTrend = document.getElementById('trendChart').getContext('2d');
+    let gradient = ctxTrend.createLinearGradient(0, 0, 0, 200);
+    gradient.addColorStop(0, 'rgba(16, 185, 129, 0.5)'); 
+    gradient.addColorStop(1, 'rgba(16, 185, 129, 0.0)');
+
+    new Chart(ctxTrend, {
+        type: 'line',
+        data: {
+            labels: examLabels,
+            datasets: [{
+                label: 'Ortalama',
+                data: examData,
+                borderColor: '#10b981',
+                backgroundColor: gradient,
+                fill: true,
+                tension: 0.4,
+                pointRadius: 3
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: { legend: { display: false } },
+            scales: { y: { display: false }, x: { display: false } }
+        }
+    });
+})();
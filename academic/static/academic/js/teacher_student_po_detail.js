@@ -0,0 +1,47 @@
+document.addEventListener("DOMContentLoaded", function() {
+    const ctx = document.getElementById('poRadarChart').getContext('2d');
+    const labels = JSON.parse(document.getElementById('po-labels').textContent);
+    const dataValues = JSON.parse(document.getElementById('po-scores').textContent);
+
+    new Chart(ctx, {
+        type: 'radar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Başarım (%)',
+                data: dataValues,
+                backgroundColor: 'rgba(46, 204, 113, 0.2)',
+                borderColor: '#2ecc71',
+                pointBackgroundColor: '#27ae60',
+                pointBorderColor: '#fff',
+                pointHoverBackgroundColor: '#fff',
+                pointHoverBorderColor: '#27ae60',
+                borderWidth: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false, // Kapsayıcıya uyması için false kalmalı
+            scales: {
+                r: {
+                    angleLines: { color: '#eee' },
+                    grid: { color: '#f0f0f0' },
+                    pointLabels: { font: { size: 12, weight: 'bold' }, color: '#555' },
+                    suggestedMin: 0,
+                    suggestedMax: 100,
+                    ticks: { stepSize: 20, backdropColor: 'transparent', font: { size: 10 } }
+                }
+            },
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    backgroundColor: 'rgba(0,0,0,0.8)',
+                    padding: 10,
+                    callbacks: {
+                        label: function(context) { return context.label + ': %' + context.raw; }
+                    }
+                }
+            }
+        }
+    });
+});
@@ -0,0 +1,49 @@
+(function () {
+    const chart = JSON.parse(document.getElementById('simulator-chart').textContent);
+
+    // 1. PO ORTALAMALARI: MEVCUT / ÖNERİLEN
+    new Chart(document.getElementById('meanChart'), {
+        type: 'bar',
+        data: {
+            labels: chart.labels,
+            datasets: [
+                { label: 'Mevcut', data: chart.before, backgroundColor: '#9ca3af', borderRadius: 4 },
+                { label: 'Öneri', data: chart.after, backgroundColor: '#4f46e5', borderRadius: 4 }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: { y: { beginAtZero: true, max: 100 } }
+        }
+    });
+
+    // 2. SEÇİLEN PO İÇİN DAĞILIM (HİSTOGRAM)
+    const bins = ['0-10', '10-20', '20-30', '30-40', '40-50', '50-60', '60-70', '70-80', '80-90', '90-100'];
+    const select = document.getElementById('histogram-po');
+    const histogram = new Chart(document.getElementById('histogramChart'), {
+        type: 'bar',
+        data: {
+            labels: bins,
+            datasets: [
+                { label: 'Mevcut', data: [], backgroundColor: 'rgba(156, 163, 175, 0.7)' },
+                { label: 'Öneri', data: [], backgroundColor: 'rgba(79, 70, 229, 0.7)' }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: { y: { beginAtZero: true, title: { display: true, text: 'Öğrenci' } } }
+        }
+    });
+
+    const show = (code) => {
+        histogram.data.datasets[0].data = chart.histograms[code].before;
+        histogram.data.datasets[1].data = chart.histograms[code].after;
+        histogram.update();
+    };
+    select.addEventListener('change', () => show(select.value));
+    if (chart.labels.length) {
+        show(chart.labels[0]);
+    }
+})();
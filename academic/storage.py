@@ -0,0 +1,10 @@
+from compressor.storage import BrotliCompressorFileStorage, GzipCompressorFileStorage
+
+
+class PrecompressedCompressorFileStorage(
+    GzipCompressorFileStorage, BrotliCompressorFileStorage
+):
+    """
+    django-compressor çıktılarını (CACHE/css, CACHE/js) yazarken yanlarına .gz ve .br
+    kopyalarını da üretir. WhiteNoise bu hazır dosyaları sunar; istek başına sıkıştırma yapılmaz.
+    """
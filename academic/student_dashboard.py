@@ -0,0 +1,206 @@
+"""
+Öğrenci panelinin tamamı tek yanıtta (mobil uygulama / REST API, bkz. api.py).
+
+Ders listesi, notlar, ders bazlı LO radarları ve PO radarı web sayfalarındaki hesaplarla
+aynıdır; ancak ders başına sorgu atılmaz. Sorgu sayısı öğrencinin ders ve not sayısından
+bağımsızdır (sıcak önbellekle, varsayılan veritabanında):
+    1. öğrenci + bölüm (görünümde)
+    2. aktif dönemdeki kayıtlar + ders + öğretmen
+    3. aktif dönemdeki notlar + sınav
+    4. kapatılmış dönemse dondurulmuş LO başarımları (ArchivedLOAttainment)
+LO → sınav yüzdeleri süreç içi müfredat önbelleğinden, ders dağılımları (yüzdelik sıra),
+PO raporu ve bölüm dağılımı ortak önbellekten toplu okunur. Soğuk önbellekte bunlar da ders
+sayısından bağımsız, sabit sayıda toplu sorguyla kurulur.
+
+Sadece istenen bölümler hesaplanır (SECTIONS); ör. sadece "po_radar" istenirse kayıt ve not
+sorguları hiç atılmaz.
+"""
+
+from .attainment import score_color, student_po_report
+from .cold_storage import reading
+from .curriculum import get_course_graphs
+from .models import ArchivedLOAttainment, Enrollment, StudentScore
+from .percentiles import (
+    COURSE_TOLERANCE,
+    course_distributions,
+    percentile_rank,
+    student_po_percentiles,
+)
+
+SECTIONS = ("student", "semester", "courses", "grades", "course_radars", "po_radar")
+
+# Kayıt ve notları okuyan bölümler
+_COURSE_SECTIONS = {"courses", "grades", "course_radars"}
+
+
+def _details(labels, descriptions, scores):
+    return [
+        {
+            "code": code,
+            "description": description,
+            "score": score,
+            "color": score_color(score),
+        }
+        for code, description, score in zip(labels, descriptions, scores)
+    ]
+
+
+def _student(student):
+    return {
+        "id": student.id,
+        "student_number": student.student_id,
+        "first_name": student.first_name,
+        "last_name": student.last_name,
+        "department": student.department.name if student.department else None,
+    }
+
+
+def _semester(semester):
+    if semester is None:
+        return None
+    return {
+        "id": semester.id,
+        "name": semester.name,
+        "is_closed": semester.is_closed,
+        "is_archived": bool(semester.archived_at),
+    }
+
+
+def _course_sections(student, semester, sections):
+    """courses, grades ve course_radars; aktif dönemin kayıt ve notlarından."""
+    enrollments = list(
+        Enrollment.objects.filter(student=student, course__semester=semester)
+        .select_related("course__teacher")
+        .order_by("course__code")
+    )
+    courses = [enrollment.course for enrollment in enrollments]
+    course_ids = [course.id for course in courses]
+
+    # Sınav sırasıyla (ders panelindeki ortalama ile aynı toplama sırası)
+    scores = {course_id: [] for course_id in course_ids}
+    for score in (
+        StudentScore.objects.filter(student=student, assessment__course_id__in=course_ids)
+        .select_related("assessment")
+        .order_by("assessment_id")
+    ):
+        scores[score.assessment.course_id].append(score)
+
+    payload = {}
+    if "courses" in sections:
+        distributions = course_distributions(course_ids)
+        payload["courses"] = []
+        for course in courses:
+            weighted_sum = total_weight = 0
+            for score in scores[course.id]:
+                weighted_sum += float(score.score) * score.assessment.weight
+                total_weight += score.assessment.weight
+            average = round(weighted_sum / total_weight, 2) if total_weight > 0 else 0
+            payload["courses"].append(
+                {
+                    "id": course.id,
+                    "code": course.code,
+                    "name": course.name,
+                    "teacher": (
+                        course.teacher.get_full_name() or course.teacher.username
+                    )
+                    if course.teacher
+                    else None,
+                    "average": average,
+                    "percentile": percentile_rank(
+                        distributions[course.id], average, COURSE_TOLERANCE
+                    )
+                    if total_weight > 0
+                    else None,
+                }
+            )
+
+    if "grades" in sections:
+        payload["grades"] = [
+            {
+                "course_id": course.id,
+                "code": course.code,
+                "scores": [
+                    {
+                        "assessment_id": score.assessment_id,
+                        "name": score.assessment.name,
+                        "date": score.assessment.date,
+                        "weight": score.assessment.weight,
+                        "score": float(score.score),
+                    }
+                    # Notlar sayfasındaki gibi en yeni sınav başta
+                    for score in sorted(
+                        scores[course.id],
+                        key=lambda score: score.assessment.date,
+                        reverse=True,
+                    )
+                ],
+            }
+            for course in courses
+        ]
+
+    if "course_radars" in sections:
+        # Kapatılmış dönemin LO başarımları arşivde hazır
+        archived_rates = None
+        if semester.is_closed:
+            archived_rates = dict(
+                ArchivedLOAttainment.objects.filter(
+                    student=student, semester_id=semester.id
+                ).values_list("learning_outcome_id", "rate")
+            )
+        payload["course_radars"] = []
+        for course_id, graph in get_course_graphs(course_ids).items():
+            if archived_rates is not None:
+                rates = [archived_rates.get(lo_id, 0) for lo_id in graph.lo_ids]
+            else:
+                score_map = {
+                    score.assessment_id: score.score for score in scores[course_id]
+                }
+                rates = graph.lo_rates(score_map)
+            data = [float(round(rate, 1)) for rate in rates]
+            payload["course_radars"].append(
+                {
+                    "course_id": course_id,
+                    "labels": graph.lo_codes,
+                    "data": data,
+                    "details": _details(graph.lo_codes, graph.lo_descriptions, data),
+                }
+            )
+    return payload
+
+
+def _po_radar(student):
+    # Açık dönemler canlı, kapatılmış dönemler arşivden (bkz. attainment.py)
+    po_labels, po_scores, po_details = student_po_report(student)
+    percentiles = student_po_percentiles(student, po_labels, po_scores)
+    return {
+        "labels": po_labels,
+        "data": po_scores,
+        "details": [
+            {**detail, "percentile": percentiles.get(detail["code"])}
+            for detail in po_details
+        ],
+    }
+
+
+def build_payload(student, semester, sections=SECTIONS):
+    """
+    Öğrencinin panel verisi; sections: SECTIONS'ın alt kümesi. semester aktif dönemdir
+    (semesters.get_active_semester); None ise ders bölümleri boş döner.
+    """
+    sections = set(sections)
+    payload = {}
+    if "student" in sections:
+        payload["student"] = _student(student)
+    if "semester" in sections:
+        payload["semester"] = _semester(semester)
+    if sections & _COURSE_SECTIONS:
+        if semester is None:
+            payload.update({name: [] for name in sections & _COURSE_SECTIONS})
+        else:
+            # Arşivlenmiş dönemin kayıt ve notları arşiv veritabanında (bkz. cold_storage.py)
+            with reading(semester.id):
+                payload.update(_course_sections(student, semester, sections))
+    if "po_radar" in sections:
+        # Tüm dönemler üzerinden; arşiv bloğunun dışında
+        payload["po_radar"] = _po_radar(student)
+    return payload
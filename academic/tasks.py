@@ -0,0 +1,78 @@
+"""
+Arka plan görevleri. Buradaki fonksiyonlar `manage.py job_worker` tarafından çalıştırılır
+(bkz. jobs.py); uygulama açılırken AcademicConfig.ready() ile kaydedilir.
+"""
+
+from . import archive, cold_storage, deletion, early_warning, notifications, percentiles, trends
+from .jobs import PermanentJobError, register_task
+from .models import Semester
+
+
+@register_task(notifications.NOTIFY_TASK)
+def notify_assessment_results(job, payload):
+    return notifications.notify(
+        payload["assessment_ids"],
+        progress=job.set_progress,
+        student_ids=payload.get("student_ids"),
+    )
+
+
+@register_task(notifications.DIGEST_TASK)
+def send_result_digest(job, payload):
+    # O ana kadar yayınlanıp bildirimi yapılmamış tüm sınavlar tek seferde
+    return notifications.notify(
+        notifications.pending_digest_assessment_ids(), progress=job.set_progress
+    )
+
+
+@register_task(archive.CLOSE_SEMESTER_TASK)
+def close_semester(job, payload):
+    semester = Semester.objects.filter(pk=payload["semester_id"]).first()
+    if semester is None:
+        raise PermanentJobError("Dönem silinmiş.")
+    if semester.is_closed:
+        return {"skipped": True}
+    return archive.close_semester(semester, progress=job.set_progress)
+
+
+@register_task(early_warning.REFRESH_RISK_TASK)
+def refresh_risk_flags(job, payload):
+    # Ders verilmemişse tüm açık dönem dersleri
+    if "course_id" not in payload:
+        return early_warning.refresh_all(progress=job.set_progress)
+    course_id = payload["course_id"]
+    flags = early_warning.refresh_course_flags([course_id])
+    return {"course_id": course_id, "flags": flags}
+
+
+@register_task(trends.REFRESH_TREND_TASK)
+def refresh_po_trends(job, payload):
+    # Dönem verilmemişse tüm dönemler
+    if "semester_id" not in payload:
+        return trends.refresh_all(progress=job.set_progress)
+    semester = Semester.objects.filter(pk=payload["semester_id"]).first()
+    if semester is None:
+        raise PermanentJobError("Dönem silinmiş.")
+    return {"semester_id": semester.id, "points": trends.refresh_semester(semester)}
+
+
+@register_task(percentiles.REFRESH_PERCENTILE_TASK)
+def refresh_percentiles(job, payload):
+    return percentiles.refresh_course(payload["course_id"])
+
+
+@register_task(cold_storage.ARCHIVE_SEMESTER_TASK)
+def archive_semester(job, payload):
+    semester = Semester.objects.filter(pk=payload["semester_id"]).first()
+    if semester is None:
+        raise PermanentJobError("Dönem silinmiş.")
+    if payload.get("restore"):
+        return cold_storage.restore_semester(semester, progress=job.set_progress)
+    if not semester.is_closed:
+        raise PermanentJobError("Dönem kapatılmamış.")
+    return cold_storage.archive_semester(semester, progress=job.set_progress)
+
+
+@register_task(deletion.DELETE_TASK)
+def cascade_delete(job, payload):
+    return deletion.delete(payload["model"], payload["id"], progress=job.set_progress)
@@ -1,3 +1,1155 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from . import (
+    caching,
+    cold_storage,
+    deletion,
+    facts,
+    notifications,
+    percentiles,
+    profiling,
+    simulation,
+)
+from .jobs import (
+    STALE_LOCK_TIMEOUT,
+    JobContext,
+    PermanentJobError,
+    claim_next_job,
+    enqueue,
+    register_task,
+    requeue_stale_jobs,
+    run_job,
+    work,
+)
+from .models import (
+    Assessment,
+    AssessmentWeight,
+    Course,
+    Department,
+    Enrollment,
+    Job,
+    LearningOutcome,
+    OutcomeMapping,
+    ProgramOutcome,
+    ScoreFact,
+    Semester,
+    Student,
+    StudentScore,
+)
+from .student_dashboard import SECTIONS
+
+
+def make_students(count, department=None, prefix="s"):
+    """E-postası olan kullanıcılara bağlı öğrenciler."""
+    students = []
+    for i in range(count):
+        # Şifresiz: testlerde PBKDF2 özetlemesine gerek yok
+        user = User.objects.create_user(f"{prefix}{i}", f"{prefix}{i}@example.com")
+        students.append(
+            Student.objects.create(
+                user=user,
+                department=department,
+                student_id=f"{prefix}{i}",
+                first_name=f"Ad{i}",
+                last_name="Soyad",
+            )
+        )
+    return students
+
+
+def run_due_jobs(tasks=None):
+    """Bekleme süresi dolmamış işler de dahil sıradaki işleri çalıştırır."""
+    Job.objects.filter(status=Job.STATUS_PENDING).update(run_at=timezone.now())
+    return work("test", tasks=tasks)
+
+
+# --- SONUÇ BİLDİRİMLERİ (bkz. notifications.py) ---
+
+
+class RecordingBackend(EmailBackend):
+    """locmem; açılan bağlantıları ve gönderilen partileri sayar, istenen partide hata verir."""
+
+    opened = 0
+    batches = []
+    fail_on_batch = None
+
+    def open(self):
+        RecordingBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        RecordingBackend.batches.append(len(messages))
+        if len(RecordingBackend.batches) == RecordingBackend.fail_on_batch:
+            raise ConnectionError("SMTP bağlantısı koptu")
+        return super().send_messages(messages)
+
+    @classmethod
+    def reset(cls, fail_on_batch=None):
+        cls.opened = 0
+        cls.batches = []
+        cls.fail_on_batch = fail_on_batch
+
+
+NOTIFY_TASKS = [notifications.NOTIFY_TASK, notifications.DIGEST_TASK]
+
+
+@override_settings(
+    EMAIL_BACKEND="academic.tests.RecordingBackend",
+    NOTIFICATION_BATCH_SIZE=2,
+    RESULT_NOTIFICATION_DIGEST=False,
+)
+class ResultNotificationTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        RecordingBackend.reset()
+        semester = Semester.objects.create(name="Güz")
+        self.course = Course.objects.create(code="BM101", name="Giriş", semester=semester)
+        self.other = Course.objects.create(code="BM102", name="Veri", semester=semester)
+        self.students = make_students(5)
+        for student in self.students:
+            Enrollment.objects.create(student=student, course=self.course)
+            Enrollment.objects.create(student=student, course=self.other)
+        self.exam = Assessment.objects.create(course=self.course, name="Vize", weight=40)
+        self.quiz = Assessment.objects.create(course=self.other, name="Quiz", weight=10)
+        StudentScore.objects.create(student=self.students[0], assessment=self.exam, score=77)
+
+    def recipients(self):
+        return sorted(message.to[0] for message in mail.outbox)
+
+    def test_publish_enqueues_job_and_sends_one_email_per_student(self):
+        self.assertTrue(notifications.publish_assessment(self.exam))
+        self.assertEqual(mail.outbox, [])  # gönderim istekte değil, işte
+
+        run_due_jobs(NOTIFY_TASKS)
+
+        self.assertEqual(
+            self.recipients(), sorted(s.user.email for s in self.students)
+        )
+        first = next(m for m in mail.outbox if m.to == [self.students[0].user.email])
+        self.assertIn("BM101 - Vize", first.subject)
+        self.assertIn("77", first.body)
+        # İkinci yayın tekrar e-posta göndermez
+        self.assertFalse(notifications.publish_assessment(self.exam))
+        self.assertEqual(run_due_jobs(NOTIFY_TASKS), 0)
+
+    def test_batches_share_one_connection(self):
+        notifications.publish_assessment(self.exam)
+        run_due_jobs(NOTIFY_TASKS)
+
+        self.assertEqual(RecordingBackend.opened, 1)
+        self.assertEqual(RecordingBackend.batches, [2, 2, 1])
+
+    @override_settings(RESULT_NOTIFICATION_DIGEST=True)
+    def test_digest_sends_single_email_for_several_assessments(self):
+        notifications.publish_assessment(self.exam)
+        notifications.publish_assessment(self.quiz)
+        self.assertEqual(
+            Job.objects.filter(task=notifications.DIGEST_TASK).count(), 1
+        )
+
+        run_due_jobs(NOTIFY_TASKS)
+
+        self.assertEqual(len(mail.outbox), len(self.students))
+        for message in mail.outbox:
+            self.assertEqual(message.subject, "2 sınavın sonucu açıklandı")
+            self.assertIn("BM101 Vize", message.body)
+            self.assertIn("BM102 Quiz", message.body)
+
+    def test_failed_batch_does_not_resend_delivered_emails(self):
+        RecordingBackend.reset(fail_on_batch=2)
+        notifications.publish_assessment(self.exam)
+
+        run_due_jobs(NOTIFY_TASKS)
+
+        first = Job.objects.filter(task=notifications.NOTIFY_TASK).earliest("id")
+        self.assertEqual(first.status, Job.STATUS_FAILED)
+        self.assertEqual(len(mail.outbox), 2)  # sadece ilk parti gitti
+        remainder = Job.objects.get(
+            task=notifications.NOTIFY_TASK, status=Job.STATUS_PENDING
+        )
+        self.assertEqual(len(remainder.payload["student_ids"]), 3)
+
+        run_due_jobs(NOTIFY_TASKS)
+
+        remainder.refresh_from_db()
+        self.assertEqual(remainder.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(remainder.result["sent"], 3)
+        # Her öğrenci tam bir e-posta aldı
+        self.assertEqual(
+            self.recipients(), sorted(s.user.email for s in self.students)
+        )
+
+    def test_failure_before_any_delivery_retries_whole_job(self):
+        RecordingBackend.reset(fail_on_batch=1)
+        notifications.publish_assessment(self.exam)
+
+        work("test", tasks=NOTIFY_TASKS)
+
+        job = Job.objects.get(task=notifications.NOTIFY_TASK)
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.exam.refresh_from_db()
+        self.assertIsNone(self.exam.notified_at)
+
+        RecordingBackend.reset()
+        run_due_jobs(NOTIFY_TASKS)
+        self.assertEqual(len(mail.outbox), len(self.students))
+
+
+# --- İŞ KUYRUĞU (bkz. jobs.py) ---
+
+CALLS = []
+
+
+@register_task("test.flaky")
+def flaky_task(job, payload):
+    """payload["fail"] kez geçici hata verir, sonra başarır."""
+    CALLS.append(job.id)
+    if CALLS.count(job.id) <= payload.get("fail", 0):
+        raise ConnectionError("geçici hata")
+    return {"calls": CALLS.count(job.id)}
+
+
+@register_task("test.permanent")
+def permanent_task(job, payload):
+    raise PermanentJobError("kayıt silinmiş")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_claim_is_exclusive_and_ordered(self):
+        later = enqueue("test.flaky", priority=1)
+        first = enqueue("test.flaky")
+        enqueue("test.flaky", delay=timedelta(hours=1))  # vakti gelmedi
+
+        claimed = claim_next_job("w1")
+        self.assertEqual(claimed.id, first.id)
+        self.assertEqual(claimed.status, Job.STATUS_RUNNING)
+        self.assertEqual(claimed.locked_by, "w1")
+        self.assertEqual(claim_next_job("w2").id, later.id)
+        self.assertIsNone(claim_next_job("w3"))
+
+    def test_failure_is_retried_with_backoff(self):
+        job = enqueue("test.flaky", {"fail": 1})
+
+        self.assertEqual(work("test", tasks=["test.flaky"]), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("ConnectionError", job.error)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIsNone(claim_next_job("test"))  # beklemede
+
+        run_due_jobs(["test.flaky"])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.result, {"calls": 2})
+        self.assertEqual(job.error, "")
+
+    def test_gives_up_after_max_attempts(self):
+        job = enqueue("test.flaky", {"fail": 5}, max_attempts=2)
+        run_due_jobs(["test.flaky"])
+        run_due_jobs(["test.flaky"])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(len(CALLS), 2)
+
+    def test_permanent_error_is_not_retried(self):
+        job = enqueue("test.permanent")
+        work("test", tasks=["test.permanent"])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_heartbeat_keeps_running_job_locked(self):
+        job = enqueue("test.flaky")
+        claimed = claim_next_job("w1")
+        old = timezone.now() - STALE_LOCK_TIMEOUT - timedelta(minutes=1)
+        Job.objects.filter(pk=job.pk).update(locked_at=old)
+
+        JobContext(claimed).set_progress(40, "Yarısı")
+
+        self.assertEqual(requeue_stale_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.progress, 40)
+
+    def test_stale_job_requeue_counts_as_attempt(self):
+        job = enqueue("test.flaky", max_attempts=2)
+        old = timezone.now() - STALE_LOCK_TIMEOUT - timedelta(minutes=1)
+
+        claim_next_job("w1")
+        Job.objects.filter(pk=job.pk).update(locked_at=old)
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, "")
+
+        # İkinci çöküşte deneme hakkı biter
+        claim_next_job("w1")
+        Job.objects.filter(pk=job.pk).update(locked_at=old)
+        self.assertEqual(requeue_stale_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(CALLS, [])
+
+    def test_presumed_dead_worker_does_not_overwrite_new_owner(self):
+        job = enqueue("test.flaky")
+        old = timezone.now() - STALE_LOCK_TIMEOUT - timedelta(minutes=1)
+        first = claim_next_job("w1")
+        Job.objects.filter(pk=job.pk).update(locked_at=old)
+        requeue_stale_jobs()
+        second = claim_next_job("w2")
+
+        run_job(first)  # w1 aslında çalışıyormuş; geç bitirdi
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.locked_by, "w2")
+
+        JobContext(first).set_progress(50)
+        job.refresh_from_db()
+        self.assertEqual(job.progress, 0)
+
+        run_job(second)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.result, {"calls": 2})
+
+    def test_worker_requeues_stale_jobs(self):
+        job = enqueue("test.flaky", delay=timedelta(hours=1))
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING,
+            locked_by="ölü",
+            locked_at=timezone.now() - STALE_LOCK_TIMEOUT - timedelta(minutes=1),
+        )
+        call_command("job_worker", once=True, tasks=["test.flaky"], stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+
+
+# --- HESAP KİLİDİ (bkz. caching.get_or_compute) ---
+
+
+class ComputeLockTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+
+    def compute(self, value="taze"):
+        self.calls.append(value)
+        return value
+
+    def test_miss_computes_once_and_caches(self):
+        self.assertEqual(caching.get_or_compute("k", self.compute, 60), "taze")
+        self.assertEqual(caching.get_or_compute("k", self.compute, 60), "taze")
+        self.assertEqual(self.calls, ["taze"])
+        self.assertIsNone(cache.get("k:lock"))  # kilit bırakıldı
+
+    def test_waiter_uses_result_of_lock_owner(self):
+        cache.add("k:lock", 1, 60)  # başka bir süreç hesaplıyor
+
+        def owner_finishes(seconds):
+            cache.set("k", "sahibinden", 60)
+
+        with mock.patch("academic.caching.time.sleep", side_effect=owner_finishes):
+            value = caching.get_or_compute("k", self.compute, 60)
+
+        self.assertEqual(value, "sahibinden")
+        self.assertEqual(self.calls, [])
+
+    def test_waiter_computes_itself_when_owner_stalls(self):
+        cache.add("k:lock", 1, 60)
+        with mock.patch("academic.caching.time.sleep"):
+            with mock.patch(
+                "academic.caching.time.monotonic", side_effect=[0, 0.5, 1.5]
+            ):
+                value = caching.get_or_compute("k", self.compute, 60, lock_timeout=1)
+
+        self.assertEqual(value, "taze")
+        self.assertEqual(self.calls, ["taze"])
+
+    def test_many_computes_only_missing_items_in_one_call(self):
+        cache.set("a", 1, 60)
+        cache.add("c:lock", 1, 60)  # c başka bir süreçte hesaplanıyor
+        batches = []
+
+        def compute(items):
+            batches.append(sorted(items))
+            return {item: item.upper() for item in items}
+
+        def owner_finishes(seconds):
+            cache.set("c", "C!", 60)
+
+        with mock.patch("academic.caching.time.sleep", side_effect=owner_finishes):
+            values = caching.get_or_compute_many(
+                {"a": "a", "b": "b", "c": "c"}, compute, 60
+            )
+
+        self.assertEqual(values, {"a": 1, "b": "B", "c": "C!"})
+        self.assertEqual(batches, [["b"]])
+        self.assertEqual(cache.get("b"), "B")
+
+
+# --- NOT OLGU TABLOSU (bkz. facts.py) ---
+
+
+class ScoreFactSyncTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        self.fall = Semester.objects.create(name="Güz")
+        self.spring = Semester.objects.create(name="Bahar")
+        self.cs = Department.objects.create(name="Bilgisayar")
+        self.ee = Department.objects.create(name="Elektrik")
+        self.teacher = User.objects.create_user("hoca")
+        self.other_teacher = User.objects.create_user("hoca2")
+        self.course = Course.objects.create(
+            code="BM101", name="Giriş", semester=self.fall, teacher=self.teacher
+        )
+        self.exam = Assessment.objects.create(course=self.course, name="Vize", weight=40)
+        self.students = make_students(2, department=self.cs)
+        for i, student in enumerate(self.students):
+            StudentScore.objects.create(student=student, assessment=self.exam, score=60 + i)
+
+    def facts(self):
+        return list(
+            ScoreFact.objects.order_by("student_score_id").values_list(
+                "student_id",
+                "department_id",
+                "course_id",
+                "teacher_id",
+                "semester_id",
+                "assessment_weight",
+                "score",
+            )
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.facts()
+        facts.rebuild()
+        self.assertEqual(incremental, self.facts())
+
+    def test_score_save_writes_fact(self):
+        self.assertEqual(
+            self.facts()[0],
+            (
+                self.students[0].id,
+                self.cs.id,
+                self.course.id,
+                self.teacher.id,
+                self.fall.id,
+                40,
+                60.0,
+            ),
+        )
+        score = StudentScore.objects.get(student=self.students[0])
+        score.score = 90
+        score.save()
+        self.assertEqual(self.facts()[0][-1], 90.0)
+        self.assertMatchesRebuild()
+
+    def test_dimension_edits_are_reflected(self):
+        student = self.students[0]
+        student.department = self.ee
+        student.save()
+        self.course.teacher = self.other_teacher
+        self.course.semester = self.spring
+        self.course.save()
+        self.exam.weight = 60
+        self.exam.save()
+
+        self.assertEqual(
+            {row[1] for row in self.facts()}, {self.cs.id, self.ee.id}
+        )
+        self.assertEqual(
+            {row[2:6] for row in self.facts()},
+            {(self.course.id, self.other_teacher.id, self.spring.id, 60)},
+        )
+        self.assertMatchesRebuild()
+
+    def test_assessment_moved_to_another_course(self):
+        other = Course.objects.create(
+            code="BM102", name="Veri", semester=self.spring, teacher=self.other_teacher
+        )
+        self.exam.course = other
+        self.exam.save(update_fields=["course"])
+
+        self.assertEqual(
+            {row[2:5] for row in self.facts()},
+            {(other.id, self.other_teacher.id, self.spring.id)},
+        )
+        self.assertMatchesRebuild()
+
+    def test_unrelated_assessment_update_skips_facts(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.exam.published_at = timezone.now()
+            self.exam.save(update_fields=["published_at"])
+        self.assertFalse(
+            [q for q in queries.captured_queries if "academic_scorefact" in q["sql"]]
+        )
+
+    def test_sync_pending_catches_bulk_writes(self):
+        StudentScore.objects.filter(student=self.students[0]).update(
+            score=15, updated_at=timezone.now()
+        )
+        self.assertEqual(facts.sync_pending(), 1)
+        self.assertEqual(self.facts()[0][-1], 15.0)
+        self.assertEqual(facts.sync_pending(), 0)
+        self.assertMatchesRebuild()
+
+    def test_aggregate_by_department(self):
+        self.students[1].department = self.ee
+        self.students[1].save()
+        rows = facts.aggregate(["department"], semester=self.fall.id)
+        self.assertEqual(
+            [(row["department"], row["scores"], row["average"]) for row in rows],
+            [(self.cs.id, 1, 60.0), (self.ee.id, 1, 61.0)],
+        )
+
+
+# --- YÜZDELİK SIRALAR (bkz. percentiles.py) ---
+
+
+class PercentilePatchTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        semester = Semester.objects.create(name="Güz")
+        self.department = Department.objects.create(name="Bilgisayar")
+        po1 = ProgramOutcome.objects.create(code="PO1", description="Analiz")
+        po2 = ProgramOutcome.objects.create(code="PO2", description="Tasarım")
+        self.courses, self.exams = [], []
+        for code in ("BM101", "BM102"):
+            course = Course.objects.create(code=code, name=code, semester=semester)
+            lo = LearningOutcome.objects.create(course=course, code="LO1", description="")
+            OutcomeMapping.objects.create(
+                learning_outcome=lo, program_outcome=po1, weight="1.00"
+            )
+            OutcomeMapping.objects.create(
+                learning_outcome=lo, program_outcome=po2, weight="0.50"
+            )
+            exam = Assessment.objects.create(course=course, name="Vize", weight=100)
+            AssessmentWeight.objects.create(
+                assessment=exam, learning_outcome=lo, percentage=100
+            )
+            self.courses.append(course)
+            self.exams.append(exam)
+        self.students = make_students(6, department=self.department)
+        for i, student in enumerate(self.students):
+            for course, exam in zip(self.courses, self.exams):
+                Enrollment.objects.create(student=student, course=course)
+                StudentScore.objects.create(
+                    student=student, assessment=exam, score=40 + 10 * i
+                )
+        run_due_jobs([percentiles.REFRESH_PERCENTILE_TASK])
+
+    def rebuilt(self):
+        return percentiles.build_department_distribution(self.department.id)[0]
+
+    def change_score(self, student, exam, score):
+        StudentScore.objects.filter(student=student, assessment=exam).update(score=score)
+        StudentScore.objects.get(student=student, assessment=exam).save()
+
+    def test_refresh_patches_cached_distribution(self):
+        warm = percentiles.department_distribution(self.department.id)
+        self.assertEqual(len(warm["PO1"]), len(self.students))
+        self.assertEqual(warm, self.rebuilt())
+
+        self.change_score(self.students[0], self.exams[0], 100)
+        job = Job.objects.get(
+            task=percentiles.REFRESH_PERCENTILE_TASK, status=Job.STATUS_PENDING
+        )
+        run_due_jobs([percentiles.REFRESH_PERCENTILE_TASK])
+
+        job.refresh_from_db()
+        self.assertEqual(job.result["departments"], 1)  # yama, baştan kurulum değil
+        with mock.patch.object(
+            percentiles, "build_department_distribution"
+        ) as build:
+            patched = percentiles.department_distribution(self.department.id)
+        build.assert_not_called()
+        self.assertEqual(patched, self.rebuilt())
+        self.assertEqual(
+            percentiles.course_distribution(self.courses[0].id),
+            percentiles.build_course_distribution(self.courses[0].id),
+        )
+
+    def test_percentile_rank_follows_patch(self):
+        percentiles.department_distribution(self.department.id)
+        top = self.students[-1]
+        before = percentiles.student_po_percentiles(top, ["PO1"], [90.0])
+
+        self.change_score(self.students[0], self.exams[0], 100)
+        self.change_score(self.students[0], self.exams[1], 100)
+        run_due_jobs([percentiles.REFRESH_PERCENTILE_TASK])
+
+        after = percentiles.student_po_percentiles(top, ["PO1"], [90.0])
+        self.assertLess(after["PO1"], before["PO1"])
+
+    def test_concurrent_patch_drops_distribution(self):
+        percentiles.department_distribution(self.department.id)
+        key = percentiles._po_key(self.department.id)
+        cache.add(f"{key}:patch-lock", 1, 60)  # başka bir iş yamalıyor
+
+        self.assertFalse(percentiles.patch_department(self.department.id, {}))
+        self.assertIsNone(cache.get(key))
+
+        self.change_score(self.students[0], self.exams[0], 100)
+        cache.delete(f"{key}:patch-lock")
+        run_due_jobs([percentiles.REFRESH_PERCENTILE_TASK])
+        self.assertEqual(
+            percentiles.department_distribution(self.department.id), self.rebuilt()
+        )
+
+    def test_holder_write_after_contender_is_discarded(self):
+        percentiles.department_distribution(self.department.id)
+        key = percentiles._po_key(self.department.id)
+        holder = {self.students[1].id: {"PO1": 99.0, "PO2": 99.0}}
+        contender = {self.students[0].id: {"PO1": 1.0, "PO2": 1.0}}
+        replace = percentiles._replace
+        contended = []
+
+        def contend(*args):
+            # Sahip dağılımı okudu, yazmadı: ikinci iş kilidi alamaz
+            if not contended:
+                contended.append(
+                    percentiles.patch_department(self.department.id, contender)
+                )
+            return replace(*args)
+
+        with mock.patch.object(percentiles, "_replace", side_effect=contend):
+            patched = percentiles.patch_department(self.department.id, holder)
+
+        self.assertEqual(contended, [False])
+        self.assertFalse(patched)
+        # Sahibin yazdığı (ikinci işin yaması olmadan) önbellekte kalmaz
+        self.assertIsNone(cache.get(key))
+        self.assertIsNone(cache.get(f"{key}:patch-stale"))
+
+
+# --- ARŞİV (bkz. cold_storage.py) ---
+
+
+class ArchiveRoundTripTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.old = Semester.objects.create(name="Güz 2024", is_closed=True)
+        self.current = Semester.objects.create(name="Güz 2025")
+        self.students = make_students(3)
+        for semester in (self.old, self.current):
+            course = Course.objects.create(code="BM101", name="Giriş", semester=semester)
+            lo = LearningOutcome.objects.create(course=course, code="LO1", description="")
+            exam = Assessment.objects.create(course=course, name="Vize", weight=40)
+            AssessmentWeight.objects.create(
+                assessment=exam, learning_outcome=lo, percentage=100
+            )
+            for i, student in enumerate(self.students):
+                Enrollment.objects.create(student=student, course=course)
+                StudentScore.objects.create(student=student, assessment=exam, score=50 + i)
+
+    def rows(self, semester, using="default"):
+        """Taşınan tabloların dönemdeki satırları (updated_at dahil)."""
+        return {
+            queryset.model._meta.model_name: list(
+                queryset.order_by("pk").values_list(
+                    *[
+                        field.attname
+                        for field in queryset.model._meta.concrete_fields
+                        # Olgular geri yüklemede yeniden yazılır
+                        if field.attname != "score_updated_at"
+                    ]
+                )
+            )
+            for queryset in cold_storage._moved(using, "semester", semester.id)
+        }
+
+    def test_archive_and_restore_round_trip(self):
+        before = self.rows(self.old)
+        untouched = self.rows(self.current)
+
+        counts = cold_storage.archive_semester(self.old)
+
+        self.assertEqual(counts["studentscore"], 3)
+        self.assertTrue(cold_storage.is_archived(self.old.id))
+        self.assertEqual(
+            {name: len(rows) for name, rows in self.rows(self.old).items()},
+            dict.fromkeys(before, 0),
+        )
+        self.assertEqual(self.rows(self.old, cold_storage.ARCHIVE_DATABASE), before)
+        self.assertEqual(self.rows(self.current), untouched)
+        # Okuma şeffaf: dönem bloğunda sorgular arşive gider
+        with cold_storage.reading(self.old.id):
+            scores = StudentScore.objects.filter(
+                assessment__course__semester=self.old
+            ).order_by("score")
+            self.assertEqual([float(s.score) for s in scores], [50, 51, 52])
+
+        cold_storage.restore_semester(Semester.objects.get(pk=self.old.pk))
+
+        self.assertFalse(cold_storage.is_archived(self.old.id))
+        self.assertEqual(self.rows(self.old), before)
+        self.assertEqual(
+            {
+                name: len(rows)
+                for name, rows in self.rows(
+                    self.old, cold_storage.ARCHIVE_DATABASE
+                ).items()
+            },
+            dict.fromkeys(before, 0),
+        )
+        self.assertEqual(self.rows(self.current), untouched)
+
+    def test_aggregate_reads_archived_facts(self):
+        before = facts.aggregate([])
+        by_semester = facts.aggregate(["semester"])
+
+        cold_storage.archive_semester(self.old)
+
+        self.assertEqual(facts.aggregate([]), before)
+        self.assertEqual(facts.aggregate(["semester"]), by_semester)
+        self.assertEqual(
+            [row["average"] for row in facts.aggregate([], semester=self.old.id)],
+            [51.0],
+        )
+        self.assertEqual(before[0]["scores"], 6)
+        self.assertEqual(before[0]["students"], 3)
+
+    def test_rows_written_during_copy_are_moved(self):
+        course = Course.objects.get(semester=self.old)
+        late = make_students(1, prefix="late")[0]
+        removed = Enrollment.objects.filter(course=course).earliest("pk")
+
+        def progress(percent, message=""):
+            # Kopyalama bitti, silme başlamadı: yönetim panelinden gelen yazmalar
+            if percent == 80:
+                Enrollment.objects.create(student=late, course=course)
+                removed.delete()
+
+        cold_storage.archive_semester(self.old, progress=progress)
+
+        self.assertFalse(Enrollment.objects.filter(course=course).exists())
+        archived = Enrollment.objects.using(cold_storage.ARCHIVE_DATABASE).filter(
+            course=course
+        )
+        self.assertEqual(archived.count(), 3)
+        self.assertTrue(archived.filter(student=late).exists())
+        self.assertFalse(archived.filter(pk=removed.pk).exists())
+
+    def test_open_semester_is_not_archived(self):
+        with self.assertRaises(ValueError):
+            cold_storage.archive_semester(self.current)
+
+
+# --- KAPATILMIŞ DÖNEM (salt okunur) ---
+
+
+class ClosedSemesterWriteTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.semester = Semester.objects.create(name="Güz", is_closed=True)
+        self.course = Course.objects.create(
+            code="BM101", name="Giriş", semester=self.semester
+        )
+        self.lo = LearningOutcome.objects.create(
+            course=self.course, code="LO1", description=""
+        )
+        self.exam = Assessment.objects.create(course=self.course, name="Vize", weight=40)
+        self.student = make_students(1)[0]
+        self.client.force_login(User.objects.create_superuser("admin"))
+
+    def test_course_dashboard_refuses_new_assessment(self):
+        response = self.client.post(
+            reverse("course_dashboard", args=[self.course.id]),
+            {
+                "assessment_submit": "1",
+                "course": self.course.id,
+                "name": "Final",
+                "weight": 60,
+            },
+        )
+        self.assertRedirects(
+            response,
+            reverse("course_dashboard", args=[self.course.id]),
+            fetch_redirect_response=False,
+        )
+        self.assertFalse(Assessment.objects.filter(name="Final").exists())
+
+    def test_course_students_refuses_enrollment(self):
+        self.client.post(
+            reverse("course_students", args=[self.course.id]),
+            {"student": self.student.id},
+        )
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_assessment_detail_refuses_weight(self):
+        self.client.post(
+            reverse("assessment_detail", args=[self.exam.id]),
+            {"learning_outcome": self.lo.id, "percentage": 100},
+        )
+        self.assertFalse(AssessmentWeight.objects.exists())
+
+    def test_lo_mapping_is_frozen(self):
+        po = ProgramOutcome.objects.create(code="PO1", description="Analiz")
+        self.client.post(
+            reverse("lo_mapping_detail", args=[self.lo.id]),
+            {"program_outcome": po.id, "weight": "0.50"},
+        )
+        self.assertFalse(OutcomeMapping.objects.exists())
+
+        mapping = OutcomeMapping.objects.create(
+            learning_outcome=self.lo, program_outcome=po, weight="1.00"
+        )
+        self.client.post(reverse("delete_outcome_mapping", args=[mapping.id]))
+        self.assertTrue(OutcomeMapping.objects.filter(pk=mapping.pk).exists())
+
+    def test_open_semester_accepts_writes(self):
+        Semester.objects.filter(pk=self.semester.pk).update(is_closed=False)
+        Semester.objects.get(pk=self.semester.pk).save()  # dönem listesi önbelleği
+        self.client.post(
+            reverse("course_students", args=[self.course.id]),
+            {"student": self.student.id},
+        )
+        self.assertTrue(Enrollment.objects.filter(course=self.course).exists())
+
+
+# --- PARÇALI SİLME (bkz. deletion.py) ---
+
+
+class ChunkedDeleteTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.semester = Semester.objects.create(name="Güz")
+        self.students = make_students(5)
+        self.course, self.other = [
+            Course.objects.create(code=code, name=code, semester=self.semester)
+            for code in ("BM101", "BM102")
+        ]
+        for course in (self.course, self.other):
+            lo = LearningOutcome.objects.create(course=course, code="LO1", description="")
+            for name in ("Vize", "Final"):
+                exam = Assessment.objects.create(course=course, name=name, weight=50)
+                AssessmentWeight.objects.create(
+                    assessment=exam, learning_outcome=lo, percentage=100
+                )
+                for student in self.students:
+                    StudentScore.objects.create(student=student, assessment=exam, score=70)
+            for student in self.students:
+                Enrollment.objects.create(student=student, course=course)
+
+    def test_deletes_subtree_in_chunks(self):
+        steps = []
+        counts = deletion.delete(
+            "course",
+            self.course.id,
+            chunk_size=3,
+            progress=lambda percent, message="": steps.append(percent),
+        )
+
+        self.assertFalse(Course.objects.filter(pk=self.course.pk).exists())
+        self.assertEqual(counts["studentscore"], 10)
+        self.assertEqual(counts["scorefact"], 10)
+        self.assertEqual(counts["enrollment"], 5)
+        # 10 not / 3 = 4 parça; her parçada ilerleme bildirilir
+        self.assertGreater(len(steps), 10)
+        self.assertEqual(steps, sorted(steps))
+        self.assertEqual(steps[-1], 100)
+        # Diğer ders olduğu gibi
+        self.assertEqual(
+            StudentScore.objects.filter(assessment__course=self.other).count(), 10
+        )
+        self.assertEqual(ScoreFact.objects.count(), 10)
+        self.assertEqual(Enrollment.objects.count(), 5)
+
+    def test_rows_written_between_chunks_are_deleted_with_root(self):
+        written = []
+
+        def progress(percent, message=""):
+            # Sınavların adımı bitti, kayıtlar silinirken derse yeni bir sınav ve not gelir
+            if str(Enrollment._meta.verbose_name_plural) in message and not written:
+                exam = Assessment.objects.create(course=self.course, name="Büt", weight=10)
+                written.append(
+                    StudentScore.objects.create(
+                        student=self.students[0], assessment=exam, score=40
+                    )
+                )
+
+        counts = deletion.delete(
+            "course", self.course.id, chunk_size=3, progress=progress
+        )
+
+        self.assertTrue(written)
+        self.assertFalse(Course.objects.filter(pk=self.course.pk).exists())
+        self.assertFalse(Assessment.objects.filter(name="Büt").exists())
+        self.assertEqual(counts["assessment"], 3)
+        self.assertEqual(counts["studentscore"], 11)
+
+    def test_semester_delete_job(self):
+        job = deletion.request_delete(self.semester)
+        self.assertIsNone(deletion.request_delete(self.semester))  # zaten sırada
+        self.assertTrue(deletion.is_deleting(self.course.id, self.semester.id))
+
+        run_due_jobs([deletion.DELETE_TASK])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertFalse(Semester.objects.exists())
+        self.assertFalse(StudentScore.objects.exists())
+        self.assertFalse(ScoreFact.objects.exists())
+        self.assertFalse(deletion.is_deleting(self.course.id, self.semester.id))
+
+    def test_writes_are_refused_while_deleting(self):
+        self.client.force_login(User.objects.create_superuser("admin"))
+        student = make_students(1, prefix="new")[0]
+        deletion.request_delete(self.course)
+
+        self.client.post(
+            reverse("course_students", args=[self.course.id]), {"student": student.id}
+        )
+        self.assertFalse(Enrollment.objects.filter(student=student).exists())
+        # Silinmeyen ders etkilenmez
+        self.client.post(
+            reverse("course_students", args=[self.other.id]), {"student": student.id}
+        )
+        self.assertTrue(Enrollment.objects.filter(student=student).exists())
+
+
+# --- REST API (bkz. api.py) ---
+
+
+class StudentDashboardAPITests(TestCase):
+    databases = "__all__"
+    url = "/api/v1/student/dashboard/"
+
+    def setUp(self):
+        cache.clear()
+        self.semester = Semester.objects.create(name="Güz")
+        self.department = Department.objects.create(name="Bilgisayar")
+        po = ProgramOutcome.objects.create(code="PO1", description="Analiz")
+        self.students = make_students(6, department=self.department)
+        self.student = self.students[0]
+        for n in range(3):
+            self.add_course(f"BM10{n}", po)
+        run_due_jobs()
+
+    def add_course(self, code, po):
+        course = Course.objects.create(code=code, name=code, semester=self.semester)
+        lo = LearningOutcome.objects.create(course=course, code="LO1", description="")
+        OutcomeMapping.objects.create(
+            learning_outcome=lo, program_outcome=po, weight="1.00"
+        )
+        exam = Assessment.objects.create(course=course, name="Vize", weight=100)
+        AssessmentWeight.objects.create(
+            assessment=exam, learning_outcome=lo, percentage=100
+        )
+        for i, student in enumerate(self.students):
+            Enrollment.objects.create(student=student, course=course)
+            StudentScore.objects.create(
+                student=student, assessment=exam, score=50 + 5 * i
+            )
+        return course
+
+    def get(self, **extra):
+        return self.client.get(self.url, **extra)
+
+    def test_full_payload(self):
+        self.client.force_login(self.student.user)
+        data = self.get().json()
+
+        self.assertEqual(set(data), set(SECTIONS))
+        self.assertEqual(
+            [course["code"] for course in data["courses"]], ["BM100", "BM101", "BM102"]
+        )
+        self.assertEqual(data["courses"][0]["average"], 50.0)
+        self.assertEqual(data["courses"][0]["percentile"], 8)
+        self.assertEqual(data["po_radar"]["labels"], ["PO1"])
+
+    def test_sparse_fields(self):
+        self.client.force_login(self.student.user)
+        data = self.get(
+            QUERY_STRING="fields=courses,po_radar&fields[courses]=code,average"
+        ).json()
+
+        self.assertEqual(set(data), {"courses", "po_radar"})
+        self.assertEqual(data["courses"][0], {"code": "BM100", "average": 50.0})
+
+        response = self.get(QUERY_STRING="fields=unknown")
+        self.assertEqual(response.status_code, 400)
+        response = self.get(QUERY_STRING="fields[courses]=nope")
+        self.assertEqual(response.status_code, 400)
+
+    def test_etag_returns_304_until_data_changes(self):
+        self.client.force_login(self.student.user)
+        first = self.get()
+        etag = first["ETag"]
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        StudentScore.objects.filter(student=self.student).update(score=90)
+        StudentScore.objects.filter(student=self.student).first().save()
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_teacher_is_forbidden(self):
+        self.client.force_login(User.objects.create_user("hoca"))
+        self.assertEqual(self.get().status_code, 403)
+        self.client.logout()
+        self.assertIn(self.get().status_code, (401, 403))
+
+    def assertQueryBudget(self, default, cache_queries, **extra):
+        with self.assertNumQueries(default), self.assertNumQueries(
+            cache_queries, using="cache"
+        ):
+            self.assertEqual(self.get(**extra).status_code, 200)
+
+    def test_query_budget_is_independent_of_course_count(self):
+        """README'deki bütçe: sıcak önbellekte 3 sorgu + 16 önbellek okuması (oturum)."""
+        self.client.force_login(self.student.user)
+        self.get()  # önbelleği ısıt
+        self.assertQueryBudget(3, 16)
+
+        po = ProgramOutcome.objects.get()
+        for n in range(3, 7):
+            self.add_course(f"BM10{n}", po)
+        run_due_jobs()
+        self.get()
+        self.assertQueryBudget(3, 16)
+
+    def test_query_budget_with_token(self):
+        token = Token.objects.create(user=self.student.user)
+        auth = {"HTTP_AUTHORIZATION": f"Token {token.key}"}
+        self.get(**auth)
+        self.assertQueryBudget(4, 14, **auth)
+
+    def test_unrequested_sections_do_not_query(self):
+        self.client.force_login(self.student.user)
+        self.get()
+        # Sadece öğrenci satırı; kayıt ve not sorguları atılmaz
+        self.assertQueryBudget(1, 11, QUERY_STRING="fields=po_radar")
+
+
+# --- AĞIRLIK SİMÜLATÖRÜ ---
+
+
+class WeightSimulatorTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.department = Department.objects.create(name="Bilgisayar")
+        self.client.force_login(User.objects.create_superuser("admin"))
+
+    def test_invalid_ids_are_ignored(self):
+        url = reverse("weight_simulator") + "?department=abc&course=1x"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["department_id"], "")
+        self.assertEqual(response.context["course_id"], "")
+        self.assertEqual(self.client.post(url).status_code, 200)
+
+    def test_valid_department_is_selected(self):
+        response = self.client.get(
+            reverse("weight_simulator"), {"department": self.department.id}
+        )
+        self.assertEqual(response.context["department_id"], str(self.department.id))
+
+    def test_before_distribution_is_cached(self):
+        semester = Semester.objects.create(name="Güz")
+        course = Course.objects.create(code="BM101", name="Giriş", semester=semester)
+        lo = LearningOutcome.objects.create(course=course, code="LO1", description="")
+        po = ProgramOutcome.objects.create(code="PO1", description="")
+        OutcomeMapping.objects.create(learning_outcome=lo, program_outcome=po, weight=1)
+        exam = Assessment.objects.create(course=course, name="Vize", weight=40)
+        weight = AssessmentWeight.objects.create(
+            assessment=exam, learning_outcome=lo, percentage=100
+        )
+        for i, student in enumerate(make_students(2, department=self.department)):
+            Enrollment.objects.create(student=student, course=course)
+            StudentScore.objects.create(student=student, assessment=exam, score=40 + 20 * i)
+        url = reverse("weight_simulator") + f"?department={self.department.id}"
+
+        with mock.patch.object(
+            simulation, "distributions", wraps=simulation.distributions
+        ) as distributions:
+            self.client.post(url, {f"aw-{weight.id}": "50"})
+            results = self.client.post(url, {f"aw-{weight.id}": "80"}).context["results"]
+            # İlk istek önce + sonra, ikincisi yalnızca sonra
+            self.assertEqual(distributions.call_count, 3)
+            self.assertEqual(results[0]["before"]["mean"], 50.0)
+
+            # Not değişince (sinyal) önbellekteki "önce" geçersizlenir
+            score = StudentScore.objects.get(score=40)
+            score.score = 60
+            score.save()
+            results = self.client.post(url, {f"aw-{weight.id}": "80"}).context["results"]
+            self.assertEqual(distributions.call_count, 5)
+            self.assertEqual(results[0]["before"]["mean"], 60.0)
+
+
+# --- İSTEK PROFİLLEYİCİ (bkz. profiling.py) ---
+
+
+class ProfilerTests(TestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin"))
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings_override = override_settings(PROFILER_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_busy_profiler_runs_view_unprofiled(self):
+        url = reverse("profile_list") + "?_profile=1"
+        self.assertIn("X-Profile-Id", self.client.get(url))
+
+        with profiling._PROFILE_LOCK:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertIn(
+            "profilsiz", " ".join(str(m) for m in get_messages(response.wsgi_request))
+        )
+        # Kilit bırakıldı; sonraki istek yine profillenir
+        self.assertIn("X-Profile-Id", self.client.get(url))
@@ -0,0 +1,161 @@
+"""
+Dönemler arası PO başarım eğilimi.
+
+Her dönem için öğrenci başına PO başarımı (kazanılan / mümkün katkı, bkz. simulation.Cohort)
+ve bölüm başına öğrenci başarımlarının ortalaması POTrendPoint tablosuna yazılır.
+Kapatılmış dönemler arşivdeki toplamlardan (ArchivedPOAttainment), açık dönemler canlı
+verilerden hesaplanır.
+
+Hesap artımlıdır: bir dönemin notu, kaydı veya müfredatı değişince sadece o dönem için bir
+yenileme işi sıraya girer (bkz. signals.py) ve o dönemin satırları yeniden yazılır; diğer
+dönemlere dokunulmaz. Grafikler seriyi tek sorguyla okur.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+
+from .jobs import enqueue
+from .models import (
+    ArchivedPOAttainment,
+    Course,
+    Job,
+    POTrendPoint,
+    Semester,
+    Student,
+)
+from .simulation import Cohort
+
+REFRESH_TREND_TASK = "refresh_po_trends"
+
+# Not girişi sırasında gelen değişiklikler tek işte toplansın diye kısa bir bekleme
+REFRESH_DELAY = timedelta(seconds=60)
+
+BULK_BATCH_SIZE = 2000
+
+
+def request_refresh(semester_id):
+    """Dönemin eğilim noktalarını yenileme işini sıraya koyar; zaten sıradaysa koymaz."""
+    if Job.objects.filter(
+        task=REFRESH_TREND_TASK,
+        status=Job.STATUS_PENDING,
+        payload__semester_id=semester_id,
+    ).exists():
+        return False
+    enqueue(REFRESH_TREND_TASK, {"semester_id": semester_id}, delay=REFRESH_DELAY)
+    return True
+
+
+# --- HESAP ---
+
+
+def _student_totals(semester):
+    """[(öğrenci id, PO kodu, kazanılan, mümkün)] — mümkün > 0 olanlar."""
+    if semester.is_closed:
+        return list(
+            ArchivedPOAttainment.objects.filter(
+                semester=semester, possible__gt=0
+            ).values_list("student_id", "po_code", "earned", "possible")
+        )
+    courses = Course.objects.filter(semester=semester)
+    students = Student.objects.filter(enrollment__course__in=courses).distinct()
+    cohort = Cohort(students, courses=courses)
+    earned, possible = cohort.po_totals()
+    return [
+        (
+            int(cohort.student_ids[s]),
+            cohort.po_codes[p],
+            float(earned[s, p]),
+            float(possible[s, p]),
+        )
+        for s, p in zip(*np.nonzero(possible > 0))
+    ]
+
+
+def compute_points(semester):
+    """Dönem için (kaydedilmemiş) öğrenci ve bölüm POTrendPoint nesneleri."""
+    totals = _student_totals(semester)
+    departments = dict(
+        Student.objects.filter(
+            id__in={student_id for student_id, _code, _e, _p in totals},
+            department__isnull=False,
+        ).values_list("id", "department_id")
+    )
+
+    points, department_rates = [], defaultdict(list)
+    for student_id, code, earned, possible in totals:
+        rate = earned / possible * 100
+        points.append(
+            POTrendPoint(
+                semester=semester,
+                student_id=student_id,
+                po_code=code,
+                rate=round(rate, 2),
+            )
+        )
+        if student_id in departments:
+            department_rates[departments[student_id], code].append(rate)
+
+    for (department_id, code), rates in department_rates.items():
+        points.append(
+            POTrendPoint(
+                semester=semester,
+                department_id=department_id,
+                po_code=code,
+                rate=round(sum(rates) / len(rates), 2),
+                students=len(rates),
+            )
+        )
+    return points
+
+
+def refresh_semester(semester):
+    """Sadece bu dönemin noktalarını yeniden yazar; yazılan satır sayısını döner."""
+    points = compute_points(semester)
+    with transaction.atomic():
+        POTrendPoint.objects.filter(semester=semester).delete()
+        POTrendPoint.objects.bulk_create(points, batch_size=BULK_BATCH_SIZE)
+    return len(points)
+
+
+def refresh_all(progress=None):
+    """Tüm dönemler (ilk kurulum veya PO kodu değişikliği sonrası)."""
+    progress = progress or (lambda percent, message="": None)
+    semesters = list(Semester.objects.order_by("id"))
+    total = 0
+    for i, semester in enumerate(semesters):
+        progress(int(100 * i / len(semesters)), semester.name)
+        total += refresh_semester(semester)
+    progress(100, "Tamamlandı")
+    return {"semesters": len(semesters), "points": total}
+
+
+# --- SERİLER ---
+
+
+def _series(points):
+    """Çizgi grafiği verisi: {"labels": [dönem adları], "datasets": [{label, data}]}."""
+    rows = list(
+        points.order_by("semester_id", "po_code").values_list(
+            "semester_id", "semester__name", "po_code", "rate"
+        )
+    )
+    semesters = list(dict.fromkeys((semester_id, name) for semester_id, name, _c, _r in rows))
+    position = {semester_id: i for i, (semester_id, _name) in enumerate(semesters)}
+    data = {}
+    for semester_id, _name, code, rate in rows:
+        data.setdefault(code, [None] * len(semesters))[position[semester_id]] = rate
+    return {
+        "labels": [name for _semester_id, name in semesters],
+        "datasets": [{"label": code, "data": values} for code, values in sorted(data.items())],
+    }
+
+
+def student_series(student):
+    return _series(POTrendPoint.objects.filter(student=student))
+
+
+def department_series(department):
+    return _series(POTrendPoint.objects.filter(department=department))
@@ -1,5 +1,16 @@
-import json
-from django.shortcuts import render, redirect, get_object_or_404
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import logout
 from django.db.models import Avg, Max, Count
@@ -7,19 +18,51 @@ from django.contrib import messages
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.views import LoginView
+from django.utils.http import url_has_allowed_host_and_scheme
 
 from .models import (
     Course,
     LearningOutcome,
     Assessment,
     AssessmentWeight,
+    Job,
     ProgramOutcome,
     Student,
     StudentScore,
     OutcomeMapping,
     Enrollment,
     Semester,
+    Department,
+    ArchivedLOAttainment,
+    RiskFlag,
+)
+from .caching import (
+    LANDING_PAGE_CACHE_KEY,
+    LANDING_PAGE_CACHE_TIMEOUT,
+    ROLE_DEPARTMENT_HEAD,
+    ROLE_TEACHER,
+    get_or_compute,
+    get_user_role,
 )
+from .attainment import score_color, student_po_report
+from .concurrency import run_concurrently
+from .curriculum import get_course_graph
+from .item_analysis import course_item_analysis
+from .percentiles import course_percentile, student_po_percentiles
+from .reports import department_po_heatmap
+from .semesters import get_active_semester, semester_choices, set_active_semester
+from .trends import department_series, student_series
+from . import archive, cold_storage, deletion, rankings
+from .simulation import (
+    MAX_ASSESSMENT_PERCENTAGE,
+    MAX_MAPPING_WEIGHT,
+    Cohort,
+    baseline,
+    parse_overrides,
+    simulate,
+)
+from .notifications import publish_assessment as publish_assessment_results
+from .profiling import list_summaries, load_summary, profile_paths
 from .forms import (
     LearningOutcomeForm,
     AssessmentForm,
@@ -36,68 +79,138 @@ from .forms import (
 # --- YETKİ KONTROLLERİ ---
 
 
+# Roller grup sorgusuyla değil, kullanıcıyla önbelleğe alınan rol üzerinden kontrol edilir
+# (bkz. caching.get_user_role, auth.CachedModelBackend)
+
+
 def is_teacher(user):
-    # Hem "Öğretmen" hem de "Bölüm Başkanı" öğretmen paneline girebilir
-    return (
-        user.groups.filter(name__in=["Öğretmen", "Bölüm Başkanı"]).exists()
-        or user.is_superuser
-    )
+    # Hem "Öğretmen" hem de "Bölüm Başkanı" (veya Superuser) öğretmen paneline girebilir
+    return get_user_role(user) in (ROLE_TEACHER, ROLE_DEPARTMENT_HEAD)
 
 
 def is_department_head(user):
     # Sadece Bölüm Başkanı (veya Superuser) girebilir
-    return user.groups.filter(name="Bölüm Başkanı").exists() or user.is_superuser
+    return get_user_role(user) == ROLE_DEPARTMENT_HEAD
+
+
+def is_staff(user):
+    # Profil (performans) raporları sadece personel hesaplarına açık
+    return user.is_staff
+
+
+# --- ARŞİVLENMİŞ DÖNEMLER (bkz. cold_storage.py) ---
+
+
+def _reads_active_semester(view):
+    """Aktif dönem arşivlenmişse view'ın dönem sorguları arşiv veritabanından okunur."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        semester = get_active_semester(request)
+        with cold_storage.reading(semester.id if semester else None):
+            return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def _archived_read_only(request, semester_id):
+    """Arşivlenmiş dönemde değişiklik yapılmaz; POST ise mesaj bırakır ve True döner."""
+    if request.method == "POST" and cold_storage.is_archived(semester_id):
+        messages.error(
+            request, "Bu dönem arşivlendi; değişiklik için önce arşivden geri alınmalı."
+        )
+        return True
+    return False
+
+
+def _closed_read_only(request, semester_id):
+    """
+    Kapatılmış dönemin başarımları dondurulmuştur (bkz. archive.py); dersin LO, sınav,
+    kayıt ve ağırlıkları değiştirilmez. POST ise mesaj bırakır ve True döner.
+    """
+    if request.method != "POST":
+        return False
+    if _archived_read_only(request, semester_id):
+        return True
+    # Ortak önbellekteki dönem listesinden (sorgusuz)
+    if any(s.id == semester_id and s.is_closed for s in semester_choices()):
+        messages.error(
+            request, "Bu dönem kapatıldı; değişiklik için dönem yeniden açılmalı."
+        )
+        return True
+    return False
+
+
+def _deleting_read_only(request, course_id, semester_id):
+    """Silinmekte olan ders/dönemde (bkz. deletion.py) yazma yapılmaz; POST ise True döner."""
+    if request.method == "POST" and deletion.is_deleting(course_id, semester_id):
+        messages.error(request, "Bu ders siliniyor; değişiklik yapılamaz.")
+        return True
+    return False
 
 
 # --- 1. ANA PANEL (GENEL BAKIŞ) ---
+# Panel sayfaları async: birbirinden bağımsız sayım ve ortalamalar aynı anda çalışır
+# (bkz. concurrency.py). WSGI altında da çalışırlar; kazanç ASGI altında belirgindir.
 @login_required
 @user_passes_test(is_teacher)
-def teacher_dashboard_home(request):
+async def teacher_dashboard_home(request):
+    user = await request.auser()
+    # Sadece aktif dönemin dersleri (bkz. semesters.py)
+    semester = await sync_to_async(get_active_semester)(request)
+    semester_courses = Course.objects.filter(semester=semester)
     # Eğer Bölüm Başkanı ise TÜM dersleri görsün, değilse sadece kendi dersleri
-    if is_department_head(request.user):
-        my_courses = Course.objects.all()
+    if await sync_to_async(is_department_head)(user):
+        my_courses = semester_courses
     else:
-        my_courses = Course.objects.filter(teacher=request.user)
-        if not my_courses.exists() and request.user.is_superuser:
-            my_courses = Course.objects.all()
-
-    total_courses = my_courses.count()
-
-    # --- DÜZELTME YAPILDI: ARTIK TEKİL ÖĞRENCİLERİ SAYIYOR ---
-    total_students = (
-        Enrollment.objects.filter(course__in=my_courses)
-        .values("student")  # Sadece öğrenci ID'lerini al
-        .distinct()  # Aynı ID'yi birden fazla sayma
-        .count()
-    )
-    # ---------------------------------------------------------
-
-    total_exams = Assessment.objects.filter(course__in=my_courses).count()
-    recent_exams = Assessment.objects.filter(course__in=my_courses).order_by("-date")[
-        :5
-    ]
+        my_courses = semester_courses.filter(teacher=user)
+        if user.is_superuser and not await my_courses.aexists():
+            my_courses = semester_courses
+
+    # Arşivlenmiş dönemin sınav ve kayıtları arşiv veritabanında (bkz. cold_storage.py)
+    async with cold_storage.areading(semester.id if semester else None):
+        courses, total_students, total_exams, recent_exams = await run_concurrently(
+            # Kart başına LO/sınav sayısı tek sorguda
+            lambda: list(
+                my_courses.select_related("semester").annotate(
+                    lo_count=Count("learningoutcome", distinct=True),
+                    exam_count=Count("assessment", distinct=True),
+                )
+            ),
+            # Tekil öğrenci sayısı
+            lambda: Enrollment.objects.filter(course__in=my_courses)
+            .values("student")
+            .distinct()
+            .count(),
+            lambda: Assessment.objects.filter(course__in=my_courses).count(),
+            lambda: list(
+                Assessment.objects.filter(course__in=my_courses)
+                .select_related("course")
+                .order_by("-date")[:5]
+            ),
+        )
 
     context = {
-        "courses": my_courses,
+        "courses": courses,
         "stats": {
-            "total_courses": total_courses,
+            "total_courses": len(courses),
             "total_students": total_students,
             "total_exams": total_exams,
         },
         "recent_exams": recent_exams,
     }
-    return render(request, "dashboard_home.html", context)
+    return await sync_to_async(render)(request, "dashboard_home.html", context)
 
 
 # --- 2. DERS LİSTESİ ---
 @login_required
 @user_passes_test(is_teacher)
+@_reads_active_semester
 def teacher_courses(request):
-    # 1. Hangi dersleri göstereceğimizi belirle
-    if is_department_head(request.user):
-        my_courses = Course.objects.all()
-    else:
-        my_courses = Course.objects.filter(teacher=request.user)
+    # 1. Hangi dersleri göstereceğimizi belirle (aktif dönem)
+    my_courses = Course.objects.filter(semester=get_active_semester(request))
+    if not is_department_head(request.user):
+        my_courses = my_courses.filter(teacher=request.user)
 
     # 2. İSTATİSTİKLERİ HESAPLA
     total_courses = my_courses.count()
@@ -114,7 +227,11 @@ def teacher_courses(request):
     total_exams = Assessment.objects.filter(course__in=my_courses).count()
 
     context = {
-        "courses": my_courses,
+        # Kart başına LO/öğrenci sayısı tek sorguda
+        "courses": my_courses.select_related("semester").annotate(
+            lo_count=Count("learningoutcome", distinct=True),
+            student_count=Count("enrollment", distinct=True),
+        ),
         "stats": {
             "total_courses": total_courses,
             "total_students": total_students,
@@ -125,19 +242,8 @@ def teacher_courses(request):
 
 
 # --- 3. DERS DASHBOARD (GRAFİKLİ) ---
-@login_required
-@user_passes_test(is_teacher)
-def course_dashboard(request, course_id):
-    course = get_object_or_404(Course, id=course_id)
-
-    # Güvenlik: Başka hocanın dersine girmeye çalışırsa engelle (Bölüm Başkanı hariç)
-    if (
-        not is_department_head(request.user)
-        and course.teacher != request.user
-        and not request.user.is_superuser
-    ):
-        return redirect("teacher_dashboard_home")
-
+def _course_dashboard_forms(request, course):
+    """(lo_form, assessment_form, yönlendirme); kayıt başarılıysa yönlendirme döner."""
     lo_form = LearningOutcomeForm(initial={"course": course})
     assessment_form = AssessmentForm(initial={"course": course})
 
@@ -148,89 +254,120 @@ def course_dashboard(request, course_id):
                 new_lo = lo_form.save(commit=False)
                 new_lo.course = course
                 new_lo.save()
-                return redirect("course_dashboard", course_id=course.id)
+                return lo_form, assessment_form, redirect(
+                    "course_dashboard", course_id=course.id
+                )
         elif "assessment_submit" in request.POST:
             assessment_form = AssessmentForm(request.POST)
             if assessment_form.is_valid():
                 new_exam = assessment_form.save(commit=False)
                 new_exam.course = course
                 new_exam.save()
-                return redirect("course_dashboard", course_id=course.id)
+                return lo_form, assessment_form, redirect(
+                    "course_dashboard", course_id=course.id
+                )
+    return lo_form, assessment_form, None
 
-    outcomes = LearningOutcome.objects.filter(course=course)
-    assessments = Assessment.objects.filter(course=course).order_by("-date")
 
-    # İstatistikler
-    course_average = (
-        StudentScore.objects.filter(assessment__course=course).aggregate(Avg("score"))[
-            "score__avg"
-        ]
-        or 0
-    )
-    max_score = (
-        StudentScore.objects.filter(assessment__course=course).aggregate(Max("score"))[
-            "score__max"
-        ]
-        or 0
-    )
-    total_students = Enrollment.objects.filter(course=course).count()
+@login_required
+@user_passes_test(is_teacher)
+async def course_dashboard(request, course_id):
+    user = await request.auser()
+    course = await aget_object_or_404(Course, id=course_id)
+    department_head = await sync_to_async(is_department_head)(user)
 
-    # Grafik Verileri
-    all_courses = (
-        Course.objects.all()
-        if is_department_head(request.user)
-        else Course.objects.filter(teacher=request.user)
-    )
+    # Güvenlik: Başka hocanın dersine girmeye çalışırsa engelle (Bölüm Başkanı hariç)
+    if not department_head and course.teacher_id != user.id and not user.is_superuser:
+        return redirect("teacher_dashboard_home")
+    if await sync_to_async(_closed_read_only)(request, course.semester_id):
+        return redirect("course_dashboard", course_id=course.id)
+    if await sync_to_async(_deleting_read_only)(request, course.id, course.semester_id):
+        return redirect("course_dashboard", course_id=course.id)
 
-    course_labels = []
-    course_data = []
-    for c in all_courses:
-        avg = (
-            StudentScore.objects.filter(assessment__course=c).aggregate(Avg("score"))[
-                "score__avg"
-            ]
-            or 0
-        )
-        course_labels.append(c.code)
-        course_data.append(float(round(avg, 1)))
-
-    exam_labels = []
-    exam_data = []
-    for exam in assessments.reverse():
-        avg = (
-            StudentScore.objects.filter(assessment=exam).aggregate(Avg("score"))[
-                "score__avg"
-            ]
-            or 0
-        )
-        exam_labels.append(exam.name)
-        exam_data.append(float(round(avg, 1)))
-
-    recent_exam = assessments.first()
-    risky_students = (
-        StudentScore.objects.filter(assessment=recent_exam, score__lt=50)
-        if recent_exam
-        else []
+    lo_form, assessment_form, response = await sync_to_async(_course_dashboard_forms)(
+        request, course
     )
-
-    context = {
-        "active_course": course,
-        "lo_form": lo_form,
-        "assessment_form": assessment_form,
-        "outcomes": outcomes,
-        "assessments": assessments,
-        "stats": {
-            "average": round(course_average, 1),
-            "max": max_score,
-            "students": total_students,
-        },
-        "graph_comparison_labels": json.dumps(course_labels),
-        "graph_comparison_data": json.dumps(course_data),
-        "graph_exams_labels": json.dumps(exam_labels),
-        "graph_exams_data": json.dumps(exam_data),
-        "risky_students": risky_students,
-    }
-    return render(request, "teacher_dashboard.html", context)
+    if response is not None:
+        return response
+
+    # Arşivlenmiş dönemin sınav ve notları arşiv veritabanında (bkz. cold_storage.py)
+    async with cold_storage.areading(course.semester_id):
+        course_scores = StudentScore.objects.filter(assessment__course=course)
+        # Grafik Verileri: dersin kendi dönemindeki derslerle karşılaştırma
+        all_courses = Course.objects.filter(semester_id=course.semester_id)
+        if not department_head:
+            all_courses = all_courses.filter(teacher=user)
+
+        # Birbirinden bağımsız toplamlar aynı anda; ders ve sınav ortalamaları
+        # ders/sınav başına ayrı sorgu yerine tek GROUP BY ile
+        (
+            stats,
+            total_students,
+            course_codes,
+            course_averages,
+            assessments,
+            exam_averages,
+            risky_students,
+        ) = await run_concurrently(
+            lambda: course_scores.aggregate(average=Avg("score"), max=Max("score")),
+            lambda: Enrollment.objects.filter(course=course).count(),
+            lambda: list(all_courses.order_by("id").values_list("id", "code")),
+            lambda: dict(
+                StudentScore.objects.filter(assessment__course__in=all_courses)
+                .values("assessment__course")
+                .annotate(avg=Avg("score"))
+                .values_list("assessment__course", "avg")
+            ),
+            lambda: list(
+                Assessment.objects.filter(course=course).order_by("-date", "-id")
+            ),
+            lambda: dict(
+                course_scores.values("assessment")
+                .annotate(avg=Avg("score"))
+                .values_list("assessment", "avg")
+            ),
+            # Erken uyarı listesi arka planda hesaplanır (bkz. early_warning.py)
+            lambda: list(
+                RiskFlag.objects.filter(course=course)
+                .select_related("student")
+                .order_by("projected_average")
+            ),
+        )
+        outcomes = LearningOutcome.objects.filter(course=course)
+        course_average = stats["average"] or 0
+        max_score = stats["max"] or 0
+
+        course_labels = []
+        course_data = []
+        for c_id, code in course_codes:
+            course_labels.append(code)
+            course_data.append(float(round(course_averages.get(c_id) or 0, 1)))
+
+        exam_labels = []
+        exam_data = []
+        for exam in reversed(assessments):
+            exam_labels.append(exam.name)
+            exam_data.append(float(round(exam_averages.get(exam.id) or 0, 1)))
+
+        context = {
+            "active_course": course,
+            "lo_form": lo_form,
+            "assessment_form": assessment_form,
+            "outcomes": outcomes,
+            "assessments": assessments,
+            "stats": {
+                "average": round(course_average, 1),
+                "max": max_score,
+                "students": total_students,
+            },
+            "graph_comparison_labels": course_labels,
+            "graph_comparison_data": course_data,
+            "graph_exams_labels": exam_labels,
+            "graph_exams_data": exam_data,
+            "risky_students": risky_students,
+        }
+    # Formların ders/LO seçenekleri sıcak veritabanından
+    return await sync_to_async(render)(request, "teacher_dashboard.html", context)
 
 
 # --- BÖLÜM BAŞKANI YÖNETİM FONKSİYONLARI (YENİ) ---
@@ -283,8 +420,12 @@ def delete_student(request, student_id):
 # B. DERS YÖNETİMİ
 @login_required
 @user_passes_test(is_department_head)
+@_reads_active_semester
 def manage_courses(request):
-    courses = Course.objects.all().select_related("teacher", "semester")
+    courses = Course.objects.filter(
+        semester=get_active_semester(request)
+    ).select_related("teacher", "semester")
+    delete_jobs = deletion.pending_jobs("course")
 
     # --- EKLENEN KISIM: İSTATİSTİKLER ---
     # 1. Toplam Ders Sayısı
@@ -301,6 +442,10 @@ def manage_courses(request):
     # 3. Toplam Sınav Sayısı
     total_exams = Assessment.objects.filter(course__in=courses).count()
 
+    courses = list(courses)
+    for course in courses:
+        course.delete_job = delete_jobs.get(course.id)
+
     context = {
         "courses": courses,
         "stats": {
@@ -331,8 +476,11 @@ def add_course(request):
 def delete_course(request, course_id):
     course = get_object_or_404(Course, id=course_id)
     if request.method == "POST":
-        course.delete()
-        messages.success(request, "Ders silindi.")
+        # Sınav/not/kayıtlarıyla birlikte arka planda, parça parça (bkz. deletion.py)
+        if deletion.request_delete(course, user=request.user):
+            messages.success(request, f"{course.code} arka planda siliniyor.")
+        else:
+            messages.info(request, f"{course.code} zaten siliniyor.")
     return redirect("manage_courses")
 
 
@@ -340,8 +488,16 @@ def delete_course(request, course_id):
 @login_required
 @user_passes_test(is_department_head)
 def manage_semesters(request):
-    semesters = Semester.objects.all().order_by("name")
-    return render(request, "manage_semesters.html", {"semesters": semesters})
+    semesters = list(Semester.objects.all().order_by("name"))
+    # Silinmekte olan dönemlerde silme işinin ilerlemesi gösterilir
+    delete_jobs = deletion.pending_jobs("semester")
+    for semester in semesters:
+        semester.delete_job = delete_jobs.get(semester.id)
+    return render(
+        request,
+        "manage_semesters.html",
+        {"semesters": semesters, "closing_ids": archive.closing_semester_ids()},
+    )
 
 
 @login_required
@@ -363,8 +519,44 @@ def add_semester(request):
 def delete_semester(request, semester_id):
     semester = get_object_or_404(Semester, id=semester_id)
     if request.method == "POST":
-        semester.delete()
-        messages.success(request, "Dönem silindi.")
+        # Dersleri ve bütün notlarıyla birlikte arka planda (bkz. deletion.py)
+        if deletion.request_delete(semester, user=request.user):
+            messages.success(request, f"{semester.name} arka planda siliniyor.")
+        else:
+            messages.info(request, f"{semester.name} zaten siliniyor.")
+    return redirect("manage_semesters")
+
+
+@login_required
+@user_passes_test(is_department_head)
+def close_semester(request, semester_id):
+    """Dönemi kapatır: başarımlar arka planda arşive dondurulur."""
+    semester = get_object_or_404(Semester, id=semester_id)
+    if request.method == "POST":
+        if archive.request_close(semester, user=request.user):
+            messages.success(
+                request,
+                f"{semester.name} kapatılıyor. Başarım verileri arka planda arşivleniyor.",
+            )
+        else:
+            messages.info(request, f"{semester.name} zaten kapalı veya kapatılıyor.")
+    return redirect("manage_semesters")
+
+
+@login_required
+@user_passes_test(is_department_head)
+def reopen_semester(request, semester_id):
+    semester = get_object_or_404(Semester, id=semester_id)
+    if request.method == "POST" and semester.archived_at:
+        # Satırları arşiv veritabanından geri taşımak uzun sürebilir; komutla yapılır
+        messages.error(
+            request,
+            f"{semester.name} arşivlendi; önce `manage.py archive_semesters --restore "
+            f"{semester.id}` ile geri alınmalı.",
+        )
+    elif request.method == "POST" and semester.is_closed:
+        archive.reopen_semester(semester)
+        messages.success(request, f"{semester.name} yeniden açıldı; arşiv silindi.")
     return redirect("manage_semesters")
 
 
@@ -414,10 +606,106 @@ def delete_program_outcome(request, po_id):
 # --- DİĞER MEVCUT FONKSİYONLAR ---
 
 
+def _teacher_course(request, course_id):
+    """
+    Güvenlik: başka hocanın dersine girmeye çalışırsa None (Bölüm Başkanı hariç).
+    """
+    course = get_object_or_404(Course.objects.select_related("semester"), id=course_id)
+    if course.teacher_id != request.user.id and not is_department_head(request.user):
+        return None
+    return course
+
+
+# --- SINAV ANALİZİ (MADDE ANALİZİ) ---
+def _correlation_cell(value):
+    """Korelasyon hücresi rengi: pozitif mavi, negatif kırmızı; |r| büyüdükçe koyulaşır."""
+    if value is None:
+        return {"value": None}
+    return {
+        "value": value,
+        "hue": 220 if value >= 0 else 0,
+        "lightness": round(95 - 40 * abs(value)),
+    }
+
+
+@login_required
+@user_passes_test(is_teacher)
+def assessment_analytics(request, course_id):
+    course = _teacher_course(request, course_id)
+    if course is None:
+        return redirect("teacher_dashboard_home")
+    with cold_storage.reading(course.semester_id):
+        analysis = course_item_analysis(course)
+    names = [item["name"] for item in analysis["items"]]
+    return render(
+        request,
+        "assessment_analytics.html",
+        {
+            "course": course,
+            "analysis": analysis,
+            "correlation_rows": [
+                (name, [_correlation_cell(value) for value in row])
+                for name, row in zip(names, analysis["correlation"])
+            ],
+            "chart_data": {
+                "labels": analysis["histogram_labels"],
+                "datasets": [
+                    {"label": item["name"], "data": item["histogram"]}
+                    for item in analysis["items"]
+                ],
+            },
+        },
+    )
+
+
+# --- DERS SIRALAMASI ---
+@login_required
+@user_passes_test(is_teacher)
+def course_ranking(request, course_id):
+    course = _teacher_course(request, course_id)
+    if course is None:
+        return redirect("teacher_dashboard_home")
+    with cold_storage.reading(course.semester_id):
+        # Sıra ve ortalama veritabanında (RANK() OVER); sadece istenen sayfa okunur
+        page = Paginator(rankings.course_ranking(course), rankings.PAGE_SIZE).get_page(
+            request.GET.get("page")
+        )
+        return render(
+            request,
+            "course_ranking.html",
+            {
+                "course": course,
+                "page": page,
+                "ungraded": rankings.ungraded_count(course),
+                "pass_threshold": rankings.PASS_THRESHOLD,
+            },
+        )
+
+
+@login_required
+@user_passes_test(is_teacher)
+def course_ranking_export(request, course_id):
+    course = _teacher_course(request, course_id)
+    if course is None:
+        return redirect("teacher_dashboard_home")
+    response = StreamingHttpResponse(
+        cold_storage.stream(course.semester_id, rankings.csv_lines(course)),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{course.code}-siralama.csv"'
+    )
+    return response
+
+
 @login_required
 @user_passes_test(is_teacher)
 def course_students(request, course_id):
     course = get_object_or_404(Course, id=course_id)
+    if _closed_read_only(request, course.semester_id):
+        return redirect("course_students", course_id=course.id)
+    if _deleting_read_only(request, course.id, course.semester_id):
+        return redirect("course_students", course_id=course.id)
     if request.method == "POST":
         form = EnrollmentForm(request.POST)
         if form.is_valid():
@@ -427,30 +715,43 @@ def course_students(request, course_id):
             return redirect("course_students", course_id=course.id)
     else:
         form = EnrollmentForm()
-    enrollments = Enrollment.objects.filter(course=course)
-    return render(
-        request,
-        "course_students.html",
-        {"course": course, "enrollments": enrollments, "form": form},
-    )
+    with cold_storage.reading(course.semester_id):
+        enrollments = Enrollment.objects.filter(course=course)
+        return render(
+            request,
+            "course_students.html",
+            {"course": course, "enrollments": enrollments, "form": form},
+        )
 
 
 @login_required
 @user_passes_test(is_teacher)
+@_reads_active_semester
 def exam_list(request):
-    if is_department_head(request.user):
-        assessments = Assessment.objects.all().order_by("-date")
-    else:
-        my_courses = Course.objects.filter(teacher=request.user)
-        assessments = Assessment.objects.filter(course__in=my_courses).order_by("-date")
+    my_courses = Course.objects.filter(semester=get_active_semester(request))
+    if not is_department_head(request.user):
+        my_courses = my_courses.filter(teacher=request.user)
+    assessments = (
+        Assessment.objects.filter(course__in=my_courses)
+        .select_related("course")
+        .prefetch_related("assessmentweight_set__learning_outcome")
+        .order_by("-date")
+    )
     return render(request, "exam_list.html", {"assessments": assessments})
 
 
 @login_required
 @user_passes_test(is_teacher)
 def assessment_detail(request, assessment_id):
-    assessment = get_object_or_404(Assessment, id=assessment_id)
-    weights = AssessmentWeight.objects.filter(assessment=assessment)
+    # Arşivlenmiş dönemin sınavı arşiv veritabanında
+    assessment = cold_storage.get_object_or_404(
+        Assessment.objects.select_related("course"), id=assessment_id
+    )
+    if _closed_read_only(request, assessment.course.semester_id):
+        return redirect("assessment_detail", assessment_id=assessment.id)
+    if _deleting_read_only(request, assessment.course_id, assessment.course.semester_id):
+        return redirect("assessment_detail", assessment_id=assessment.id)
+    weights = assessment.assessmentweight_set.all()
     if request.method == "POST":
         form = AssessmentWeightForm(request.POST)
         if form.is_valid():
@@ -462,7 +763,7 @@ def assessment_detail(request, assessment_id):
         form = AssessmentWeightForm()
     form.fields["learning_outcome"].queryset = LearningOutcome.objects.filter(
         course=assessment.course
-    )
+    ).select_related("course")
     return render(
         request,
         "assessment_detail.html",
@@ -470,12 +771,46 @@ def assessment_detail(request, assessment_id):
     )
 
 
+@login_required
+@user_passes_test(is_teacher)
+def publish_assessment(request, assessment_id):
+    """Sonuçları yayınlar; öğrencilere e-posta arka planda (job_worker) gönderilir."""
+    assessment = cold_storage.get_object_or_404(
+        Assessment.objects.select_related("course"), id=assessment_id
+    )
+    if (
+        not is_department_head(request.user)
+        and assessment.course.teacher_id != request.user.id
+    ):
+        return redirect("teacher_dashboard_home")
+    if _archived_read_only(request, assessment.course.semester_id):
+        return redirect("course_dashboard", course_id=assessment.course_id)
+    if request.method == "POST":
+        if publish_assessment_results(assessment, user=request.user):
+            messages.success(
+                request,
+                f"{assessment.name} sonuçları yayınlandı. Öğrencilere e-posta ile bildirilecek.",
+            )
+        else:
+            messages.info(request, f"{assessment.name} sonuçları zaten yayınlanmış.")
+    return redirect("course_dashboard", course_id=assessment.course_id)
+
+
 @login_required
 @user_passes_test(is_teacher)
 def enter_grades(request, assessment_id):
-    assessment = get_object_or_404(Assessment, id=assessment_id)
-    enrollments = Enrollment.objects.filter(course=assessment.course)
+    assessment = cold_storage.get_object_or_404(
+        Assessment.objects.select_related("course__semester"), id=assessment_id
+    )
+    # Arşivlenmiş sınavın kayıt ve notları da arşivde (ilişkiler nesnenin veritabanından)
+    enrollments = assessment.course.enrollment_set.select_related("student")
     students = [e.student for e in enrollments]
+    if request.method == "POST" and assessment.course.semester.is_closed:
+        # Arşivdeki başarımlar dondurulmuş; notu değiştirmek için dönem yeniden açılmalı
+        messages.error(request, "Bu dönem kapatıldı; notlar değiştirilemez.")
+        return redirect("enter_grades", assessment_id=assessment.id)
+    if _deleting_read_only(request, assessment.course_id, assessment.course.semester_id):
+        return redirect("enter_grades", assessment_id=assessment.id)
     if request.method == "POST":
         for student in students:
             score_value = request.POST.get(f"score_{student.id}")
@@ -486,8 +821,8 @@ def enter_grades(request, assessment_id):
                     defaults={"score": score_value},
                 )
         return redirect("enter_grades", assessment_id=assessment.id)
-    existing_scores = StudentScore.objects.filter(assessment=assessment)
-    score_dict = {score.student.id: score.score for score in existing_scores}
+    existing_scores = assessment.studentscore_set.all()
+    score_dict = {score.student_id: score.score for score in existing_scores}
     return render(
         request,
         "enter_grades.html",
@@ -498,7 +833,12 @@ def enter_grades(request, assessment_id):
 @login_required
 @user_passes_test(is_teacher)
 def lo_mapping_detail(request, lo_id):
-    lo = get_object_or_404(LearningOutcome, id=lo_id)
+    lo = get_object_or_404(LearningOutcome.objects.select_related("course"), id=lo_id)
+    # Eşleştirmeler dondurulmuş PO başarımlarını ve eğilim noktalarını belirler
+    if _closed_read_only(request, lo.course.semester_id):
+        return redirect("lo_mapping_detail", lo_id=lo.id)
+    if _deleting_read_only(request, lo.course_id, lo.course.semester_id):
+        return redirect("lo_mapping_detail", lo_id=lo.id)
     mappings = OutcomeMapping.objects.filter(learning_outcome=lo)
     if request.method == "POST":
         form = OutcomeMappingForm(request.POST)
@@ -519,8 +859,12 @@ def lo_mapping_detail(request, lo_id):
 @login_required
 @user_passes_test(is_teacher)
 def delete_outcome_mapping(request, mapping_id):
-    mapping = get_object_or_404(OutcomeMapping, id=mapping_id)
+    mapping = get_object_or_404(
+        OutcomeMapping.objects.select_related("learning_outcome__course"), id=mapping_id
+    )
     lo_id = mapping.learning_outcome.id
+    if _closed_read_only(request, mapping.learning_outcome.course.semester_id):
+        return redirect("lo_mapping_detail", lo_id=lo_id)
     if request.method == "POST":
         mapping.delete()
     return redirect("lo_mapping_detail", lo_id=lo_id)
@@ -535,85 +879,90 @@ def student_course_dashboard(request, course_id):
         return redirect("teacher_dashboard_home")
     course = get_object_or_404(Course, id=course_id)
     student = request.user.student
-    assessments = Assessment.objects.filter(course=course)
-    total_weight = 0
-    weighted_sum = 0
-    student_scores = StudentScore.objects.filter(
-        student=student, assessment__in=assessments
-    )
-    score_map = {s.assessment.id: s.score for s in student_scores}
-    exam_labels = []
-    my_scores = []
-    class_averages = []
-    for exam in assessments:
-        exam_labels.append(exam.name)
-        if exam.id in score_map:
-            my_score = float(score_map[exam.id])
-            my_scores.append(my_score)
-            weighted_sum += my_score * exam.weight
-            total_weight += exam.weight
-        else:
-            my_scores.append(0)
-        avg_score = StudentScore.objects.filter(assessment=exam).aggregate(
-            Avg("score")
-        )["score__avg"]
-        class_averages.append(float(round(avg_score, 1)) if avg_score else 0)
-    current_average = round(weighted_sum / total_weight, 2) if total_weight > 0 else 0
-    learning_outcomes = LearningOutcome.objects.filter(course=course)
-    lo_labels = []
-    lo_data = []
-    lo_details = []
-    for lo in learning_outcomes:
-        lo_labels.append(f"{lo.code}")
-        relevant_weights = AssessmentWeight.objects.filter(learning_outcome=lo)
-        lo_total_score = 0
-        lo_max_possible = 0
-        for aw in relevant_weights:
-            exam = aw.assessment
-            if exam.id in score_map:
-                student_exam_score = float(score_map[exam.id])
-                effect = float(aw.percentage)
-                lo_total_score += student_exam_score * effect
-                lo_max_possible += 100 * effect
-        final_success = 0
-        if lo_max_possible > 0:
-            final_success = float(round((lo_total_score / lo_max_possible) * 100, 1))
-        lo_data.append(final_success)
-        color_class = (
-            "success"
-            if final_success >= 70
-            else "warning" if final_success >= 50 else "danger"
-        )
-        lo_details.append(
-            {
-                "code": lo.code,
-                "description": lo.description,
-                "score": final_success,
-                "color": color_class,
-            }
+    # Arşivlenmiş dönemin sınav ve notları arşiv veritabanında (bkz. cold_storage.py)
+    with cold_storage.reading(course.semester_id):
+        assessments = Assessment.objects.filter(course=course)
+        total_weight = 0
+        weighted_sum = 0
+        student_scores = StudentScore.objects.filter(
+            student=student, assessment__in=assessments
         )
-    context = {
-        "course": course,
-        "student": student,
-        "current_average": current_average,
-        "assessments": assessments,
-        "score_map": score_map,
-        "radar_labels": json.dumps(lo_labels),
-        "radar_data": json.dumps(lo_data),
-        "exam_labels": json.dumps(exam_labels),
-        "my_scores": json.dumps(my_scores),
-        "class_averages": json.dumps(class_averages),
-        "lo_details": lo_details,
-    }
-    return render(request, "student_dashboard.html", context)
+        score_map = {s.assessment.id: s.score for s in student_scores}
+        exam_labels = []
+        my_scores = []
+        class_averages = []
+        for exam in assessments:
+            exam_labels.append(exam.name)
+            if exam.id in score_map:
+                my_score = float(score_map[exam.id])
+                my_scores.append(my_score)
+                weighted_sum += my_score * exam.weight
+                total_weight += exam.weight
+            else:
+                my_scores.append(0)
+            avg_score = StudentScore.objects.filter(assessment=exam).aggregate(
+                Avg("score")
+            )["score__avg"]
+            class_averages.append(float(round(avg_score, 1)) if avg_score else 0)
+        current_average = round(weighted_sum / total_weight, 2) if total_weight > 0 else 0
+        # Kapatılmış dönemin LO başarımları arşivde hazır
+        archived_rates = None
+        if course.semester.is_closed:
+            archived_rates = dict(
+                ArchivedLOAttainment.objects.filter(
+                    student=student, semester_id=course.semester_id
+                ).values_list("learning_outcome_id", "rate")
+            )
+        lo_labels = []
+        lo_data = []
+        lo_details = []
+        # LO → sınav yüzdeleri süreç içi müfredat önbelleğinden (bkz. curriculum.py)
+        graph = get_course_graph(course.id)
+        if archived_rates is not None:
+            rates = [archived_rates.get(lo_id, 0) for lo_id in graph.lo_ids]
+        else:
+            rates = graph.lo_rates(score_map)
+        for code, description, rate in zip(graph.lo_codes, graph.lo_descriptions, rates):
+            final_success = float(round(rate, 1))
+            lo_labels.append(code)
+            lo_data.append(final_success)
+            lo_details.append(
+                {
+                    "code": code,
+                    "description": description,
+                    "score": final_success,
+                    "color": score_color(final_success),
+                }
+            )
+        context = {
+            "course": course,
+            "student": student,
+            "current_average": current_average,
+            "assessments": assessments,
+            "score_map": score_map,
+            "radar_labels": lo_labels,
+            "radar_data": lo_data,
+            "exam_labels": exam_labels,
+            "my_scores": my_scores,
+            "class_averages": class_averages,
+            "lo_details": lo_details,
+            # Sınıftaki yüzdelik sıra; önbellekteki sıralı dağılımda ikili arama
+            "course_percentile": course_percentile(course.id, current_average)
+            if total_weight > 0
+            else None,
+        }
+        return render(request, "student_dashboard.html", context)
 
 
 @login_required
+@_reads_active_semester
 def student_course_list(request):
     if not hasattr(request.user, "student"):
         return redirect("teacher_dashboard_home")
     student = request.user.student
-    enrollments = Enrollment.objects.filter(student=student)
+    enrollments = Enrollment.objects.filter(
+        student=student, course__semester=get_active_semester(request)
+    ).select_related("course__semester", "course__teacher")
     return render(request, "student_course_list.html", {"enrollments": enrollments})
 
 
@@ -622,74 +971,27 @@ def student_general_success(request):
     if not hasattr(request.user, "student"):
         return redirect("teacher_dashboard_home")
     student = request.user.student
-    all_pos = ProgramOutcome.objects.all()
-    po_buckets = {
-        po.code: {"earned": 0, "max": 0, "desc": po.description} for po in all_pos
-    }
-    enrollments = Enrollment.objects.filter(student=student)
-    for enrollment in enrollments:
-        course = enrollment.course
-        assessments = Assessment.objects.filter(course=course)
-        student_scores = StudentScore.objects.filter(
-            student=student, assessment__in=assessments
-        )
-        score_map = {s.assessment.id: s.score for s in student_scores}
-        learning_outcomes = LearningOutcome.objects.filter(course=course)
-        for lo in learning_outcomes:
-            relevant_weights = AssessmentWeight.objects.filter(learning_outcome=lo)
-            lo_total = 0
-            lo_max_possible = 0
-            for aw in relevant_weights:
-                if aw.assessment.id in score_map:
-                    lo_total += float(score_map[aw.assessment.id]) * float(
-                        aw.percentage
-                    )
-                    lo_max_possible += 100 * float(aw.percentage)
-            lo_success_rate = 0
-            if lo_max_possible > 0:
-                lo_success_rate = (lo_total / lo_max_possible) * 100
-            mappings = OutcomeMapping.objects.filter(learning_outcome=lo)
-            for mapping in mappings:
-                po_code = mapping.program_outcome.code
-                weight = float(mapping.weight)
-                contribution = lo_success_rate * weight
-                max_contribution = 100 * weight
-                po_buckets[po_code]["earned"] += contribution
-                po_buckets[po_code]["max"] += max_contribution
-    po_labels = []
-    po_scores = []
-    po_details = []
-    for code, data in po_buckets.items():
-        final_score = 0
-        if data["max"] > 0:
-            final_score = round((data["earned"] / data["max"]) * 100, 1)
-
-        po_labels.append(code)
-        po_scores.append(final_score)
-        color = (
-            "success"
-            if final_score >= 70
-            else "warning" if final_score >= 50 else "danger"
-        )
-        po_details.append(
-            {
-                "code": code,
-                "description": data["desc"],
-                "score": final_score,
-                "color": color,
-            }
-        )
+    # Açık dönemler canlı, kapatılmış dönemler arşivden (bkz. attainment.py)
+    po_labels, po_scores, po_details = student_po_report(student)
+    # Bölümdeki yüzdelik sıra (bkz. percentiles.py)
+    percentiles = student_po_percentiles(student, po_labels, po_scores)
     context = {
         "student": student,
-        "po_labels": json.dumps(po_labels),
-        "po_scores": json.dumps(po_scores),
-        "po_details": po_details,
+        "po_labels": po_labels,
+        "po_scores": po_scores,
+        "po_details": [
+            {**detail, "percentile": percentiles.get(detail["code"])}
+            for detail in po_details
+        ],
+        # Dönem dönem PO başarımı; önceden hesaplanmış seriden tek sorgu (bkz. trends.py)
+        "po_trend": student_series(student),
     }
     return render(request, "student_general_success.html", context)
 
 
 # --- ÖĞRENCİ NOTLARIM SAYFASI ---
 @login_required
+@_reads_active_semester
 def student_grades(request):
     """
     Öğrencinin notlarını derslere göre gruplayarak ve ortalama hesaplayarak gösterir.
@@ -699,10 +1001,15 @@ def student_grades(request):
 
     student = request.user.student
 
-    # Tüm notları çek
+    # Aktif dönemin notları
     all_scores = (
-        StudentScore.objects.filter(student=student)
-        .select_related("assessment", "assessment__course")
+        StudentScore.objects.filter(
+            student=student,
+            assessment__course__semester=get_active_semester(request),
+        )
+        .select_related(
+            "assessment__course__semester", "assessment__course__teacher"
+        )
         .order_by("assessment__course__code", "-assessment__date")
     )
 
@@ -803,15 +1110,15 @@ def teacher_settings(request):
 
 @login_required
 @user_passes_test(is_teacher)
+@_reads_active_semester
 def teacher_po_report_list(request):
     """
     Öğretmenin verdiği dersleri alan öğrencilerin listesini gösterir.
     """
-    # 1. Öğretmenin verdiği dersleri bul
-    if is_department_head(request.user):
-        courses = Course.objects.all()
-    else:
-        courses = Course.objects.filter(teacher=request.user)
+    # 1. Öğretmenin aktif dönemde verdiği dersleri bul
+    courses = Course.objects.filter(semester=get_active_semester(request))
+    if not is_department_head(request.user):
+        courses = courses.filter(teacher=request.user)
 
     # 2. Bu derslere kayıtlı öğrencileri bul (Tekrar edenleri temizle - distinct)
     # Enrollment üzerinden gidiyoruz
@@ -844,85 +1151,234 @@ def teacher_student_po_detail(request, student_id):
     target_student = get_object_or_404(Student, id=student_id)
 
     # --- HESAPLAMA MANTIĞI (Öğrenci Paneliyle Aynı) ---
-    all_pos = ProgramOutcome.objects.all()
-    po_buckets = {
-        po.code: {"earned": 0, "max": 0, "desc": po.description} for po in all_pos
+    # Öğrencinin TÜM dersleri baz alınır; kapatılmış dönemler arşivden gelir
+    po_labels, po_scores, po_details = student_po_report(target_student)
+
+    context = {
+        "student": target_student,
+        "po_labels": po_labels,
+        "po_scores": po_scores,
+        "po_details": po_details,
     }
+    return render(request, "teacher_student_po_detail.html", context)
 
-    # Sadece öğretmenin dersleri değil, öğrencinin TÜM dersleri baz alınarak genel başarım hesaplanır
-    enrollments = Enrollment.objects.filter(student=target_student)
 
-    for enrollment in enrollments:
-        course = enrollment.course
-        assessments = Assessment.objects.filter(course=course)
-        student_scores = StudentScore.objects.filter(
-            student=target_student, assessment__in=assessments
+# --- AĞIRLIK SİMÜLATÖRÜ (BÖLÜM BAŞKANI) ---
+@login_required
+@user_passes_test(is_department_head)
+def weight_simulator(request):
+    """
+    Önerilen LO→PO ağırlıkları ve sınav yüzdeleriyle tüm grubun PO başarımını
+    kaydetmeden yeniden hesaplar; önce/sonra dağılımlarını gösterir.
+    """
+    departments = list(Department.objects.order_by("name"))
+    courses = list(Course.objects.order_by("code"))
+    # Listede olmayan değer (ör. ?department=abc) seçim yapılmamış sayılır
+    department = _matching(departments, request.GET.get("department", ""))
+    course = _matching(courses, request.GET.get("course", ""))
+    department_id = str(department.id) if department else ""
+    course_id = str(course.id) if course else ""
+
+    students = Student.objects.all()
+    if department:
+        students = students.filter(department=department)
+
+    # Düzenlenecek satırlar seçili dersinkilerle sınırlı; hesap ise tüm müfredatı kapsar
+    assessment_weights = []
+    mappings = []
+    if course:
+        assessment_weights = list(
+            AssessmentWeight.objects.filter(assessment__course=course)
+            .select_related("assessment", "learning_outcome")
+            .order_by("assessment__name", "learning_outcome__code")
+        )
+        mappings = list(
+            OutcomeMapping.objects.filter(learning_outcome__course=course)
+            .select_related("learning_outcome", "program_outcome")
+            .order_by("learning_outcome__code", "program_outcome__code")
         )
-        score_map = {s.assessment.id: s.score for s in student_scores}
 
-        learning_outcomes = LearningOutcome.objects.filter(course=course)
+    results = None
+    summary = None
+    if request.method == "POST":
+        aw_overrides, aw_invalid = parse_overrides(
+            request.POST, "aw-", MAX_ASSESSMENT_PERCENTAGE
+        )
+        om_overrides, om_invalid = parse_overrides(
+            request.POST, "om-", MAX_MAPPING_WEIGHT
+        )
+        if aw_invalid or om_invalid:
+            messages.error(
+                request,
+                "Geçersiz değer: yüzdeler 0-999.99, LO→PO ağırlıkları 0-9.99 "
+                "aralığında olmalı.",
+            )
+        else:
+            current_aw = {row.id: float(row.percentage) for row in assessment_weights}
+            current_om = {row.id: float(row.weight) for row in mappings}
+            changes = sum(
+                value != current_aw.get(row_id) for row_id, value in aw_overrides.items()
+            ) + sum(
+                value != current_om.get(row_id) for row_id, value in om_overrides.items()
+            )
+
+            started = time.perf_counter()
+            cohort = Cohort(students)
+            results = simulate(
+                cohort, aw_overrides, om_overrides, before=baseline(cohort, department_id)
+            )
+            summary = {
+                "students": len(cohort),
+                "changes": changes,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000),
+            }
+        # Formda önerilen değerler korunur
+        for row in assessment_weights:
+            row.proposed = request.POST.get(f"aw-{row.id}", row.percentage)
+        for row in mappings:
+            row.proposed = request.POST.get(f"om-{row.id}", row.weight)
+    else:
+        for row in assessment_weights:
+            row.proposed = row.percentage
+        for row in mappings:
+            row.proposed = row.weight
 
-        for lo in learning_outcomes:
-            relevant_weights = AssessmentWeight.objects.filter(learning_outcome=lo)
-            lo_total = 0
-            lo_max_possible = 0
+    context = {
+        "departments": departments,
+        "courses": courses,
+        "department_id": department_id,
+        "course_id": course_id,
+        "assessment_weights": assessment_weights,
+        "mappings": mappings,
+        "results": results,
+        "summary": summary,
+        # Simülasyon yalnızca ana veritabanını okur; arşivlenmiş dönemler hesaba girmez
+        "archived_semesters": [
+            semester for semester in semester_choices() if semester.archived_at
+        ],
+    }
+    if results:
+        context["chart"] = {
+            "labels": [row["code"] for row in results],
+            "before": [row["before"]["mean"] for row in results],
+            "after": [row["after"]["mean"] for row in results],
+            "histograms": {
+                row["code"]: {
+                    "before": row["before"]["histogram"],
+                    "after": row["after"]["histogram"],
+                }
+                for row in results
+            },
+        }
+    return render(request, "weight_simulator.html", context)
+
+
+# --- BÖLÜM PO × DERS ISI HARİTASI ---
+@login_required
+@user_passes_test(is_department_head)
+def department_heatmap(request):
+    departments = list(Department.objects.order_by("name"))
+    semesters = list(Semester.objects.order_by("-id"))
+    department = _selected(departments, request.GET.get("department"))
+    semester = _selected(semesters, _semester_param(request))
+
+    heatmap = None
+    if department and semester:
+        with cold_storage.reading(semester.id):
+            heatmap = department_po_heatmap(department, semester)
+    return render(
+        request,
+        "department_heatmap.html",
+        {
+            "departments": departments,
+            "semesters": semesters,
+            "department": department,
+            "semester": semester,
+            "heatmap": heatmap,
+        },
+    )
 
-            for aw in relevant_weights:
-                if aw.assessment.id in score_map:
-                    lo_total += float(score_map[aw.assessment.id]) * float(
-                        aw.percentage
-                    )
-                    lo_max_possible += 100 * float(aw.percentage)
 
-            lo_success_rate = 0
-            if lo_max_possible > 0:
-                lo_success_rate = (lo_total / lo_max_possible) * 100
+# --- ERKEN UYARI (BÖLÜM GENELİ) ---
+@login_required
+@user_passes_test(is_department_head)
+def early_warning(request):
+    departments = list(Department.objects.order_by("name"))
+    semesters = list(Semester.objects.filter(is_closed=False).order_by("-id"))
+    department = _selected(departments, request.GET.get("department"))
+    semester = _selected(semesters, _semester_param(request))
+
+    flags = []
+    if department and semester:
+        flags = (
+            RiskFlag.objects.filter(
+                student__department=department, course__semester=semester
+            )
+            .select_related("student", "course__teacher")
+            .order_by("projected_average", "student__last_name")
+        )
+    return render(
+        request,
+        "early_warning.html",
+        {
+            "departments": departments,
+            "semesters": semesters,
+            "department": department,
+            "semester": semester,
+            "flags": flags,
+        },
+    )
 
-            mappings = OutcomeMapping.objects.filter(learning_outcome=lo)
-            for mapping in mappings:
-                po_code = mapping.program_outcome.code
-                weight = float(mapping.weight)
 
-                contribution = lo_success_rate * weight
-                max_contribution = 100 * weight
+# --- PO EĞİLİMİ (BÖLÜM GENELİ) ---
+@login_required
+@user_passes_test(is_department_head)
+def po_trends(request):
+    departments = list(Department.objects.order_by("name"))
+    department = _selected(departments, request.GET.get("department"))
+    return render(
+        request,
+        "po_trends.html",
+        {
+            "departments": departments,
+            "department": department,
+            "po_trend": department_series(department) if department else None,
+        },
+    )
 
-                po_buckets[po_code]["earned"] += contribution
-                po_buckets[po_code]["max"] += max_contribution
 
-    po_labels = []
-    po_scores = []
-    po_details = []
+def _semester_param(request):
+    """Formda dönem seçilmemişse aktif dönem (bkz. semesters.py)."""
+    if "semester" in request.GET:
+        return request.GET["semester"]
+    active = get_active_semester(request)
+    return str(active.id) if active else None
 
-    for code, data in po_buckets.items():
-        final_score = 0
-        if data["max"] > 0:
-            final_score = round((data["earned"] / data["max"]) * 100, 1)
 
-        po_labels.append(code)
-        po_scores.append(final_score)
+def _matching(objects, raw_id):
+    """GET parametresindeki id'ye karşılık gelen nesne; yoksa (geçersiz değer dahil) None."""
+    for obj in objects:
+        if str(obj.id) == raw_id:
+            return obj
+    return None
 
-        color = (
-            "success"
-            if final_score >= 70
-            else "warning" if final_score >= 50 else "danger"
-        )
 
-        po_details.append(
-            {
-                "code": code,
-                "description": data["desc"],
-                "score": final_score,
-                "color": color,
-            }
-        )
+def _selected(objects, raw_id):
+    """GET parametresindeki id'ye karşılık gelen nesne; yoksa listenin ilki."""
+    return _matching(objects, raw_id) or (objects[0] if objects else None)
 
-    context = {
-        "student": target_student,
-        "po_labels": json.dumps(po_labels),
-        "po_scores": json.dumps(po_scores),
-        "po_details": po_details,
-    }
-    return render(request, "teacher_student_po_detail.html", context)
+
+# --- AKTİF DÖNEM SEÇİCİ ---
+@login_required
+def select_active_semester(request):
+    if request.method == "POST":
+        set_active_semester(request, request.POST.get("semester"))
+    next_url = request.POST.get("next") or request.GET.get("next")
+    if next_url and url_has_allowed_host_and_scheme(
+        next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()
+    ):
+        return redirect(next_url)
+    return redirect("home_redirect")
 
 
 # 🔥 TRAFİK POLİSİ (YÖNLENDİRME MERKEZİ)
@@ -937,7 +1393,7 @@ def home_redirect(request):
         return redirect("department_head_dashboard")
 
     # 2. ÖĞRETMEN
-    if request.user.groups.filter(name="Öğretmen").exists():
+    if is_teacher(request.user):
         return redirect("teacher_dashboard_home")
 
     # 3. ÖĞRENCİ
@@ -957,7 +1413,14 @@ def landing_page(request):
     """
     if request.user.is_authenticated:
         return home_redirect(request)
-    return render(request, "landing_page.html")
+
+    # Anonim ziyaretçiler için sayfa herkese aynıdır; tam sayfa önbellekten sunulur
+    content = get_or_compute(
+        LANDING_PAGE_CACHE_KEY,
+        lambda: render(request, "landing_page.html").content,
+        LANDING_PAGE_CACHE_TIMEOUT,
+    )
+    return HttpResponse(content)
 
 
 # --- ÖZEL GİRİŞ KONTROLÜ (ROLE CHECK) ---
@@ -990,11 +1453,7 @@ class CustomLoginView(LoginView):
 
             # 2. AKADEMİSYEN KAPISI KONTROLÜ
             elif role == "teacher":
-                is_teacher = (
-                    user.groups.filter(name__in=["Öğretmen", "Bölüm Başkanı"]).exists()
-                    or user.is_superuser
-                )
-                if not is_teacher:
+                if not is_teacher(user):
                     messages.error(
                         self.request,
                         "⛔ Hata: Bu kapıdan sadece Akademisyenler giriş yapabilir.",
@@ -1004,11 +1463,7 @@ class CustomLoginView(LoginView):
 
             # 3. BÖLÜM BAŞKANI KAPISI KONTROLÜ
             elif role == "manager":
-                is_manager = (
-                    user.groups.filter(name="Bölüm Başkanı").exists()
-                    or user.is_superuser
-                )
-                if not is_manager:
+                if not is_department_head(user):
                     messages.error(
                         self.request,
                         "⛔ Hata: Bu alana sadece Bölüm Başkanları girebilir.",
@@ -1017,3 +1472,64 @@ class CustomLoginView(LoginView):
                     return redirect(f"/login/?role={role}")
 
         return auth_login_func
+
+
+# --- PERFORMANS PROFİLLERİ (SADECE PERSONEL) ---
+# Herhangi bir sayfaya ?_profile=1 eklenerek (veya X-Profile başlığı ile) profil alınır.
+
+
+@login_required
+@user_passes_test(is_staff)
+def profile_list(request):
+    return render(request, "profile_list.html", {"profiles": list_summaries()})
+
+
+@login_required
+@user_passes_test(is_staff)
+def profile_detail(request, profile_id):
+    summary = load_summary(profile_id)
+    if summary is None:
+        raise Http404("Profil bulunamadı.")
+    return render(request, "profile_detail.html", {"profile": summary})
+
+
+@login_required
+@user_passes_test(is_staff)
+def profile_download(request, profile_id):
+    prof_path, _summary_path = profile_paths(profile_id)
+    if not prof_path.exists():
+        raise Http404("Profil bulunamadı.")
+    # snakeviz / pstats ile açılabilir
+    return FileResponse(
+        open(prof_path, "rb"), as_attachment=True, filename=f"{profile_id}.prof"
+    )
+
+
+# --- ARKA PLAN İŞLERİ ---
+
+
+@login_required
+def job_status(request, job_id):
+    """Arayüzün ilerleme çubuğu için iş durumunu JSON olarak döner (polling)."""
+    job = get_object_or_404(Job, id=job_id)
+    if job.created_by_id != request.user.id and not (
+        is_staff(request.user) or is_department_head(request.user)
+    ):
+        raise Http404("İş bulunamadı.")
+    error = ""
+    if job.status == Job.STATUS_FAILED and job.error:
+        # Traceback'in tamamı sadece admin'de; kullanıcıya son satır yeter
+        error = job.error.strip().splitlines()[-1]
+    return JsonResponse(
+        {
+            "id": job.id,
+            "task": job.task,
+            "status": job.status,
+            "finished": job.is_finished,
+            "progress": job.progress,
+            "message": job.progress_message,
+            "attempts": job.attempts,
+            "result": job.result if job.status == Job.STATUS_SUCCEEDED else None,
+            "error": error,
+        }
+    )
@@ -37,6 +37,9 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "compressor",
+    "rest_framework",
+    "rest_framework.authtoken",
     "academic",
 ]
 
@@ -48,6 +51,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Personel için ?_profile=1 ile istek profili (en sonda kalmalı)
+    "academic.profiling.ProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "obs_core.urls"
@@ -62,6 +67,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "academic.context_processors.layout",
             ],
         },
     },
@@ -77,10 +83,66 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Worker (job_worker) ve web süreçleri aynı dosyaya yazar; kilit için bekle
+        "OPTIONS": {"timeout": 20},
+    },
+    # Ortak önbellek tablosu (DatabaseCache) ayrı dosyada; uygulama yazmalarıyla aynı
+    # kilidi paylaşmaz. Kurulum: python manage.py createcachetable --database cache
+    "cache": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "cache.sqlite3",
+        "OPTIONS": {
+            "timeout": 20,
+            # add() (kilit alma) okuma-yazma yarışına girmesin
+            "transaction_mode": "IMMEDIATE",
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+        },
+    },
+    # Arşivlenmiş dönemlerin sınav/not/kayıtları (bkz. academic/cold_storage.py).
+    # Kurulum: python manage.py migrate --database archive
+    "archive": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "archive.sqlite3",
+        "OPTIONS": {
+            "timeout": 20,
+            # Bölüm/öğrenci/ders satırları arşivde kopya; bütünlüğü sıcak veritabanı korur
+            "init_command": "PRAGMA foreign_keys = OFF;",
+        },
+    },
+}
+DATABASE_ROUTERS = ["academic.routers.CacheRouter", "academic.routers.ArchiveRouter"]
+
+# --- ÖNBELLEK ---
+# Tüm gunicorn/uvicorn worker'ları ve job_worker aynı önbelleği görür; versiyon anahtarları
+# (bkz. academic/caching.py) bir süreçte artırılınca diğerlerinde de geçersiz olur.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "academic_cache",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 50000, "CULL_FREQUENCY": 4},
     }
 }
 
 
+# --- OTURUM VE GİRİŞ ---
+# Oturumlar önce ortak önbellekten okunur, veritabanı sadece yedek olarak tutulur.
+# Kullanıcı nesnesi ve rolü de önbellekten gelir (bkz. academic/auth.py).
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+AUTHENTICATION_BACKENDS = ["academic.auth.CachedModelBackend"]
+
+# Girişte şifre doğrulaması (bkz. academic/hashers.py). Yineleme sayısı Django'nun
+# varsayılanıdır (870.000); PASSWORD_PBKDF2_ITERATIONS ile sadece artırılabilir.
+# Bu sunucuda ölçülen süreler (`manage.py benchmark_hashers`): PBKDF2 870.000 yineleme
+# ~330 ms, scrypt ~240 ms (istek başına 16 MB bellek). Argon2/bcrypt kütüphaneleri
+# requirements.txt'te olmadığı için listede yoklar.
+PASSWORD_HASHERS = [
+    "academic.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -103,12 +165,91 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+STATICFILES_FINDERS = [
+    "django.contrib.staticfiles.finders.FileSystemFinder",
+    "django.contrib.staticfiles.finders.AppDirectoriesFinder",
+    "compressor.finders.CompressorFinder",
+]
+
+# --- STATİK DOSYA HATTI (CANLI ORTAM) ---
+# DEBUG kapalıyken dosyalar hash'li isimlerle (style.3f2a9c1b7d4e.css) ve hazır .gz/.br
+# kopyalarıyla sunulur; hash'li dosyalar tarayıcıda süresiz önbelleğe alınır.
+# Yayına almadan önce sırasıyla:
+#   python manage.py collectstatic --noinput
+#   python manage.py compress --force
+STATIC_PIPELINE = not DEBUG
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "whitenoise.storage.CompressedManifestStaticFilesStorage"
+            if STATIC_PIPELINE
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
+if STATIC_PIPELINE:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+        "whitenoise.middleware.WhiteNoiseMiddleware",
+    )
+
+# Manifest (style.<hash>.css) ve compressor (CACHE/js/output.<hash>.js) çıktıları içerik
+# hash'i taşır; bunlar süresiz (immutable) önbellek başlığıyla sunulur
+WHITENOISE_IMMUTABLE_FILE_TEST = r"\.[0-9a-f]{12}\.[A-Za-z0-9]+$"
+
+# Grafik scriptleri ve CSS, {% compress %} blokları ile tek dosyada birleştirilip küçültülür
+COMPRESS_ENABLED = STATIC_PIPELINE
+COMPRESS_OFFLINE = STATIC_PIPELINE
+COMPRESS_STORAGE = "academic.storage.PrecompressedCompressorFileStorage"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# --- PERFORMANS PROFİLLERİ ---
+# ?_profile=1 ile alınan .prof ve özet dosyalarının yazıldığı klasör
+PROFILER_ROOT = BASE_DIR / "profiles"
+
+# --- ANALİTİK DIŞA AKTARIM ---
+# `manage.py export_analytics` Parquet veri kümelerini (ve filigranı) buraya yazar
+ANALYTICS_EXPORT_ROOT = BASE_DIR / "exports" / "analytics"
+
+# --- E-POSTA BİLDİRİMLERİ ---
+# Geliştirmede e-postalar gönderilmez, sent_emails/ klasörüne dosya olarak yazılır
+EMAIL_BACKEND = (
+    "django.core.mail.backends.filebased.EmailBackend"
+    if DEBUG
+    else "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+DEFAULT_FROM_EMAIL = "obs@localhost"
+
+# Sonuç bildirimleri tek SMTP bağlantısı üzerinden bu büyüklükte partilerle gönderilir
+NOTIFICATION_BATCH_SIZE = 100
+# True: gün içindeki yayınlar RESULT_DIGEST_HOUR'da öğrenci başına tek e-postada toplanır
+RESULT_NOTIFICATION_DIGEST = False
+RESULT_DIGEST_HOUR = 18
+
+# --- REST API (bkz. academic/api.py) ---
+# Token (mobil uygulama) ya da web oturumu (tarayıcı); yanıtlar sadece JSON.
+# Token ilk sırada: kimliksiz istek 403 yerine WWW-Authenticate başlıklı 401 alır
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.TokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
+
 # --- GİRİŞ / ÇIKIŞ AYARLARI ---
 
 # 1. Giriş yapan kişiyi (Trafik Polisine) yönlendir
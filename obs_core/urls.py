@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from academic import views
+from rest_framework.authtoken.views import obtain_auth_token
+
+from academic import api, views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -11,6 +13,11 @@ urlpatterns = [
 
     # --- 2. TRAFİK POLİSİ (YÖNLENDİRME) ---
     path("redirect/", views.home_redirect, name="home_redirect"),
+    path(
+        "active-semester/",
+        views.select_active_semester,
+        name="set_active_semester",
+    ),
 
     # --- 3. GİRİŞ / ÇIKIŞ ---
     path(
@@ -42,6 +49,21 @@ urlpatterns = [
         views.course_dashboard,
         name="course_dashboard",
     ),
+    path(
+        "course/<int:course_id>/assessment-analytics/",
+        views.assessment_analytics,
+        name="assessment_analytics",
+    ),
+    path(
+        "course/<int:course_id>/ranking/",
+        views.course_ranking,
+        name="course_ranking",
+    ),
+    path(
+        "course/<int:course_id>/ranking/export/",
+        views.course_ranking_export,
+        name="course_ranking_export",
+    ),
     path(
         "course/<int:course_id>/students/",
         views.course_students,
@@ -59,6 +81,11 @@ urlpatterns = [
         views.enter_grades,
         name="enter_grades",
     ),
+    path(
+        "assessment/<int:assessment_id>/publish/",
+        views.publish_assessment,
+        name="publish_assessment",
+    ),
 
     # --- PO EŞLEŞTİRME ---
     path("lo/<int:lo_id>/mapping/", views.lo_mapping_detail, name="lo_mapping_detail"),
@@ -92,6 +119,16 @@ urlpatterns = [
         views.delete_semester,
         name="delete_semester",
     ),
+    path(
+        "close-semester/<int:semester_id>/",
+        views.close_semester,
+        name="close_semester",
+    ),
+    path(
+        "reopen-semester/<int:semester_id>/",
+        views.reopen_semester,
+        name="reopen_semester",
+    ),
     # 4. Program Çıktıları (PO) Yönetimi
     path("manage-pos/", views.manage_program_outcomes, name="manage_program_outcomes"),
     path("add-po/", views.add_program_outcome, name="add_program_outcome"),
@@ -101,6 +138,11 @@ urlpatterns = [
         name="delete_program_outcome",
     ),
 
+    path("weight-simulator/", views.weight_simulator, name="weight_simulator"),
+    path("department-heatmap/", views.department_heatmap, name="department_heatmap"),
+    path("early-warning/", views.early_warning, name="early_warning"),
+    path("po-trends/", views.po_trends, name="po_trends"),
+
     # --- ÖĞRENCİ PANELİ ---
     path(
         "student/course/<int:course_id>/",
@@ -118,4 +160,24 @@ urlpatterns = [
 
     # AYARLAR SAYFASI
     path("student/settings/", views.student_settings, name="student_settings"),
-]
\ No newline at end of file
+
+    # --- PERFORMANS PROFİLLERİ (PERSONEL) ---
+    path("profiles/", views.profile_list, name="profile_list"),
+    path("profiles/<uuid:profile_id>/", views.profile_detail, name="profile_detail"),
+    path(
+        "profiles/<uuid:profile_id>/download/",
+        views.profile_download,
+        name="profile_download",
+    ),
+
+    # --- ARKA PLAN İŞLERİ ---
+    path("jobs/<int:job_id>/status/", views.job_status, name="job_status"),
+
+    # --- REST API (MOBİL) ---
+    path("api/v1/auth/token/", obtain_auth_token, name="api_token"),
+    path(
+        "api/v1/student/dashboard/",
+        api.student_dashboard,
+        name="api_student_dashboard",
+    ),
+]